@@ -0,0 +1,335 @@
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from argparse import ArgumentParser
+
+# Benchmarks always run against a dummy display so the numbers don't depend on the desktop
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.Application import Application
+from src.SnakeEnv import SnakeEnv
+
+
+MAIN_SCRIPT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src", "main.py"))
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+APPLICATION_ARGUMENTS = {
+    "log_level": "error",
+    "width": 800,
+    "height": 600,
+    "seed": 1,
+    "record": False,
+}
+REPEATS = 7
+
+
+def measure(function, operations, repeats):
+    """
+    Times a function.
+
+    Args:
+        function (callable): Runs `operations` operations when called.
+        operations (int): The number of operations per call.
+        repeats (int): The number of times to call the function.
+
+    Returns:
+        dict: The median and minimum time per operation (ns) and the median operations per second.
+    """
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        function()
+        timings.append((time.perf_counter_ns() - start) / operations)
+
+    median = statistics.median(timings)
+    return {
+        "median_ns": round(median, 1),
+        "min_ns": round(min(timings), 1),
+        "ops_per_second": round(1e9 / median, 1),
+        "operations": operations,
+        "repeats": repeats,
+    }
+
+
+def calibrate(repeats):
+    """
+    Times a fixed pure Python workload that doesn't depend on the game's code.
+
+    Results measured on different machines (or on one machine under a different load) are
+    compared relative to it: a host that runs the calibration twice as slowly is expected
+    to run every benchmark twice as slowly too.
+
+    Args:
+        repeats (int): The number of times to repeat the workload.
+
+    Returns:
+        dict: The measurement, like measure().
+    """
+    operations = 100000
+
+    def run():
+        cells = {}
+        for index in range(operations):
+            cells[index & 1023] = cells.get((index * 7) & 1023, 0) + index
+
+    return measure(run, operations, repeats)
+
+
+# Benchmarks
+def benchmark_snake_update(repeats):
+    """
+    Snake.update throughput.
+    """
+    application = Application(dict(APPLICATION_ARGUMENTS))
+    # Without food the snake never grows, can't collide with itself and keeps moving
+    application.state.remove_food()
+    snake = application.snake
+    operations = 10000
+
+    def run():
+        update = snake.update
+        for _ in range(operations):
+            update()
+
+    return measure(run, operations, repeats)
+
+
+def benchmark_game_state_step(repeats):
+    """
+    Headless GameState.step throughput.
+    """
+    application = Application(dict(APPLICATION_ARGUMENTS, headless=True))
+    application.state.remove_food()
+    operations = 100000
+
+    return measure(lambda: application.state.run(operations), operations, repeats)
+
+
+def benchmark_env_step(repeats):
+    """
+    SnakeEnv.step throughput (board observations), the steps per second agents are trained at.
+    """
+    env = SnakeEnv(400, 400, max_ticks=10 ** 9)
+    env.reset(seed=1)
+    env.state.remove_food()
+    operations = 100000
+
+    def run():
+        step = env.step
+        for _ in range(operations):
+            step(-1)
+
+    return measure(run, operations, repeats)
+
+
+def benchmark_loop_iteration(repeats):
+    """
+    One full iteration of Application.loop (events, one update, render) with the dummy video driver.
+    """
+    application = Application(dict(APPLICATION_ARGUMENTS))
+    application.state.remove_food()
+    operations = 500
+
+    # Run exactly one logic tick and render one frame per iteration, independent of the wall clock
+    application.timestep.tick = lambda: 1
+    application.timestep.should_render = lambda: True
+
+    def run():
+        iterations = 0
+
+        # Stop the loop after a fixed number of iterations instead of sleeping between them
+        def wait():
+            nonlocal iterations
+            iterations += 1
+            if iterations >= operations:
+                application.running = False
+
+        application.timestep.wait = wait
+        application.start()
+        application.loop()
+
+    return measure(run, operations, repeats)
+
+
+def benchmark_startup(repeats):
+    """
+    Application.__init__ until the first frame is on screen.
+    """
+    def run():
+        application = Application(dict(APPLICATION_ARGUMENTS))
+        application.render()
+
+    return measure(run, 1, repeats)
+
+
+def benchmark_startup_headless(repeats):
+    """
+    Application.__init__ in headless mode (no pygame, no SDL).
+    """
+    def run():
+        Application(dict(APPLICATION_ARGUMENTS, headless=True))
+
+    return measure(run, 1, repeats)
+
+
+def benchmark_cli_help(repeats):
+    """
+    A new Python process running `src/main.py --help` (interpreter start-up included).
+    """
+    def run():
+        subprocess.run([sys.executable, MAIN_SCRIPT, "--help"], check=True, stdout=subprocess.DEVNULL)
+
+    return measure(run, 1, repeats)
+
+
+def benchmark_cli_headless(repeats):
+    """
+    A new Python process running 1000 headless ticks of `src/main.py` (interpreter start-up included).
+    """
+    log_directory = os.path.join(os.path.dirname(__file__), "logs")
+
+    def run():
+        subprocess.run([sys.executable, MAIN_SCRIPT, "--headless", "--ticks", "1000", "--log-level", "error",
+                        "--log-dir", log_directory], check=True, stdout=subprocess.DEVNULL)
+
+    return measure(run, 1, repeats)
+
+
+def benchmark_configuration(repeats):
+    """
+    Application.configure (command line, environment, settings.json and defaults).
+    """
+    application = Application(dict(APPLICATION_ARGUMENTS, headless=True))
+    operations = 1000
+
+    def run():
+        for _ in range(operations):
+            application.configure()
+
+    return measure(run, operations, repeats)
+
+
+BENCHMARKS = {
+    "snake_update": benchmark_snake_update,
+    "game_state_step": benchmark_game_state_step,
+    "env_step": benchmark_env_step,
+    "loop_iteration": benchmark_loop_iteration,
+    "startup": benchmark_startup,
+    "startup_headless": benchmark_startup_headless,
+    "cli_help": benchmark_cli_help,
+    "cli_headless": benchmark_cli_headless,
+    "configuration": benchmark_configuration,
+}
+
+
+def run_benchmarks(names, repeats):
+    """
+    Runs benchmarks.
+
+    Args:
+        names (list): The names of the benchmarks to run.
+        repeats (int): The number of times to repeat every benchmark.
+
+    Returns:
+        dict: The results, including information about the machine they were measured on and its calibration.
+    """
+    calibration = calibrate(repeats)
+    print(f"{'calibration':>16}: {calibration['median_ns']:>14,.1f} ns/op", file=sys.stderr)
+
+    results = {}
+    for name in names:
+        results[name] = BENCHMARKS[name](repeats)
+        print(f"{name:>16}: {results[name]['median_ns']:>14,.1f} ns/op  {results[name]['ops_per_second']:>14,.1f} ops/s",
+              file=sys.stderr)
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "repeats": repeats,
+        "calibration": calibration,
+        "benchmarks": results,
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Compares results against a baseline.
+
+    The fastest run of every benchmark is compared, as it is the least affected by noise.
+    The baseline is scaled by how much slower or faster the calibration workload ran than
+    when the baseline was stored, so a baseline stored on another host (or a busier one)
+    doesn't report the difference between the machines as a regression. A baseline stored
+    on the same host with the same number of repeats is still the most reliable.
+
+    Args:
+        results (dict): The results of run_benchmarks().
+        baseline (dict): Previously saved results.
+        threshold (float): The allowed slowdown, for example 0.2 for 20%.
+
+    Returns:
+        list: The names of the benchmarks that regressed.
+    """
+    scale = 1.0
+    if "calibration" in baseline:
+        scale = results["calibration"]["min_ns"] / max(baseline["calibration"]["min_ns"], 1e-9)
+        print(f"{'calibration':>16}: {scale - 1:+8.1%} vs baseline, expected times scaled by {scale:.2f}", file=sys.stderr)
+    else:
+        print("The baseline has no calibration, comparing absolute times.", file=sys.stderr)
+
+    for key in ("platform", "machine", "cpus", "repeats"):
+        if baseline.get(key) != results.get(key):
+            print(f"The baseline's {key} differs: {baseline.get(key)} vs {results.get(key)}.", file=sys.stderr)
+
+    regressions = []
+    for name, result in results["benchmarks"].items():
+        if name not in baseline["benchmarks"]:
+            continue
+
+        expected = max(baseline["benchmarks"][name]["min_ns"] * scale, 1e-9)
+        change = result["min_ns"] / expected - 1
+        status = "REGRESSION" if change > threshold else "ok"
+        print(f"{name:>16}: {change:+8.1%} vs baseline  {status}", file=sys.stderr)
+
+        if change > threshold:
+            regressions.append(name)
+
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Benchmark the tick, render and startup hot paths.")
+    parser.add_argument("benchmarks", nargs="*", help=f"The benchmarks to run: {', '.join(BENCHMARKS)} (default: all).")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help="The number of times to repeat every benchmark.")
+    parser.add_argument("--output", help="Write the results to this JSON file (default: stdout).")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, help="Compare the results against a baseline JSON file.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="The allowed slowdown against the baseline (0.25 = 25%%).")
+    args = parser.parse_args()
+
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    results = run_benchmarks(args.benchmarks or list(BENCHMARKS), args.repeats)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
+    else:
+        print(json.dumps(results, indent=4))
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
@@ -1,8 +1,17 @@
+import itertools
 import json
+import os
+import sys
 
 from argparse import ArgumentParser
+from array import array
 from pathlib import Path
 
+# The option schema and the offset index live with the game's modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from Configuration import INDEX_SUFFIX, OPTIONS_BY_KEY, ConfigurationError, write_configuration_index
+
 
 def save_configuration_file(path, configuration):
     configuration_file = Path(path)
@@ -55,18 +64,204 @@ def get_log_level(log_level):
     return log_level
 
 
+# Matrix Functions
+def parse_values(text):
+    """
+    Parse the values of a matrix dimension given on the command line.
+
+    Args:
+        text (str): Either START..STOP with two integers, the integers from START to STOP
+            included, or comma separated values (JSON values, anything else is a string,
+            so a path like ../logs stays a path).
+
+    Returns:
+        list: The values.
+    """
+    start, separator, stop = text.partition("..")
+    if separator:
+        try:
+            return list(range(int(start), int(stop) + 1))
+        except ValueError:
+            pass
+
+    values = []
+    for value in text.split(","):
+        try:
+            values.append(json.loads(value))
+        except json.JSONDecodeError:
+            values.append(value)
+    return values
+
+
+def get_grids(args):
+    """
+    Collect the parameter grids of the matrix.
+
+    The --matrix file holds a grid (an object mapping options to lists of values) or a
+    list of grids whose configurations are combined. The --grid options and the options
+    given as flags (--width, ...) are added to every grid.
+
+    Args:
+        args (dict): The command line arguments.
+
+    Returns:
+        list: The grids, each a dict of option name to list of values.
+    """
+    grids = [{}]
+    if args["matrix"]:
+        with open(args["matrix"]) as file:
+            grids = json.load(file)
+        if isinstance(grids, dict):
+            grids = [grids]
+
+    extra = {}
+    for name in ("log_level", "width", "height", "log_directory", "log_file"):
+        if args[name] is not None:
+            extra[name] = [args[name]]
+    for dimension in args["grid"]:
+        key, _, text = dimension.partition("=")
+        extra[key] = parse_values(text)
+
+    return [{**grid, **extra} for grid in grids]
+
+
+def normalize_grid(grid):
+    """
+    Validate every value of a grid against the option schema, and drop duplicate values.
+
+    Values are normalized first (aliases to option names, 60 and 60.0 for a float option,
+    "INFO" and "info" for the log level...), so every configuration the grid expands to
+    is unique.
+
+    Args:
+        grid (dict): The values of every option.
+
+    Returns:
+        dict: The distinct normalized values of every option.
+
+    Raises:
+        ConfigurationError: If an option is unknown or a value is invalid.
+    """
+    normalized = {}
+    seen = {}
+    for key, values in grid.items():
+        option = OPTIONS_BY_KEY.get(key)
+        if option is None:
+            raise ConfigurationError(f"Unknown option {key!r}.")
+        if not isinstance(values, list):
+            values = [values]
+
+        distinct = normalized.setdefault(option.name, [])
+        distinct_set = seen.setdefault(option.name, set())
+        for value in values:
+            value = option.validate(value, f"matrix option {key}")
+            if value not in distinct_set:
+                distinct_set.add(value)
+                distinct.append(value)
+    return normalized
+
+
+def expand_matrix(grids):
+    """
+    Expand grids into every combination of their values, one configuration at a time.
+
+    A single grid never repeats a configuration. Configurations repeated by several
+    grids are only yielded the first time: a configuration is skipped when an earlier
+    grid has the same options and contains each of its values, which only keeps the
+    grids in memory instead of every configuration yielded.
+
+    Args:
+        grids (list): The grids.
+
+    Yields:
+        str: Every distinct configuration, as a line of canonical JSON (sorted keys).
+    """
+    grids = [normalize_grid(grid) for grid in grids]
+    members = [{name: set(values) for name, values in grid.items()} for grid in grids]
+
+    for number, grid in enumerate(grids):
+        names = list(grid)
+        # The earlier grids over the same options are the only ones that can hold the same configurations
+        earlier = [member for member in members[:number] if member.keys() == grid.keys()]
+        for values in itertools.product(*(grid[name] for name in names)):
+            if any(all(value in member[name] for name, value in zip(names, values)) for member in earlier):
+                continue
+            yield json.dumps(dict(zip(names, values)), sort_keys=True)
+
+
+def save_matrix(path, lines, output_format):
+    """
+    Write the configurations of a matrix in one streaming pass.
+
+    As JSON Lines, the offset index of the entries is written next to the file
+    (path + ".index"), so the game can load one entry by index (--config-index)
+    without parsing the others. The game never writes that file itself.
+
+    Args:
+        path (str): The JSON Lines file, or the directory of the files.
+        lines (iterable): The configurations, as lines of JSON.
+        output_format (str): "jsonl" for one JSON Lines file, "files" for one .json file per configuration.
+
+    Returns:
+        int: The number of configurations written.
+    """
+    if output_format == "files":
+        Path(path).mkdir(parents=True, exist_ok=True)
+        count = 0
+        for count, line in enumerate(lines, 1):
+            with open(os.path.join(path, f"config-{count - 1:06d}.json"), 'w') as file:
+                json.dump(json.loads(line), file, indent=4)
+        return count
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    offsets = array("Q")
+    offset = 0
+    with open(path, 'wb') as file:
+        for line in lines:
+            data = (line + "\n").encode()
+            file.write(data)
+            offsets.append(offset)
+            offset += len(data)
+
+    stat = os.stat(path)
+    write_configuration_index(path, offsets, (stat.st_mtime_ns, stat.st_size))
+    return len(offsets)
+
+
 if __name__ == "__main__":
-    parser = ArgumentParser(description='Generate a .json configuration file.')
-    parser.add_argument('path', type=str, nargs='?', default='.\\res\\settings.json', help='Path of the configuration file')
-    parser.add_argument("--log-level", dest="log_level", choices=["debug", "info", "warning", "error", "critical"], help="The log level to be set.")
+    parser = ArgumentParser(description='Generate a .json configuration file, '
+                                        'or a matrix of configurations with --matrix or --grid.')
+    parser.add_argument('path', type=str, nargs='?',
+                        help='Path of the configuration file (default .\\res\\settings.json), '
+                             'or of the matrix (default res/matrix.jsonl)')
+    parser.add_argument("--log-level", dest="log_level", choices=["debug", "info", "warning", "error", "critical"],
+                        help="The log level to be set.")
     parser.add_argument("--width", dest="width", type=int, help="The width of the game window.")
     parser.add_argument("--height", dest="height", type=int, help="The height of the game window.")
     parser.add_argument("--log-dir", dest="log_directory", help="The directory to store log files.")
     parser.add_argument("--log-file", dest="log_file", help="The name of the log file.")
+    parser.add_argument("--matrix", dest="matrix",
+                        help="A JSON file with a grid (an object of option: [values]) or a list of grids to expand.")
+    parser.add_argument("--grid", dest="grid", action="append", default=[], metavar="OPTION=VALUES",
+                        help="Add a dimension to the matrix, for example seed=0..999 or logic_rate=30,60.")
+    parser.add_argument("--format", dest="format", choices=["jsonl", "files"], default="jsonl",
+                        help="Write the matrix as one JSON Lines file, "
+                             "or as one .json file per configuration in a directory.")
     args = parser.parse_args()
 
 
     args = vars(args)
-    configuration = get_configuration(args)
-    save_configuration_file(configuration.pop("path"), configuration)
-    
\ No newline at end of file
+    if args["matrix"] or args["grid"]:
+        path = args["path"] or os.path.join("res", "matrix.jsonl" if args["format"] == "jsonl" else "matrix")
+        try:
+            count = save_matrix(path, expand_matrix(get_grids(args)), args["format"])
+        except ConfigurationError as error:
+            parser.error(str(error))
+        index = f" and its offset index to {path}{INDEX_SUFFIX}" if args["format"] == "jsonl" else ""
+        print(f"Wrote {count} configurations to {path}{index}.")
+    else:
+        args["path"] = args["path"] or '.\\res\\settings.json'
+        for name in ("matrix", "grid", "format"):
+            args.pop(name)
+        configuration = get_configuration(args)
+        save_configuration_file(configuration.pop("path"), configuration)
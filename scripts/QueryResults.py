@@ -0,0 +1,92 @@
+import json
+import sys
+
+from argparse import ArgumentParser
+from pathlib import Path
+
+# The results store lives with the game's modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from ResultsStore import ResultsReader
+
+
+def print_table(rows, columns):
+    """
+    Prints rows as a table with aligned columns.
+
+    Args:
+        rows (list): The rows, as dicts.
+        columns (list): The keys of the columns to print.
+
+    Returns:
+        None
+    """
+    cells = [columns] + [["" if row[column] is None else format_value(row[column]) for column in columns] for row in rows]
+    widths = [max(len(line[index]) for line in cells) for index in range(len(columns))]
+    for line in cells:
+        print("  ".join(cell.rjust(width) for cell, width in zip(line, widths)))
+
+
+def format_value(value):
+    """
+    Formats a value of a table cell.
+
+    Args:
+        value: The value.
+
+    Returns:
+        str: The formatted value.
+    """
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    if isinstance(value, dict):
+        return json.dumps(value, sort_keys=True)
+    return str(value)
+
+
+def leaderboard(reader, args):
+    rows = reader.leaderboard(args.limit, args.config)
+    for rank, row in enumerate(rows, 1):
+        row["rank"] = rank
+    return rows, ["rank", "score", "length", "ticks", "duration", "seed", "config_hash"]
+
+
+def percentiles(reader, args):
+    config_hashes = [args.config] if args.config else [row["config_hash"] for row in reader.summary()]
+    rows = [dict(config_hash=config_hash, **reader.percentiles(config_hash)) for config_hash in config_hashes]
+    return rows, ["config_hash"] + [f"p{percentile}" for percentile in reader.PERCENTILES]
+
+
+def summary(reader, args):
+    return reader.summary(), ["config_hash", "games", "mean_score", "best_score", "configuration"]
+
+
+COMMANDS = {
+    "leaderboard": leaderboard,
+    "percentiles": percentiles,
+    "summary": summary,
+}
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description='Query the game results stored by "selfplay.py --database" or "main.py --results-db".')
+    parser.add_argument('database', type=str, help='Path of the results database')
+    parser.add_argument('command', choices=list(COMMANDS), help='The best games, the score percentiles of every configuration, or the number of games and scores of every configuration')
+    parser.add_argument("--config", dest="config", help="Only the games played with the configuration with this hash.")
+    parser.add_argument("--limit", dest="limit", type=int, default=10, help="The number of games on the leaderboard.")
+    parser.add_argument("--json", dest="json", action="store_true", help="Print one JSON line per row instead of a table.")
+    args = parser.parse_args()
+
+
+    if not Path(args.database).exists():
+        parser.error(f"The database {args.database} doesn't exist.")
+
+    # Read-only: queries never write to the database, which may be on read-only media
+    with ResultsReader(args.database) as reader:
+        rows, columns = COMMANDS[args.command](reader, args)
+
+    if args.json:
+        for row in rows:
+            print(json.dumps({column: row[column] for column in columns}))
+    else:
+        print_table(rows, columns)
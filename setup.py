@@ -9,6 +9,7 @@ setup(
     author='Jonathyn Stiverson',
     description='A simple Snake game',
     install_requires=[
+        'numpy',
         'pygame',
     ],
     author_email='jstiverson2002@gmail.com',
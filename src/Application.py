@@ -1,42 +1,101 @@
 import logging
 import os
-import json
-
-import pygame as pg
+import time
 
 from argparse import Namespace
+from pathlib import Path
+
+try:
+    from AsyncLogHandler import AsyncLogHandler
+    from Autopilot import Autopilot
+    from Configuration import CONFIGURATION_INDEX, LOG_LEVELS, OPTIONS, Configuration, ConfigurationError, ConfigurationWatcher
+    from Configuration import load_command_line_arguments, load_configuration_file, load_environmental_variables
+    from FixedTimestep import FixedTimestep
+    from FrameProfiler import FrameProfiler
+    from GameState import GameState
+    from HeadlessMode import HeadlessMode
+    from InputLatencyTest import InputLatencyTest
+    from Replay import ReplayRecorder
+    from ReplayMode import ReplayMode
+    from ResultsStore import ResultsStore
+except ImportError:
+    from .AsyncLogHandler import AsyncLogHandler
+    from .Autopilot import Autopilot
+    from .Configuration import CONFIGURATION_INDEX, LOG_LEVELS, OPTIONS, Configuration, ConfigurationError, ConfigurationWatcher
+    from .Configuration import load_command_line_arguments, load_configuration_file, load_environmental_variables
+    from .FixedTimestep import FixedTimestep
+    from .FrameProfiler import FrameProfiler
+    from .GameState import GameState
+    from .HeadlessMode import HeadlessMode
+    from .InputLatencyTest import InputLatencyTest
+    from .Replay import ReplayRecorder
+    from .ReplayMode import ReplayMode
+    from .ResultsStore import ResultsStore
+
+# pygame (and the sprites built on it) is only imported by Application.setup_pygame(),
+# so headless games, --help and configuration errors never load it or touch SDL.
+pg = None
+
 
-from Snake import Snake
 class Application:
     """
     Application class represents a snake game.
 
     Attributes:
         Instance variables:
+            configuration (Configuration): A validated snapshot of the options.
             logger (logging.Logger): The logger object for the Application class.
+            log_handlers (list): The handlers added to the logger by setup_logging().
             running (bool): Indicates whether the game is running.
             screen (pg.Surface): The screen to be used for the game.
             clock (pg.time.Clock): The clock to be used for the game.
+            timestep (FixedTimestep): Schedules logic ticks and rendered frames.
+            recorder (ReplayRecorder): Records the inputs of the game, if recording is enabled.
+            profiler (FrameProfiler): Times the phases of every frame, and the input latency ("input").
+            input (InputHandler): Receives the input events and buffers the turns.
+            pilot (Autopilot): Steers the snake when the autopilot is on, or None.
+            results_store (ResultsStore): Stores the result of every game, opened by the first store_result(), or None.
+            atlas (SpriteAtlas): The pre-rendered graphics of the sprites.
+            scaled_renderer (ScaledRenderer): Draws the board in scaled mode, or None.
+            overlay (ProfileOverlay): Draws the frame timings on screen.
+            direction_keys (dict): The direction each arrow key code steers the snake in.
+            profile_overlay_key (int): The key code toggling the profiler overlay.
+            frames_rendered (int): The number of frames rendered.
+            pixels_pushed (int): The number of pixels pushed to the display in the last frame.
+            total_pixels_pushed (int): The number of pixels pushed to the display in all frames.
             application_dir (str): The path to the directory containing the Application.
             resources_dir (str): The path to the directory containing the game resources.
+            state (GameState): The display-independent game state (None in arena mode).
+            arena (Arena): The display-independent state of an arena with many snakes, or None.
+            mode (object): Plays the game instead of the interactive game loop: a HeadlessMode, ReplayMode,
+                ServerMode or ArenaMode, or None.
+            server (GameServer): Streams the game to network clients, or None.
 
         Options:
-            command_line_arguments (argparse.Namespace): The command line arguments passed to the Application.
+            command_line_arguments (dict): The command line arguments passed to the Application.
             configuration_file (str): The path to the configuration file.
-            log_level (int): The log level to be set.
-            log_level_name (str): The name of the log level to be set.
-            width (int): The width of the game window.
-            height (int): The height of the game window.
+            configuration_index (int): The entry of a JSON Lines configuration file to load (None loads the first one).
+            log_level_name (str): The name of the log level, the log_level option holds its number (logging.DEBUG, ...).
+
+            Every option of Configuration.OPTIONS is an attribute of the same name, None until configure() sets it:
+                {options}
 
         Final variables:
             DEFAULT_LOG_LEVEL (str): The default log level to be set.
+            DIRECTION_KEYS (dict): The direction each arrow key (by name) steers the snake in.
+            PROFILE_OVERLAY_KEY (str): The name of the key toggling the profiler overlay.
+            HOT_RELOADED_OPTIONS (set): The options reload_configuration() applies without a restart.
+            RESULT_OPTIONS (tuple): The options stored (and hashed) as the configuration of a game's result.
 
     Methods:
         General Application methods:
             __init__(): Initializes the Application object.
 
             setup(): Sets up the Application.
+            configure(): Loads and validates the options.
+            reload_configuration(): Applies a changed configuration file to the running game.
             setup_logging(): Sets up logging for the game.
+            setup_game(): Sets up the display-independent game state.
 
             start(): Starts the Application.
             stop(): Stops the Application.
@@ -44,42 +103,101 @@ class Application:
         Game methods:
             setup_pygame(): Sets up the Pygame library for the game.
             
-            loop(): The main game loop.
+            loop(): The main game loop, or the loop of the mode.
+            store_result(): Stores the result of the game in the results database.
+            steer(): Steers the snake and records the input.
             render(): Renders the game graphics.
             update(): Updates the game state.
     
     TODO
     Set pygame caption
     """
-    # Configurable options
+    # Configurable options (the options of Configuration.OPTIONS, in the same order)
     configuration_file = None
-    log_level = getattr(logging, "DEBUG") # logging.ERROR = 40, logging.DEBUG = 10...
-    log_level_name = "debug"
+    configuration_index = None
+    log_level_name = None
+    log_level = None
     log_directory = None
     log_file = None
+    log_async = None
+    log_queue_size = None
+    log_overflow = None
     width = None
     height = None
+    headless = None
+    ticks = None
+    logic_rate = None
+    render_rate = None
+    render_mode = None
+    render_scale = None
+    display_scaled = None
+    adaptive_resolution = None
+    seed = None
+    snakes = None
+    record = None
+    replay_directory = None
+    replay_file = None
+    profile = None
+    profile_overlay = None
+    profile_interval = None
+    watch_configuration = None
+    input_latency_test = None
+    autopilot = None
+    cache_directory = None
+    results_database = None
+    serve_port = None
+    serve_host = None
+    send_rate = None
 
 
     # Instance variables
     application_dir = None
     resources_dir = None
     logger = None
+    log_handlers = []
+    configuration = None
     running = False
     screen = None
     clock = None
+    timestep = None
+    state = None
+    arena = None
+    mode = None
+    server = None
+    recorder = None
+    profiler = None
+    input = None
+    pilot = None
+    results_store = None
+    atlas = None
+    scaled_renderer = None
+    overlay = None
+    direction_keys = None
+    profile_overlay_key = None
+    frames_rendered = 0
+    pixels_pushed = 0
+    total_pixels_pushed = 0
+
+    # Final variables
+    DIRECTION_KEYS = {
+        "left": (-1, 0),
+        "right": (1, 0),
+        "up": (0, -1),
+        "down": (0, 1),
+    }
+    PROFILE_OVERLAY_KEY = "f3"
+    HOT_RELOADED_OPTIONS = {"log_level", "logic_rate", "render_rate", "width", "height",
+                            "profile", "profile_overlay", "profile_interval"}
+    RESULT_OPTIONS = ("width", "height", "logic_rate", "autopilot")
     
     def __init__(self, command_line_arguments, *args, **kwargs):
         """
         Initializes the Application object.
 
         Args:
-            command_line_arguments (argparse.Namespace or dict): The command line arguments passed to the Application.
-            
-        kwargs:
-            configuration_file (str): The path to the configuration file.
-            log_level (str): The log level to be set.
-                Valid options are: debug, info, warning, error, and critical
+            command_line_arguments (argparse.Namespace or dict): The command line arguments passed to the Application,
+                by option name (see Configuration.OPTIONS). The options they don't set (or set to None) are read
+                from the environmental variables, the configuration file or the defaults.
 
         Returns:
             None
@@ -90,22 +208,30 @@ class Application:
         self.command_line_arguments = command_line_arguments
         self.configure()
         self.setup_logging()
-        self.setup_pygame()
+        self.setup_game()
+
+        if not self.headless:
+            self.setup_pygame()
         
 
     def configure(self):
         """
         Configures the Application.
 
-        This method loads the options (log_level, width, height, configuration_file) on startup
-        using the following priority:
+        This method loads the options described by Configuration.OPTIONS (log_level, width, height, headless,
+        logic_rate, render_rate, ...) and the configuration_file using the following priority:
         1. Command line arguments
         2. Environmental variables
         3. Configuration file
         4. Default values
 
+        Every value is validated against the schema, and a snapshot of the result is kept in `configuration`.
+
         Returns:
             None
+
+        Raises:
+            ConfigurationError: If an option has an invalid value.
         """
         current_dir = os.path.dirname(__file__)
         self.application_dir = os.path.abspath(current_dir + "/..")
@@ -123,31 +249,64 @@ class Application:
         else:
             self.configuration_file = None
 
+        # A JSON Lines configuration file holds many configurations, the index selects one
+        if self.command_line_arguments.get("configuration_index", None) is not None:
+            self.configuration_index = CONFIGURATION_INDEX.validate(self.command_line_arguments["configuration_index"],
+                                                                    "command line")
+        elif "CONFIGURATION_INDEX" in os.environ:
+            self.configuration_index = CONFIGURATION_INDEX.validate(os.environ["CONFIGURATION_INDEX"], "$CONFIGURATION_INDEX")
+        else:
+            self.configuration_index = None
 
-        self.load_command_line_arguments()
-        self.load_environmental_variables()
+        # Forget the options of an earlier call, so removing an option from the file restores its default
+        for option in OPTIONS:
+            setattr(self, option.name, None)
+        self.log_level_name = None
+
+        # Load the sources from lowest to highest priority so that higher priority sources
+        # overwrite the options set by lower priority ones.
         self.load_configuration_file()
+        self.load_environmental_variables()
+        self.load_command_line_arguments()
         self.set_default_values()
 
+        values = {option.name: getattr(self, option.name) for option in OPTIONS}
+        values["log_level"] = self.log_level_name
+        self.configuration = Configuration(values)
+
+
+    def apply_options(self, values):
+        """
+        Sets validated options on the Application.
+
+        Args:
+            values (Mapping): The validated options, by name.
+
+        Returns:
+            None
+        """
+        for name, value in values.items():
+            if name == "log_level":
+                self.log_level_name = value
+                value = LOG_LEVELS[value]
+            setattr(self, name, value)
+
 
     def load_configuration_file(self):
         """
         Loads the configuration file.
 
+        The file is only parsed and validated again when it changed since it was last loaded.
+        In a JSON Lines file, only the entry selected by configuration_index is parsed.
+
         Returns:
             None
+
+        Raises:
+            ConfigurationError: If the file isn't valid JSON or contains invalid values. No option is set then.
         """
-        # If any of these options are invalid, the application throws an exception. 
-        # Do we want this? Or do we want to just ignore the invalid options?
         if self.configuration_file:
-            with open(self.configuration_file) as f:
-                config = json.load(f)
-                self.log_level_name = config.get("log_level", None)
-                self.log_level = getattr(logging, self.log_level_name.upper())
-                self.log_directory = config.get("logging_directory", None)
-                self.log_file = config.get("log_file", None)
-                self.width = config.get("width", None)
-                self.height = config.get("height", None)
+            self.apply_options(load_configuration_file(self.configuration_file, self.configuration_index))
 
 
     def load_environmental_variables(self):
@@ -157,17 +316,7 @@ class Application:
         Returns:
             None
         """
-        if "LOG_LEVEL" in os.environ:
-            self.log_level = getattr(logging, os.environ["LOG_LEVEL"].upper(), logging.DEBUG)
-            self.log_level_name = os.environ["LOG_LEVEL"].lower()
-        if "LOG_DIRECTORY" in os.environ:
-            self.log_directory = os.environ["LOG_DIRECTORY"]
-        if "LOG_FILE" in os.environ:
-            self.log_file = os.environ["LOG_FILE"]
-        if "WIDTH" in os.environ:
-            self.width = int(os.environ["WIDTH"])
-        if "HEIGHT" in os.environ:
-            self.height = int(os.environ["HEIGHT"])
+        self.apply_options(load_environmental_variables(os.environ))
 
 
     def load_command_line_arguments(self):
@@ -177,19 +326,7 @@ class Application:
         Returns:
             None
         """
-        args = self.command_line_arguments
-
-        if "log_level" in args and args["log_level"] is not None:
-            self.log_level = getattr(logging, args["log_level"].upper())
-            self.log_level_name = args["log_level"].lower()
-        if "log_directory" in args and args["log_directory"] is not None:
-            self.log_directory = args["log_directory"]
-        if "log_file" in args and args["log_file"] is not None:
-            self.log_file = args["log_file"]
-        if "width" in args and args["width"] is not None:
-            self.width = args["width"]
-        if "height" in args and args["height"] is not None:
-            self.height = args["height"]
+        self.apply_options(load_command_line_arguments(self.command_line_arguments))
 
 
     def set_default_values(self):
@@ -199,17 +336,141 @@ class Application:
         Returns:
             None
         """
-        if self.log_level is None and self.log_level_name is None:
-            self.log_level = getattr(logging, "DEBUG")
-            self.log_level_name = "debug"
-        if self.log_directory is None:
-            self.log_directory = "logs"
-        if self.log_file is None:
-            self.log_file = "application.log"
-        if self.width is None:
-            self.width = 800
-        if self.height is None:
-            self.height = 600
+        for option in OPTIONS:
+            if getattr(self, option.name) is None and option.default is not None:
+                self.apply_options({option.name: option.default})
+
+        if self.replay_file is not None:
+            # Replays are always re-simulated without a display
+            self.headless = True
+        if self.serve_port is not None:
+            # The clients render the game, the server only simulates it
+            self.headless = True
+
+
+    def reload_configuration(self):
+        """
+        Reloads the configuration after the configuration file changed, and applies it to the running game.
+
+        The logic and render rates and the log level take effect immediately. A new resolution
+        resizes the window and starts a new game on a board of the new size. Other options (see
+        HOT_RELOADED_OPTIONS) keep their running values until the Application is restarted. An
+        invalid file is ignored.
+
+        Returns:
+            set: The names of the options that changed in the file.
+        """
+        previous = self.configuration
+        try:
+            self.configure()
+        except (ConfigurationError, OSError) as error:
+            self.logger.error(f"Ignoring the changed configuration file: {error}")
+            self.configure_from(previous)
+            return set()
+
+        changes = self.configuration.changes(previous)
+        restart_required = changes - self.HOT_RELOADED_OPTIONS
+        if restart_required:
+            # Only the hot reloaded options are applied, the others would change the running game under the loop
+            kept = {name: previous.values[name] for name in restart_required}
+            self.configure_from(Configuration(dict(self.configuration.values, **kept)))
+        if not changes:
+            return changes
+        self.logger.info(f"Configuration reloaded, changed options: {', '.join(sorted(changes))}.")
+
+        if "log_level" in changes:
+            self.logger.setLevel(self.log_level)
+        if changes & {"logic_rate", "render_rate"} and self.timestep is not None:
+            self.timestep.set_rates(self.logic_rate, self.render_rate)
+        if "render_rate" in changes and self.scaled_renderer is not None and self.scaled_renderer.scaler is not None:
+            self.scaled_renderer.scaler.budget = 1 / self.render_rate
+        if changes & {"width", "height"} and not self.headless:
+            self.resize()
+
+        if restart_required:
+            self.logger.warning(f"Restart the game to apply: {', '.join(sorted(restart_required))}.")
+        return changes
+
+
+    def configure_from(self, configuration):
+        """
+        Restores the options of a configuration snapshot.
+
+        Args:
+            configuration (Configuration): The snapshot to restore.
+
+        Returns:
+            None
+        """
+        self.apply_options(configuration.values)
+        self.configuration = configuration
+
+
+    def resize(self):
+        """
+        Resizes the window to the configured width and height and starts a new game on a board of that size.
+
+        Returns:
+            None
+        """
+        recording = self.recorder is not None
+        if recording:
+            self.stop_recording()
+
+        self.logger.info(f"Resolution changed to {self.width}x{self.height}, starting a new game.")
+        timestep, profiler = self.timestep, self.profiler
+        self.setup_game()
+        self.setup_pygame()
+        self.timestep, self.profiler = timestep, profiler
+        self.timestep.sleep = self.input.wait
+        self.overlay.rect = None
+
+        if recording:
+            self.start_recording()
+
+
+    def setup_game(self):
+        """
+        Sets up the display-independent game state, and the mode playing it without the interactive game loop.
+
+        Returns:
+            None
+        """
+        self.mode = None
+        if self.replay_file is None and self.snakes > 1:
+            if self.serve_port is None:
+                try:
+                    from ArenaMode import ArenaMode
+                except ImportError:
+                    from .ArenaMode import ArenaMode
+
+                self.mode = ArenaMode(self)
+                self.state, self.arena = None, self.mode.arena
+                return
+            self.logger.warning("The game server only serves a single snake, ignoring the snakes option.")
+
+        self.arena = None
+        if self.replay_file is not None:
+            self.mode = ReplayMode(self)
+            self.state = self.mode.state
+        else:
+            self.state = GameState(self.width, self.height, (self.width / 2, self.height / 2), seed=self.seed)
+        self.logger.info(f"Game seed set to {self.state.seed}.")
+
+        self.pilot = None
+        if self.autopilot and self.replay_file is None:
+            self.pilot = Autopilot(self.cache_directory)
+            self.logger.info(f"Autopilot on, {self.state.cols}x{self.state.rows} board.")
+
+        if self.mode is None and self.serve_port is not None:
+            try:
+                from ServerMode import ServerMode
+            except ImportError:
+                from .ServerMode import ServerMode
+
+            self.mode = ServerMode(self)
+        elif self.mode is None and self.headless:
+            self.mode = HeadlessMode(self)
 
 
     def setup_pygame(self):
@@ -219,11 +480,41 @@ class Application:
         Returns:
             None
         """
-        pg.init()
+        global pg
+        import pygame as pg
+
+        try:
+            from Food import Food
+            from InputHandler import InputHandler
+            from ProfileOverlay import ProfileOverlay
+            from ScaledRenderer import ScaledRenderer
+            from Snake import Snake
+            from SpriteAtlas import SpriteAtlas
+        except ImportError:
+            from .Food import Food
+            from .InputHandler import InputHandler
+            from .ProfileOverlay import ProfileOverlay
+            from .ScaledRenderer import ScaledRenderer
+            from .Snake import Snake
+            from .SpriteAtlas import SpriteAtlas
+
+        # Only bring up the subsystems the game uses (display and events), not audio, joysticks, ...
+        pg.display.init()
+
+        self.direction_keys = {pg.key.key_code(name): direction for name, direction in self.DIRECTION_KEYS.items()}
+        self.profile_overlay_key = pg.key.key_code(self.PROFILE_OVERLAY_KEY)
+        self.input = InputHandler(self.direction_keys)
         
 
         # Setup game window
-        self.screen = pg.display.set_mode((self.width, self.height))
+        self.scaled_renderer = None
+        if self.render_mode == "scaled" and self.arena is None:
+            self.scaled_renderer = ScaledRenderer(self.state, (self.width, self.height),
+                                                  self.render_scale or self.state.size[0], self.render_rate,
+                                                  self.display_scaled, self.adaptive_resolution, self.logger)
+            self.screen = self.scaled_renderer.screen
+        else:
+            self.screen = pg.display.set_mode((self.width, self.height))
         pg.display.set_caption("Snake Game")
 
 
@@ -233,17 +524,37 @@ class Application:
         self.background.fill("black")
 
 
+        # Pre-render the sprites' graphics in the display's pixel format
+        self.atlas = SpriteAtlas(self.state.size if self.state is not None else self.mode.CELL_SIZE)
+        if self.scaled_renderer is not None:
+            self.scaled_renderer.set_scale(self.scaled_renderer.scale)
+
+
         # Load background while game is loading
-        self.background.blit(self.background, (0, 0))
+        self.screen.blit(self.background, (0, 0))
         pg.display.flip()
 
 
         self.clock = pg.time.Clock()
-        self.all_sprites = pg.sprite.RenderPlain()
+        # Wait for the next frame on the event queue, so input is received as soon as it arrives
+        self.timestep = FixedTimestep(self.logic_rate, self.render_rate, sleep=self.input.wait)
+        self.profiler = FrameProfiler()
+        self.overlay = ProfileOverlay(self.profiler)
+
+        if self.arena is not None:
+            self.mode.setup_display()
+            return
+
+        # RenderUpdates keeps track of the regions its sprites covered, so only those need to be redrawn
+        if self.render_mode == "full":
+            self.all_sprites = pg.sprite.RenderPlain()
+        else:
+            self.all_sprites = pg.sprite.RenderUpdates()
         
         # Setup the sprites
-        self.snake = Snake(self, self.screen, (self.width / 2, self.height / 2))
-        self.all_sprites.add(self.snake)
+        self.snake = Snake(self, self.screen, (self.width / 2, self.height / 2), self.state)
+        self.food = Food(self, self.state)
+        self.all_sprites.add(self.snake, self.food)
 
 
     def setup_logging(self):
@@ -257,6 +568,11 @@ class Application:
         self.logger = logging.getLogger(__name__)
         self.logger.setLevel(self.log_level)
 
+        # The logger is shared by every Application, so remove the handlers added by earlier ones
+        for handler in Application.log_handlers:
+            self.logger.removeHandler(handler)
+            handler.close()
+
         # Set up logging formatter
         formatter = logging.Formatter("%(asctime)s:%(name)s:%(levelname)s:%(message)s")
 
@@ -265,7 +581,7 @@ class Application:
             os.makedirs(self.log_directory)
 
         if not os.path.exists(f"""{self.log_directory}/application.log"""):
-            os.path(f"""{self.log_directory}/application.log""").touch()
+            Path(f"""{self.log_directory}/application.log""").touch()
 
         file_handler = logging.FileHandler(f"""{self.log_directory}/{self.log_file}""")
         file_handler.setFormatter(formatter)
@@ -275,8 +591,14 @@ class Application:
         stream_handler.setFormatter(formatter)
 
         # Add handlers to logger
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(stream_handler)
+        # In async mode the game loop only queues records, the handlers write them from a background thread
+        if self.log_async:
+            Application.log_handlers = [AsyncLogHandler([file_handler, stream_handler], self.log_queue_size, self.log_overflow)]
+        else:
+            Application.log_handlers = [file_handler, stream_handler]
+
+        for handler in Application.log_handlers:
+            self.logger.addHandler(handler)
 
         # Log the log level
         self.logger.info(f"Log level set to {self.log_level_name.upper()}.")
@@ -303,7 +625,16 @@ class Application:
         Returns:
             None
         """
-        pg.quit()
+        if not self.headless:
+            pg.quit()
+
+        if self.results_store is not None:
+            self.results_store.close()
+            self.results_store = None
+
+        # Write the log records still waiting in the queue
+        for handler in Application.log_handlers:
+            handler.flush()
 
 
     # Game loop methods
@@ -311,27 +642,246 @@ class Application:
         """
         The main game loop.
 
+        The headless, replay, server and arena modes run their own loop (see `mode`).
+
         Returns:
             None
         """
+        if self.mode is not None:
+            self.mode.run()
+            return
+
+        if self.record:
+            self.start_recording()
+
+        # Poll the configuration file so rates and resolution can be changed while the game runs
+        watcher = None
+        if self.watch_configuration and self.configuration_file:
+            watcher = ConfigurationWatcher(self.configuration_file)
+
+        latency_test = None
+        if self.input_latency_test:
+            latency_test = InputLatencyTest(self.input, self.profiler, self.logger, self.input_latency_test)
+            latency_test.start(self.seed)
+
+        self.timestep.reset()
+        game_start = time.perf_counter()
+        profiler = self.profiler
+        profile_path = os.path.join(self.log_directory, "profile.jsonl")
+        next_profile_dump = time.perf_counter() + self.profile_interval
+
         # Game loop
         while self.running:
-            # Update
-            self.clock.tick(60)
+            frame_start = time.perf_counter()
+            if watcher is not None and watcher.changed():
+                self.reload_configuration()
 
-            for event in pg.event.get():
+            # Only pay for the timers while the profiler or its overlay is turned on
+            profiling = self.profile or self.profile_overlay
+            if profiling:
+                profiler.start_frame()
+
+            # Direction keys are buffered by the InputHandler, the other events are handled here
+            for event in self.input.poll():
                 if event.type == pg.QUIT:
                     self.logger.info("pygame.QUIT event detected.")
                     self.running = False
-            
-            self.all_sprites.update()
+                elif event.type == pg.KEYDOWN and event.key == self.profile_overlay_key:
+                    self.profile_overlay = not self.profile_overlay
+
+            if profiling:
+                profiler.mark("events")
+
+            # Update at the fixed logic rate, however long rendering takes, applying a buffered turn every tick
+            for _ in range(self.timestep.tick()):
+                self.input.apply(self.steer)
+                if self.pilot is not None:
+                    direction = self.pilot(self.state)
+                    if direction is not None:
+                        self.steer(direction)
+                self.all_sprites.update()
+
+            if profiling:
+                profiler.mark("update")
+
+            if not self.state.alive:
+                self.logger.info(f"Game over after {self.state.ticks} ticks, snake length {len(self.state.body)}.")
+                self.running = False
+
+            # Render at most at the render rate
+            if self.timestep.should_render():
+                self.render(self.timestep.alpha, profiling)
+                for latency in self.input.presented():
+                    profiler.record("input", int(latency * 1e9))
+
+                if self.scaled_renderer is not None and self.scaled_renderer.adapt(time.perf_counter() - frame_start):
+                    self.logger.debug(f"Render scale set to {self.scaled_renderer.scale} pixels per cell.")
+
+            if latency_test is not None and latency_test.finished():
+                latency_test.log()
+                self.running = False
+
+            if profiling:
+                profiler.end_frame()
+
+                if self.profile and time.perf_counter() >= next_profile_dump:
+                    profiler.dump(profile_path)
+                    next_profile_dump = time.perf_counter() + self.profile_interval
 
+            self.timestep.wait()
 
-            # Render
-            # self.screen.fill("black")
+        if self.profile:
+            profiler.dump(profile_path)
+            self.logger.info(f"Frame timings written to {profile_path}.")
+
+        if self.recorder is not None:
+            self.stop_recording()
+        self.store_result(time.perf_counter() - game_start)
+
+        if self.frames_rendered:
+            full_frame = self.width * self.height
+            average = self.total_pixels_pushed / self.frames_rendered
+            self.logger.info(f"Rendered {self.frames_rendered} frames ({self.render_mode}), "
+                             f"{average:.0f} pixels/frame ({100 * average / full_frame:.2f}% of a full frame).")
+
+
+    def store_result(self, duration):
+        """
+        Stores the result of the game in the results database, if one is configured.
+
+        The database is opened by the first game and stays open until stop().
+
+        Args:
+            duration (float): The number of seconds the game took.
+
+        Returns:
+            None
+        """
+        if self.results_database is None:
+            return
+
+        if self.results_store is None:
+            self.results_store = ResultsStore(self.results_database)
+        configuration = {option: getattr(self, option) for option in self.RESULT_OPTIONS}
+        config_hash = self.results_store.record_game(configuration, self.state, duration)
+        self.logger.info(f"Result stored in {self.results_database} (configuration {config_hash}).")
+
+
+    def start_recording(self):
+        """
+        Starts recording a replay of the current game.
+
+        Returns:
+            None
+        """
+        os.makedirs(self.replay_directory, exist_ok=True)
+        replay_path = os.path.join(self.replay_directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{self.state.seed}.replay")
+        self.recorder = ReplayRecorder(replay_path, self.state, {"logic_rate": self.logic_rate})
+        self.logger.info(f"Recording replay to {replay_path}.")
+
+
+    def stop_recording(self):
+        """
+        Finishes the replay of the current game.
+
+        Returns:
+            None
+        """
+        self.recorder.close(self.state)
+        self.logger.info(f"Recorded {self.recorder.inputs} inputs over {self.state.ticks} ticks.")
+        self.recorder = None
+
+
+    def steer(self, direction):
+        """
+        Steers the snake and records the input.
+
+        Args:
+            direction (tuple): The direction (x, y), with components -1, 0 or 1.
+
+        Returns:
+            bool: True if the snake changed direction (always in arena mode, where the turn is taken on the next step).
+        """
+        if self.arena is not None:
+            return self.mode.steer(direction)
+
+        if not self.state.steer(direction):
+            return False
+        if self.recorder is not None:
+            self.recorder.record(self.state.ticks, direction)
+        return True
+
+
+    def render(self, alpha=1.0, profiling=False):
+        """
+        Renders the game graphics.
+
+        Args:
+            alpha (float): How far between the last two logic ticks to draw the sprites (0 to 1).
+            profiling (bool): Whether to record the time taken by each render phase.
+
+        Returns:
+            None
+        """
+        overlay = self.overlay if self.profile_overlay else None
+
+        # The scaled board is drawn cell by cell from the game state, the sprites aren't used
+        if self.scaled_renderer is None:
+            for sprite in self.all_sprites:
+                if hasattr(sprite, "interpolate"):
+                    sprite.interpolate(alpha)
+
+        if self.scaled_renderer is not None:
+            self.pixels_pushed = self.scaled_renderer.render(self.profiler if profiling else None, overlay)
+        elif self.render_mode == "full":
             self.screen.blit(self.background, (0, 0))
+            if profiling:
+                self.profiler.mark("clear")
+
+            self.snake.draw_body(self.screen, self.background, full=True)
             self.all_sprites.draw(self.screen)
+            if overlay is not None:
+                overlay.draw(self.screen)
+            if profiling:
+                self.profiler.mark("draw")
+
             pg.display.flip()
+            self.pixels_pushed = self.width * self.height
+        else:
+            # Erase the sprites' previous regions, redraw the body cells that changed or were
+            # erased with them, draw the sprites, and push only the changed regions
+            cleared_rects = [rect for rect in self.all_sprites.spritedict.values() if rect]
+            self.all_sprites.clear(self.screen, self.background)
+            previous_overlay = self.overlay.rect
+            if previous_overlay is not None:
+                self.screen.blit(self.background, previous_overlay, previous_overlay)
+                cleared_rects.append(previous_overlay)
+            if profiling:
+                self.profiler.mark("clear")
+
+            dirty_rects = self.snake.draw_body(self.screen, self.background, cleared_rects)
+            dirty_rects += self.all_sprites.draw(self.screen)
+            if previous_overlay is not None:
+                dirty_rects.append(previous_overlay)
+                self.overlay.rect = None
+            if overlay is not None:
+                dirty_rects.append(overlay.draw(self.screen))
+            if profiling:
+                self.profiler.mark("draw")
+
+            pg.display.update(dirty_rects)
+
+            screen_rect = self.screen.get_rect()
+            self.pixels_pushed = 0
+            for rect in dirty_rects:
+                clipped = rect.clip(screen_rect)
+                self.pixels_pushed += clipped.width * clipped.height
+
+        if profiling:
+            self.profiler.mark("display")
+
+        self.frames_rendered += 1
+        self.total_pixels_pushed += self.pixels_pushed
 
 
     def update(self):
@@ -342,3 +892,9 @@ class Application:
             None
         """
         pass
+
+
+
+# The docstring lists the options from their descriptions in Configuration.OPTIONS (docstrings are stripped under -OO)
+if Application.__doc__:
+    Application.__doc__ = Application.__doc__.replace("{options}", "\n                ".join(option.describe() for option in OPTIONS))
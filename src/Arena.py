@@ -0,0 +1,514 @@
+import numpy as np
+
+
+# The values of the occupancy grid that aren't snakes (snake k is stored as k + 1)
+EMPTY = 0
+FOOD = -1
+WALL = -2
+
+# The same order as Policies.DIRECTIONS, so direction i ^ 1 is the reverse of direction i
+DIRECTIONS = np.array([(-1, 0), (1, 0), (0, -1), (0, 1)], dtype=np.int64)
+
+
+class Arena:
+    """
+    The Arena class simulates many snakes on one shared board with NumPy.
+
+    The board is an occupancy grid holding, for every cell, EMPTY, FOOD, WALL or
+    the number of the snake occupying it (snake k is stored as k + 1). Every snake's
+    body is a ring buffer of cells, at its own offset in one shared pool. A tick moves
+    every snake at once with array operations, so its cost grows with the number of
+    snakes and not with the number of pairs of snakes, and never depends on how long
+    they are. Every ring buffer starts short, and a growing snake that fills its own
+    is moved to a new one of twice the capacity (up to the whole board) at the end of
+    the pool. The pool therefore holds at most a few times the cells of all the bodies,
+    however unequal their lengths are.
+
+    Snakes die entering a wall or any snake's body, including their own; a tail that
+    moves away in the same tick doesn't count. Two heads entering the same cell both
+    die, and so do two heads swapping cells. Dead snakes are removed from the board.
+    Eaten food grows the snake and is replaced on a random empty cell.
+
+    Attributes:
+        cols (int): The number of columns on the board.
+        rows (int): The number of rows on the board.
+        grid (np.ndarray): The occupancy of every cell (rows * cols).
+        dirty (np.ndarray): True for every cell that changed since take_dirty() was last called.
+        pool (np.ndarray): The ring buffers of body cells of all snakes.
+        used (int): The number of entries of the pool holding ring buffers.
+        offsets (np.ndarray): The position of every snake's ring buffer in the pool.
+        capacities (np.ndarray): The capacity of every snake's ring buffer.
+        heads (np.ndarray): The position of every snake's head in its ring buffer.
+        lengths (np.ndarray): The length of every snake.
+        growth (np.ndarray): The number of segments every snake still has to grow.
+        directions (np.ndarray): The index in DIRECTIONS every snake is moving in.
+        alive (np.ndarray): Whether every snake is alive.
+        scores (np.ndarray): The amount of food every snake has eaten.
+        targets (np.ndarray): The food cell every snake is heading for, or -1 (see greedy_controller()).
+        food (int): The number of food items kept on the board.
+        ticks (int): The number of ticks that have been simulated.
+        seed (int): The seed of the random number generator.
+        rng (np.random.Generator): Places snakes and food, and is passed to the controllers.
+        controllers (list): (controller, snakes) pairs, see run().
+
+    Final variables:
+        INITIAL_CAPACITY (int): The capacity of every snake's ring buffer at the start.
+    """
+    cols = None
+    rows = None
+    grid = None
+    dirty = None
+    pool = None
+    used = 0
+    offsets = None
+    capacities = None
+    heads = None
+    lengths = None
+    growth = None
+    directions = None
+    alive = None
+    scores = None
+    targets = None
+    food = 0
+    ticks = 0
+    seed = None
+    rng = None
+    controllers = None
+
+    INITIAL_CAPACITY = 16
+
+
+    def __init__(self, cols, rows, snakes, food=None, seed=None):
+        """
+        Initializes the Arena object and places the snakes and the food.
+
+        Args:
+            cols (int): The number of columns on the board.
+            rows (int): The number of rows on the board.
+            snakes (int): The number of snakes.
+            food (int): The number of food items kept on the board (defaults to one per snake).
+            seed (int): The seed used to place snakes and food (None picks a random seed).
+
+        Returns:
+            None
+        """
+        cell_count = cols * rows
+        food = snakes if food is None else food
+        if snakes < 1 or snakes + food > cell_count:
+            raise ValueError(f"Can't fit {snakes} snakes and {food} food on a {cols}x{rows} board.")
+
+        self.cols = cols
+        self.rows = rows
+        self.seed = seed if seed is not None else int(np.random.SeedSequence().entropy % 2 ** 32)
+        self.rng = np.random.default_rng(self.seed)
+        self.food = food
+        self.ticks = 0
+
+        self.grid = np.zeros(cell_count, dtype=np.int32)
+        self.dirty = np.ones(cell_count, dtype=bool)
+
+        capacity = min(self.INITIAL_CAPACITY, cell_count)
+        self.pool = np.zeros(snakes * capacity, dtype=np.int64)
+        self.used = len(self.pool)
+        self.offsets = np.arange(snakes, dtype=np.int64) * capacity
+        self.capacities = np.full(snakes, capacity, dtype=np.int64)
+        self.heads = np.zeros(snakes, dtype=np.int64)
+        self.lengths = np.ones(snakes, dtype=np.int64)
+        self.growth = np.zeros(snakes, dtype=np.int64)
+        self.directions = self.rng.integers(0, len(DIRECTIONS), snakes)
+        self.alive = np.ones(snakes, dtype=bool)
+        self.scores = np.zeros(snakes, dtype=np.int64)
+        self.targets = np.full(snakes, -1, dtype=np.int64)
+
+        cells = self.rng.choice(cell_count, snakes, replace=False)
+        self.pool[self.offsets] = cells
+        self.grid[cells] = np.arange(1, snakes + 1)
+        self.spawn_food(food)
+
+        self.controllers = [(random_controller, np.arange(snakes))]
+
+
+    def __len__(self):
+        return len(self.alive)
+
+
+    @property
+    def head_cells(self):
+        """
+        The cell of every snake's head.
+        """
+        return self.pool[self.offsets + self.heads]
+
+
+    def body(self, snake):
+        """
+        Returns the cells of a snake's body, from head to tail.
+
+        Args:
+            snake (int): The number of the snake.
+
+        Returns:
+            np.ndarray: The cell indices.
+        """
+        positions = (self.heads[snake] - np.arange(self.lengths[snake])) % self.capacities[snake]
+        return self.pool[self.offsets[snake] + positions]
+
+
+    def neighbors(self, cells, directions):
+        """
+        Returns the cells next to cells in directions, wrapping around the edges of the board.
+
+        Args:
+            cells (np.ndarray): The cell indices.
+            directions (np.ndarray): An index in DIRECTIONS for every cell.
+
+        Returns:
+            np.ndarray: The neighboring cell indices.
+        """
+        offsets = DIRECTIONS[directions]
+        cols, rows = self.cols, self.rows
+        return ((cells // cols + offsets[..., 1]) % rows) * cols + (cells % cols + offsets[..., 0]) % cols
+
+
+    def grow_capacity(self, snakes):
+        """
+        Moves the ring buffers of snakes to new ones of twice the capacity (up to the number of cells on the board).
+
+        The new ring buffers are appended to the pool, which doubles in size when it's full,
+        and every body is laid out again from tail to head at their start.
+
+        Args:
+            snakes (np.ndarray): The numbers of the snakes.
+
+        Returns:
+            None
+        """
+        capacities = self.capacities[snakes]
+        grown = np.minimum(2 * capacities, len(self.grid))
+        offsets = self.used + np.concatenate(([0], np.cumsum(grown)[:-1]))
+        self.used += int(grown.sum())
+        if self.used > len(self.pool):
+            pool = np.zeros(max(2 * len(self.pool), self.used), dtype=self.pool.dtype)
+            pool[:len(self.pool)] = self.pool
+            self.pool = pool
+
+        for snake, capacity, offset in zip(snakes.tolist(), capacities.tolist(), offsets.tolist()):
+            order = (self.heads[snake] + 1 + np.arange(capacity)) % capacity
+            self.pool[offset:offset + capacity] = self.pool[self.offsets[snake] + order]
+        self.offsets[snakes] = offsets
+        self.capacities[snakes] = grown
+        self.heads[snakes] = capacities - 1
+
+
+    def nearest_food(self, cells):
+        """
+        Returns a food close to each of some cells, with a coarse grid of buckets as spatial index.
+
+        The food is sorted into square buckets holding about one food each (a bucket keeps
+        one of its food). The buckets around every cell are searched ring by ring, and
+        the closest food of the first ring holding any is returned. The cost per cell
+        depends on how dense the food is, not on how many snakes or food there are.
+
+        Args:
+            cells (np.ndarray): The cell indices.
+
+        Returns:
+            np.ndarray: A food cell for every cell, or -1 if there is no food.
+        """
+        nearest = np.full(len(cells), -1, dtype=np.int64)
+        food = np.flatnonzero(self.grid == FOOD)
+        if not len(food) or not len(cells):
+            return nearest
+
+        cols, rows = self.cols, self.rows
+        size = max(1, int(np.sqrt(cols * rows / len(food))))
+        bucket_cols, bucket_rows = -(-cols // size), -(-rows // size)
+        buckets = np.full(bucket_cols * bucket_rows, -1, dtype=np.int64)
+        buckets[(food // cols // size) * bucket_cols + food % cols // size] = food
+
+        col, row = cells % cols // size, cells // cols // size
+        pending = np.arange(len(cells))
+        for radius in range(max(bucket_cols, bucket_rows) // 2 + 1):
+            span = np.arange(-radius, radius + 1)
+            dx, dy = np.meshgrid(span, span)
+            ring = np.maximum(np.abs(dx), np.abs(dy)).ravel() == radius
+            dx, dy = dx.ravel()[ring], dy.ravel()[ring]
+
+            candidates = buckets[((row[pending, None] + dy) % bucket_rows) * bucket_cols
+                                 + (col[pending, None] + dx) % bucket_cols]
+            distances = self.distances(cells[pending, None], candidates).astype(np.float64)
+            distances[candidates < 0] = np.inf
+            best = distances.argmin(axis=1)
+            found = np.isfinite(distances[np.arange(len(pending)), best])
+            nearest[pending[found]] = candidates[found, best[found]]
+            pending = pending[~found]
+            if not len(pending):
+                break
+        return nearest
+
+
+    def distances(self, cells, targets):
+        """
+        Returns the number of moves between cells and targets, wrapping around the edges of the board.
+
+        Args:
+            cells (np.ndarray): The cell indices.
+            targets (np.ndarray): The target cell indices (broadcast against cells).
+
+        Returns:
+            np.ndarray: The distances.
+        """
+        cols, rows = self.cols, self.rows
+        dx = np.abs(cells % cols - targets % cols)
+        dy = np.abs(cells // cols - targets // cols)
+        return np.minimum(dx, cols - dx) + np.minimum(dy, rows - dy)
+
+
+    def add_walls(self, cells):
+        """
+        Blocks empty cells with walls.
+
+        Args:
+            cells (iterable): The cell indices.
+
+        Returns:
+            None
+        """
+        cells = np.asarray(cells, dtype=np.int64)
+        cells = cells[self.grid[cells] == EMPTY]
+        self.grid[cells] = WALL
+        self.dirty[cells] = True
+
+
+    def spawn_food(self, count):
+        """
+        Places food on random empty cells.
+
+        Random cells are probed first, which is cheap while the board is mostly empty.
+
+        Args:
+            count (int): The number of food items to place.
+
+        Returns:
+            None
+        """
+        grid = self.grid
+        while count > 0:
+            candidates = np.unique(self.rng.integers(0, len(grid), count * 2))
+            candidates = candidates[grid[candidates] == EMPTY]
+            if not len(candidates):
+                candidates = np.flatnonzero(grid == EMPTY)
+                if not len(candidates):
+                    return
+            cells = self.rng.permutation(candidates)[:count]
+            grid[cells] = FOOD
+            self.dirty[cells] = True
+            count -= len(cells)
+
+
+    def steer(self, actions):
+        """
+        Steers the snakes.
+
+        Args:
+            actions (np.ndarray): An index in DIRECTIONS for every snake, or -1 to keep going straight.
+                Snakes longer than one segment can't reverse into themselves.
+
+        Returns:
+            None
+        """
+        actions = np.asarray(actions)
+        reverse = (actions ^ 1) == self.directions
+        allowed = (actions >= 0) & self.alive & ~(reverse & (self.lengths > 1))
+        self.directions[allowed] = actions[allowed]
+
+
+    def step(self, actions=None):
+        """
+        Advances every living snake by one cell.
+
+        Args:
+            actions (np.ndarray): Passed on to steer() first, if given.
+
+        Returns:
+            np.ndarray: The numbers of the snakes that died in this tick.
+        """
+        if actions is not None:
+            self.steer(actions)
+        self.ticks += 1
+
+        snakes = np.flatnonzero(self.alive)
+        if not len(snakes):
+            return snakes
+
+        grid, dirty = self.grid, self.dirty
+        full = snakes[(self.lengths[snakes] == self.capacities[snakes]) & (self.growth[snakes] > 0)
+                      & (self.capacities[snakes] < len(grid))]
+        if len(full):
+            self.grow_capacity(full)
+        offsets, capacities = self.offsets[snakes], self.capacities[snakes]
+        heads, lengths, growth = self.heads[snakes], self.lengths[snakes], self.growth[snakes]
+        previous = self.pool[offsets + heads]
+        cells = self.neighbors(previous, self.directions[snakes])
+
+        # Two heads swapping cells would pass through each other, so they collide
+        index = np.full(len(self.alive), -1, dtype=np.int64)
+        index[snakes] = np.arange(len(snakes))
+        others = index[np.maximum(grid[cells], 0) - 1]
+        others[grid[cells] <= 0] = -1
+        swapped = (others >= 0) & (previous[others] == cells) & (cells[others] == previous)
+
+        # Tails of snakes that aren't growing move out of the way before the heads move.
+        # A snake as long as the board has nowhere left to grow.
+        moving = (growth == 0) | (lengths == len(grid))
+        tails = self.pool[offsets[moving] + (heads[moving] - lengths[moving] + 1) % capacities[moving]]
+        grid[tails] = EMPTY
+        dirty[tails] = True
+
+        # Entering a wall or any body kills, and so does two heads entering the same cell
+        occupants = grid[cells]
+        dead = (occupants > 0) | (occupants == WALL) | swapped
+        _, inverse, counts = np.unique(cells, return_inverse=True, return_counts=True)
+        dead |= counts[inverse] > 1
+
+        died = snakes[dead]
+        if len(died):
+            self.alive[died] = False
+            for snake in died:
+                body = self.body(snake)
+                body = body[grid[body] == snake + 1]
+                grid[body] = EMPTY
+                dirty[body] = True
+
+        live = ~dead
+        snakes, cells, heads = snakes[live], cells[live], (heads[live] + 1) % capacities[live]
+        eaten = occupants[live] == FOOD
+        growing = ~moving[live]
+
+        self.heads[snakes] = heads
+        self.pool[offsets[live] + heads] = cells
+        grid[cells] = snakes + 1
+        dirty[cells] = True
+
+        self.lengths[snakes[growing]] += 1
+        self.growth[snakes[growing]] -= 1
+        self.growth[snakes[eaten]] += 1
+        self.scores[snakes[eaten]] += 1
+
+        if eaten.any():
+            self.spawn_food(int(eaten.sum()))
+
+        return died
+
+
+    def actions(self):
+        """
+        Asks every controller for the actions of its snakes.
+
+        Returns:
+            np.ndarray: An index in DIRECTIONS, or -1, for every snake.
+        """
+        actions = np.full(len(self.alive), -1, dtype=np.int64)
+        for controller, snakes in self.controllers:
+            snakes = np.asarray(snakes, dtype=np.int64)
+            snakes = snakes[self.alive[snakes]]
+            if len(snakes):
+                actions[snakes] = controller(self, snakes, self.rng)
+        return actions
+
+
+    def run(self, ticks=None):
+        """
+        Steers the snakes with their controllers and advances the game.
+
+        A controller is a callable controller(arena, snakes, rng) returning an index in
+        DIRECTIONS, or -1 to keep going straight, for each of the (living) snakes it controls.
+
+        Args:
+            ticks (int): The number of ticks to simulate (None runs until every snake is dead).
+
+        Returns:
+            None
+        """
+        tick = 0
+        while self.alive.any() and (ticks is None or tick < ticks):
+            self.step(self.actions())
+            tick += 1
+
+
+    def safe_directions(self, snakes):
+        """
+        Returns which directions the snakes can move in without dying.
+
+        Tails are treated as blocked, and two snakes may still choose the same cell.
+
+        Args:
+            snakes (np.ndarray): The numbers of the snakes.
+
+        Returns:
+            np.ndarray: A (len(snakes), 4) boolean array, True for every safe direction.
+        """
+        heads = self.pool[self.offsets[snakes] + self.heads[snakes]]
+        neighbors = self.neighbors(heads[:, None], np.arange(len(DIRECTIONS))[None, :])
+        occupants = self.grid[neighbors]
+        safe = (occupants == EMPTY) | (occupants == FOOD)
+
+        # Reversing isn't possible, so it doesn't count as safe
+        reverse = self.directions[snakes] ^ 1
+        safe[np.arange(len(snakes)), reverse] &= self.lengths[snakes] == 1
+        return safe
+
+
+    def take_dirty(self):
+        """
+        Returns the cells that changed since the last call, for example to redraw them.
+
+        Returns:
+            np.ndarray: The cell indices.
+        """
+        cells = np.flatnonzero(self.dirty)
+        self.dirty[cells] = False
+        return cells
+
+
+def random_controller(arena, snakes, rng):
+    """
+    Turns into a random safe direction now and then, and whenever going straight isn't safe.
+    """
+    safe = arena.safe_directions(snakes)
+    straight = safe[np.arange(len(snakes)), arena.directions[snakes]]
+
+    scores = rng.random(safe.shape)
+    scores[~safe] = -1
+    actions = scores.argmax(axis=1)
+
+    actions[straight & (rng.random(len(snakes)) < 0.9)] = -1
+    actions[~safe.any(axis=1)] = -1
+    return actions
+
+
+def greedy_controller(arena, snakes, rng):
+    """
+    Moves towards a nearby food along the shortest wrapped distance, avoiding walls and bodies.
+
+    Every snake keeps heading for the same food (arena.targets) until it's gone, and only
+    the snakes that need a new target look one up with Arena.nearest_food().
+    """
+    heads = arena.pool[arena.offsets[snakes] + arena.heads[snakes]]
+    targets = arena.targets[snakes]
+    lost = (targets < 0) | (arena.grid[np.maximum(targets, 0)] != FOOD)
+    if lost.any():
+        targets[lost] = arena.nearest_food(heads[lost])
+        arena.targets[snakes] = targets
+    if (targets < 0).all():
+        return random_controller(arena, snakes, rng)
+
+    safe = arena.safe_directions(snakes)
+    neighbors = arena.neighbors(heads[:, None], np.arange(len(DIRECTIONS))[None, :])
+    # Random tie breaking between directions that are equally close
+    scores = arena.distances(neighbors, targets[:, None]) + rng.random(safe.shape) * 0.5
+    scores[~safe] = np.inf
+
+    actions = scores.argmin(axis=1)
+    actions[~safe.any(axis=1)] = -1
+    return actions
@@ -0,0 +1,198 @@
+import time
+
+try:
+    from Arena import Arena, greedy_controller, random_controller
+    from Policies import DIRECTIONS
+except ImportError:
+    from .Arena import Arena, greedy_controller, random_controller
+    from .Policies import DIRECTIONS
+
+# pygame is only imported by ArenaMode.setup_display(), so headless arenas never load it.
+pg = None
+
+
+class ArenaMode:
+    """
+    The ArenaMode class plays an arena with many snakes, with or without a display.
+
+    Without a display every snake is controlled by a policy and the arena is stepped as fast
+    as the CPU allows. On screen the player steers the first snake, the others alternate
+    between the greedy and the random policy, and the cells that changed are drawn straight
+    from the arena's grid, a color per snake spread around the color wheel.
+
+    Attributes:
+        application (Application): The application playing the arena.
+        arena (Arena): The display-independent state of the arena.
+        colors (list): The color of every value of the arena's grid, offset by 2 (see Arena.WALL).
+        player_action (int): The direction the player's snake turns to next, or -1.
+
+    Final variables:
+        CELL_SIZE (tuple): The size of an arena cell in pixels.
+    """
+    application = None
+    arena = None
+    colors = None
+    player_action = -1
+
+    CELL_SIZE = (10, 10)
+
+
+    def __init__(self, application):
+        """
+        Initializes the ArenaMode object and sets up the arena.
+
+        Args:
+            application (Application): The application playing the arena.
+
+        Returns:
+            None
+        """
+        self.application = application
+        snake_count = application.snakes
+        self.arena = Arena(application.width // self.CELL_SIZE[0], application.height // self.CELL_SIZE[1],
+                           snake_count, seed=application.seed)
+
+        snakes = list(range(snake_count))
+        first = 0 if application.headless else 1
+        self.arena.controllers = [
+            (greedy_controller, snakes[first::2]),
+            (random_controller, snakes[first + 1::2]),
+        ]
+        if not application.headless:
+            self.player_action = -1
+            self.arena.controllers.append((self.control_player, snakes[:1]))
+
+        application.logger.info(f"Arena with {snake_count} snakes, seed set to {self.arena.seed}.")
+
+
+    def setup_display(self):
+        """
+        Picks the colors the arena is drawn with, once pygame's display is set up.
+
+        Returns:
+            None
+        """
+        global pg
+        import pygame as pg
+
+        self.colors = [pg.Color("gray50"), pg.Color("red"), pg.Color("black")]
+        for snake in range(len(self.arena)):
+            color = pg.Color(0)
+            color.hsva = ((snake * 137.508) % 360, 60 if snake else 0, 100, 100)
+            self.colors.append(color)
+
+
+    def control_player(self, arena, snakes, rng):
+        """
+        The arena controller of the player's snake, turning it in the direction of the last arrow key.
+
+        Returns:
+            list: The action of the player's snake.
+        """
+        action, self.player_action = self.player_action, -1
+        return [action] * len(snakes)
+
+
+    def steer(self, direction):
+        """
+        Turns the player's snake on the next step.
+
+        Args:
+            direction (tuple): The direction (x, y), with components -1, 0 or 1.
+
+        Returns:
+            bool: Always True, the turn is taken on the next step.
+        """
+        self.player_action = DIRECTIONS.index(direction)
+        return True
+
+
+    def run(self):
+        """
+        Plays the arena until every snake died or the application stops.
+
+        Returns:
+            None
+        """
+        if self.application.headless:
+            self.run_headless()
+        else:
+            self.loop()
+
+
+    def run_headless(self):
+        """
+        Steps the arena as fast as possible, for the configured number of ticks.
+
+        Returns:
+            None
+        """
+        application, arena = self.application, self.arena
+        start_time = time.perf_counter()
+        arena.run(application.ticks)
+        application.running = False
+
+        elapsed = time.perf_counter() - start_time
+        application.logger.info(f"Simulated {arena.ticks} arena ticks in {elapsed:.3f}s "
+                                f"({arena.ticks / max(elapsed, 1e-9):.0f} ticks/s), "
+                                f"{int(arena.alive.sum())} of {len(arena)} snakes alive, best score {int(arena.scores.max())}.")
+
+
+    def loop(self):
+        """
+        The game loop of the arena on screen.
+
+        Returns:
+            None
+        """
+        application, arena = self.application, self.arena
+        timestep = application.timestep
+        timestep.reset()
+
+        while application.running:
+            for event in application.input.poll():
+                if event.type == pg.QUIT:
+                    application.logger.info("pygame.QUIT event detected.")
+                    application.running = False
+
+            for _ in range(timestep.tick()):
+                application.input.apply(self.steer)
+                arena.step(arena.actions())
+
+            if not arena.alive.any():
+                application.logger.info(f"Every snake died after {arena.ticks} ticks, best score {int(arena.scores.max())}.")
+                application.running = False
+
+            if timestep.should_render():
+                self.render()
+
+            timestep.wait()
+
+
+    def render(self):
+        """
+        Renders the cells of the arena that changed since the last frame.
+
+        Returns:
+            None
+        """
+        application = self.application
+        cols = self.arena.cols
+        width, height = self.CELL_SIZE
+        cells = self.arena.take_dirty()
+        owners = self.arena.grid[cells] + 2
+
+        screen, background, colors = application.screen, application.background, self.colors
+        dirty_rects = []
+        for cell, owner in zip(cells.tolist(), owners.tolist()):
+            rect = pg.Rect(cell % cols * width, cell // cols * height, width, height)
+            if owner == 2:
+                screen.blit(background, rect, rect)
+            else:
+                screen.fill(colors[owner], rect)
+            dirty_rects.append(rect)
+
+        pg.display.update(dirty_rects)
+        application.pixels_pushed = len(dirty_rects) * width * height
+        application.frames_rendered += 1
+        application.total_pixels_pushed += application.pixels_pushed
@@ -0,0 +1,197 @@
+import atexit
+import logging
+import threading
+
+from collections import deque
+
+
+class AsyncLogHandler(logging.Handler):
+    """
+    The AsyncLogHandler class moves log I/O off the game loop.
+
+    Logging a record only appends it to a bounded deque, which is atomic and
+    doesn't take the handler lock. A background thread wakes up every
+    flush_interval seconds, formats everything that was queued and hands it to
+    the target handlers in one batched write and flush per handler.
+
+    When the queue is full, the overflow policy decides what happens:
+        drop_newest: The new record is dropped.
+        drop_oldest: The oldest queued record is dropped.
+        block: The caller waits until the writer thread has made room (flush() wakes it up).
+
+    The writer thread is a daemon thread, so the handler is closed at interpreter exit
+    (writing the records still queued) unless it was closed before.
+
+    Attributes:
+        handlers (list): The stream handlers (for example FileHandler) records are written to.
+        queue (deque): The records waiting to be written.
+        max_size (int): The maximum number of queued records.
+        overflow (str): The overflow policy.
+        flush_interval (float): The number of seconds between batched writes.
+        dropped (int): The number of records dropped because the queue was full, counted under drop_lock.
+
+    Final variables:
+        OVERFLOW_POLICIES (tuple): The valid overflow policies.
+    """
+    handlers = None
+    queue = None
+    max_size = 10000
+    overflow = "drop_newest"
+    flush_interval = 0.05
+    dropped = 0
+
+    OVERFLOW_POLICIES = ("drop_newest", "drop_oldest", "block")
+
+
+    def __init__(self, handlers, max_size=10000, overflow="drop_newest", flush_interval=0.05):
+        """
+        Initializes the AsyncLogHandler object and starts the writer thread.
+
+        Args:
+            handlers (list): The stream handlers records are written to.
+            max_size (int): The maximum number of queued records.
+            overflow (str): The overflow policy (drop_newest, drop_oldest or block).
+            flush_interval (float): The number of seconds between batched writes.
+
+        Returns:
+            None
+        """
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Invalid overflow policy {overflow!r}, expected one of {', '.join(self.OVERFLOW_POLICIES)}.")
+
+        logging.Handler.__init__(self)
+        self.handlers = list(handlers)
+        self.max_size = max_size
+        self.overflow = overflow
+        self.flush_interval = flush_interval
+        self.dropped = 0
+
+        # drop_oldest is exactly what a deque with a maxlen does on append
+        self.queue = deque(maxlen=max_size if overflow == "drop_oldest" else None)
+        self.write_lock = threading.Lock()
+        # Records are dropped from any thread that logs, and the count is reset by the writer thread
+        self.drop_lock = threading.Lock()
+        # Notified by flush() once the queue is drained, for the callers blocked on a full queue
+        self.drained = threading.Condition()
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="AsyncLogHandler", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+
+    def handle(self, record):
+        """
+        Queues a record.
+
+        This overrides logging.Handler.handle() so the handler lock isn't taken on the hot path.
+
+        Args:
+            record (logging.LogRecord): The record to queue.
+
+        Returns:
+            bool: Whether the record passed the filters.
+        """
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+
+
+    def emit(self, record):
+        """
+        Queues a record, applying the overflow policy if the queue is full.
+
+        Args:
+            record (logging.LogRecord): The record to queue.
+
+        Returns:
+            None
+        """
+        queue = self.queue
+        if len(queue) >= self.max_size:
+            if self.overflow == "block":
+                with self.drained:
+                    # The timeout only matters if the writer thread is gone
+                    while len(queue) >= self.max_size and self.thread.is_alive():
+                        self.drained.wait(self.flush_interval)
+            else:
+                # drop_oldest: appending below pushes the oldest record out of the deque
+                with self.drop_lock:
+                    self.dropped += 1
+                if self.overflow == "drop_newest":
+                    return
+
+        queue.append(record)
+
+
+    def run(self):
+        """
+        Writes the queued records in batches until the handler is closed.
+
+        Returns:
+            None
+        """
+        while not self.stopping.wait(self.flush_interval):
+            self.flush()
+        self.flush()
+
+
+    def flush(self):
+        """
+        Writes all queued records to the target handlers.
+
+        Returns:
+            None
+        """
+        with self.write_lock:
+            queue = self.queue
+            records = []
+            while queue:
+                records.append(queue.popleft())
+            if self.overflow == "block":
+                with self.drained:
+                    self.drained.notify_all()
+
+            with self.drop_lock:
+                dropped, self.dropped = self.dropped, 0
+            if dropped:
+                records.append(logging.makeLogRecord({
+                    "name": __name__,
+                    "levelno": logging.WARNING,
+                    "levelname": "WARNING",
+                    "msg": f"{dropped} log records were dropped because the log queue was full.",
+                }))
+
+            if not records:
+                return
+
+            for handler in self.handlers:
+                lines = [handler.format(record) for record in records if record.levelno >= handler.level]
+                if not lines:
+                    continue
+                try:
+                    handler.acquire()
+                    handler.stream.write(handler.terminator.join(lines) + handler.terminator)
+                    handler.flush()
+                except Exception:
+                    handler.handleError(records[-1])
+                finally:
+                    handler.release()
+
+
+    def close(self):
+        """
+        Writes the remaining records, stops the writer thread and closes the target handlers.
+
+        Returns:
+            None
+        """
+        atexit.unregister(self.close)
+        if not self.stopping.is_set():
+            self.stopping.set()
+            if self.thread is not threading.current_thread():
+                self.thread.join()
+
+        for handler in self.handlers:
+            handler.close()
+        logging.Handler.close(self)
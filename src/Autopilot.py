@@ -0,0 +1,294 @@
+import os
+
+from array import array
+from collections import deque
+
+try:
+    from Policies import DIRECTIONS
+except ImportError:
+    from .Policies import DIRECTIONS
+
+
+# Hamiltonian cycles, keyed by board size (cols, rows): the cells in cycle order and the position of every cell
+_cycles = {}
+
+
+def build_hamiltonian_cycle(cols, rows):
+    """
+    Builds a cycle through every cell of a board that wraps around its edges.
+
+    The board is covered line by line (rows, or columns when that works better), each line
+    walked entirely to the right or to the left before stepping down to the next one. Walking
+    a line to the right shifts the column the next line starts on by -1 and walking it to the
+    left by +1, so with as many right as left lines (an even number of lines) the cycle closes.
+    When both the number of lines and their length are odd, lines are chosen so there are at
+    least as many lines as cells per line, and `length` more lines are walked to the left than
+    to the right: together they shift the start by a whole line, which closes the cycle too.
+    Every board has such a cycle.
+
+    Args:
+        cols (int): The number of columns of the board.
+        rows (int): The number of rows of the board.
+
+    Returns:
+        array: The cell indices in cycle order.
+    """
+    if rows % 2 == 0 or (cols % 2 == 1 and rows >= cols):
+        lines, length, transposed = rows, cols, False
+    else:
+        lines, length, transposed = cols, rows, True
+
+    if lines % 2 == 0:
+        steps = [1, -1] * (lines // 2)
+    else:
+        rights = (lines - length) // 2
+        steps = [1, -1] * rights + [-1] * (lines - 2 * rights)
+
+    cycle = array("I")
+    position = 0
+    for line, step in enumerate(steps):
+        for index in range(length):
+            cycle.append(position * cols + line if transposed else line * cols + position)
+            if index < length - 1:
+                position = (position + step) % length
+    return cycle
+
+
+def load_hamiltonian_cycle(cols, rows, directory=None):
+    """
+    Returns the Hamiltonian cycle of a board size, building it only once.
+
+    Cycles are memoized in memory, and on disk in `directory` so later runs and other
+    processes load them instead of building them again.
+
+    Args:
+        cols (int): The number of columns of the board.
+        rows (int): The number of rows of the board.
+        directory (str): The directory to memoize the cycle in (None only memoizes it in memory).
+
+    Returns:
+        tuple: The cells in cycle order, and the position in the cycle of every cell (both arrays).
+    """
+    cached = _cycles.get((cols, rows))
+    if cached is not None:
+        return cached
+
+    size = cols * rows
+    cycle = None
+    path = None
+    if directory is not None:
+        path = os.path.join(directory, f"hamiltonian-{cols}x{rows}.bin")
+        try:
+            with open(path, "rb") as f:
+                cycle = array("I")
+                cycle.fromfile(f, size)
+        except (OSError, EOFError):
+            # Missing or truncated, build it again
+            cycle = None
+
+    if cycle is None:
+        cycle = build_hamiltonian_cycle(cols, rows)
+        if path is not None:
+            os.makedirs(directory, exist_ok=True)
+            # Write to a temporary file first so other processes never load a partial cycle
+            temporary_path = f"{path}.{os.getpid()}.tmp"
+            with open(temporary_path, "wb") as f:
+                cycle.tofile(f)
+            os.replace(temporary_path, path)
+
+    positions = array("I", bytes(4 * size))
+    for position, cell in enumerate(cycle):
+        positions[cell] = position
+
+    _cycles[(cols, rows)] = (cycle, positions)
+    return cycle, positions
+
+
+class Autopilot:
+    """
+    The Autopilot class is a policy that plays the game without a player, for soak runs and demos.
+
+    The snake follows a Hamiltonian cycle of the board, which visits every cell, so it
+    can never collide with itself. To reach the food sooner it takes shortcuts: it may
+    skip ahead along the cycle as long as it lands before its own tail (keeping room for
+    the growth still due) and doesn't jump past the food. Then the body stays in cycle
+    order and following the cycle from anywhere remains safe. Shortcuts stop once the
+    snake covers shortcut_limit of the board.
+
+    The shortcut taken is the one closest to the food according to a BFS distance field
+    from the food (which routes around walls). The field is only rebuilt when the food
+    moves, and even then at most bfs_budget cells are visited per tick. Distances are
+    stamped with the generation of the field they belong to, so starting a new field is
+    O(1) instead of clearing the board: a tick costs the same however large the board
+    and however long the snake. Neighbors the field hasn't reached yet are ranked by how
+    far along the cycle they skip.
+
+    A decision is made once per cell, on the first call after the head entered it, so the
+    autopilot also drives snakes that move several ticks per cell, whatever pixel offset
+    they started at. It assumes there are no walls on the board's cycle; walls only make
+    it rank shortcuts around them.
+
+    Attributes:
+        cache_directory (str): The directory the Hamiltonian cycles are memoized in, or None.
+        bfs_budget (int): The number of cells the distance field visits per tick.
+        shortcut_limit (float): The fraction of the board the snake covers when shortcuts stop.
+        state (GameState): The game being played.
+        cycle (array): The cells in cycle order.
+        positions (array): The position in the cycle of every cell.
+        distances (array): The BFS distance of every cell to the food, valid where the cell's stamp is the generation.
+        stamps (array): The generation of the distance field every cell's distance belongs to.
+        generation (int): The generation of the current distance field.
+        frontier (deque): The cells whose neighbors the BFS still has to visit.
+        field_food (int): The food cell the distance field was built for.
+        steered_cell (int): The head cell the last decision was made in.
+    """
+    cache_directory = None
+    bfs_budget = 1024
+    shortcut_limit = 0.5
+    state = None
+    cycle = None
+    positions = None
+    distances = None
+    stamps = None
+    generation = 0
+    frontier = None
+    field_food = None
+    steered_cell = None
+
+
+    def __init__(self, cache_directory=None, bfs_budget=1024, shortcut_limit=0.5):
+        """
+        Initializes the Autopilot object.
+
+        Args:
+            cache_directory (str): The directory the Hamiltonian cycles are memoized in (None keeps them in memory).
+            bfs_budget (int): The number of cells the distance field visits per tick.
+            shortcut_limit (float): The fraction of the board the snake covers when shortcuts stop.
+
+        Returns:
+            None
+        """
+        self.cache_directory = cache_directory
+        self.bfs_budget = bfs_budget
+        self.shortcut_limit = shortcut_limit
+        self.frontier = deque()
+
+
+    def follow(self, state):
+        """
+        Starts playing a game.
+
+        Args:
+            state (GameState): The game.
+
+        Returns:
+            None
+        """
+        self.state = state
+        self.cycle, self.positions = load_hamiltonian_cycle(state.cols, state.rows, self.cache_directory)
+        self.distances = array("I", bytes(4 * state.cols * state.rows))
+        self.stamps = array("I", bytes(4 * state.cols * state.rows))
+        self.generation = 0
+        self.frontier.clear()
+        self.field_food = None
+        self.steered_cell = None
+
+
+    def distance(self, cell):
+        """
+        Returns the BFS distance of a cell to the food.
+
+        Args:
+            cell (int): The cell index.
+
+        Returns:
+            int: The distance, or -1 if the distance field hasn't reached the cell yet.
+        """
+        return self.distances[cell] if self.stamps[cell] == self.generation else -1
+
+
+    def update_field(self):
+        """
+        Advances the BFS distance field from the food by at most bfs_budget cells, restarting it when the food moved.
+
+        Returns:
+            None
+        """
+        state = self.state
+        distances, stamps, frontier = self.distances, self.stamps, self.frontier
+        if state.food != self.field_food:
+            self.field_food = state.food
+            # A new generation invalidates every distance at once
+            self.generation += 1
+            if self.generation > 0xFFFFFFFF:
+                stamps[:] = array("I", bytes(4 * len(stamps)))
+                self.generation = 1
+            frontier.clear()
+            if state.food is not None:
+                distances[state.food] = 0
+                stamps[state.food] = self.generation
+                frontier.append(state.food)
+
+        generation = self.generation
+        body, owners, wall = state.body, state.grid.owners, state.WALL
+        for _ in range(min(self.bfs_budget, len(frontier))):
+            cell = frontier.popleft()
+            distance = distances[cell] + 1
+            for direction in DIRECTIONS:
+                neighbor = body.neighbor(cell, direction)
+                if stamps[neighbor] != generation and owners[neighbor] is not wall:
+                    stamps[neighbor] = generation
+                    distances[neighbor] = distance
+                    frontier.append(neighbor)
+
+
+    def __call__(self, state, rng=None):
+        """
+        Returns the direction to steer the snake in.
+
+        Args:
+            state (GameState): The game.
+            rng (random.Random): Unused, the autopilot is deterministic.
+
+        Returns:
+            tuple: The direction (x, y), or None once the decision for the head's cell is made.
+        """
+        if state is not self.state:
+            self.follow(state)
+        # The field also advances on the ticks spent inside a cell
+        self.update_field()
+
+        body, cycle, positions = state.body, self.cycle, self.positions
+        head = body.head
+        if head == self.steered_cell:
+            return None
+        self.steered_cell = head
+        size = len(cycle)
+        head_position = positions[head]
+        target = cycle[(head_position + 1) % size]
+
+        if len(body) < self.shortcut_limit * size and state.food is not None:
+            distance_to_food = self.distance
+            # How far along the cycle the tail and the food are. A cell may be skipped to if it's before the
+            # food, and leaves room before the tail for the growth still due and the food eaten on the way.
+            tail_distance = (positions[body.tail] - head_position) % size or size
+            food_distance = (positions[state.food] - head_position) % size
+            limit = min(tail_distance - body.growth - 2, food_distance)
+
+            def rank(cell, skip):
+                distance = distance_to_food(cell)
+                return (distance if distance >= 0 else size, -skip)
+
+            best = rank(target, 1)
+            for direction in DIRECTIONS:
+                cell = body.neighbor(head, direction)
+                skip = (positions[cell] - head_position) % size
+                if 1 < skip <= limit and not state.blocked(cell):
+                    cell_rank = rank(cell, skip)
+                    if cell_rank < best:
+                        best, target = cell_rank, cell
+
+        for direction in DIRECTIONS:
+            if body.neighbor(head, direction) == target:
+                return direction
+        return None
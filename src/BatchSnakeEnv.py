@@ -0,0 +1,201 @@
+import copy
+
+import numpy as np
+
+try:
+    from GameState import GameState
+except ImportError:
+    from .GameState import GameState
+
+
+class BatchSnakeEnv:
+    """
+    The BatchSnakeEnv class steps many snake games at once with NumPy, with the rules of GameState.step().
+
+    Most ticks only move a head within its cell: the heads of the whole batch are moved,
+    wrapped around their boards and mapped to their cells with a few array operations,
+    and the games that are over stay where they are. Only the games whose head entered
+    a new cell go through GameState.enter(), which advances the body, eats the food
+    (placing new food with the game's own random number generator) and detects the
+    collisions. Every game therefore plays out exactly like its GameState stepped on its
+    own, and the batch pays one Python call per cell entered instead of one per tick.
+    The fewer ticks a head spends in a cell (the speed relative to the cell size), the
+    smaller the gain.
+
+    Attributes:
+        states (list): The GameState of every game, holding its body, food and score.
+        positions (np.ndarray): The (N, 2) positions (x, y) of every snake's head.
+        velocities (np.ndarray): The (N, 2) speeds (x, y) of every snake.
+        bounds (np.ndarray): The (N, 2) board sizes (width, height) of every game.
+        sizes (np.ndarray): The (N, 2) cell sizes (width, height) of every game.
+        grid_sizes (np.ndarray): The (N, 2) numbers of columns and rows of every game.
+        heads (np.ndarray): The cell of every snake's head.
+        alive (np.ndarray): Whether every game is still running.
+        game_ticks (np.ndarray): The number of ticks every game was advanced (games stop counting once over).
+        entered (np.ndarray): Whether every head entered a new cell in the last tick it was advanced.
+        ticks (int): The number of ticks that have been simulated.
+    """
+    states = None
+    positions = None
+    velocities = None
+    bounds = None
+    sizes = None
+    grid_sizes = None
+    heads = None
+    alive = None
+    game_ticks = None
+    entered = None
+    ticks = 0
+
+
+    def __init__(self, positions, velocities, bounds, sizes=(10, 10), seeds=None):
+        """
+        Initializes the BatchSnakeEnv object with new games.
+
+        Args:
+            positions (array-like): The (N, 2) starting positions of the snakes.
+            velocities (array-like): The (N, 2) or (2,) speeds of the snakes.
+            bounds (array-like): The (N, 2) or (2,) board sizes (width, height).
+            sizes (array-like): The (N, 2) or (2,) cell sizes (width, height).
+            seeds (list): The seed used to place food in every game (None picks random seeds).
+
+        Returns:
+            None
+        """
+        positions = np.array(positions, dtype=np.float64).reshape(-1, 2)
+        count = len(positions)
+        velocities = np.broadcast_to(np.asarray(velocities, dtype=np.int64), (count, 2))
+        bounds = np.broadcast_to(np.asarray(bounds, dtype=np.int64), (count, 2))
+        sizes = np.broadcast_to(np.asarray(sizes, dtype=np.int64), (count, 2))
+        seeds = [None] * count if seeds is None else seeds
+
+        self.setup([GameState(bound[0], bound[1], position, tuple(velocity), tuple(size), seed)
+                    for position, velocity, bound, size, seed
+                    in zip(positions.tolist(), velocities.tolist(), bounds.tolist(), sizes.tolist(), seeds)])
+
+
+    @classmethod
+    def from_states(cls, states):
+        """
+        Creates a BatchSnakeEnv from copies of a list of GameState objects, in whatever state they are.
+
+        Args:
+            states (list): The GameState objects to copy.
+
+        Returns:
+            BatchSnakeEnv: The batch environment.
+        """
+        env = cls.__new__(cls)
+        env.setup([copy.deepcopy(state) for state in states])
+        return env
+
+
+    def setup(self, states):
+        """
+        Builds the arrays of the batch from its games.
+
+        Args:
+            states (list): The GameState of every game.
+
+        Returns:
+            None
+        """
+        self.states = states
+        self.positions = np.array([state.position for state in states], dtype=np.int64).reshape(-1, 2)
+        self.velocities = np.array([state.speed for state in states], dtype=np.int64).reshape(-1, 2)
+        self.bounds = np.array([(state.width, state.height) for state in states], dtype=np.int64).reshape(-1, 2)
+        self.sizes = np.array([state.size for state in states], dtype=np.int64).reshape(-1, 2)
+        self.grid_sizes = np.array([(state.cols, state.rows) for state in states], dtype=np.int64).reshape(-1, 2)
+        self.heads = np.array([state.body.head for state in states], dtype=np.int64)
+        self.alive = np.array([state.alive for state in states], dtype=bool)
+        self.game_ticks = np.array([state.ticks for state in states], dtype=np.int64)
+        self.entered = np.zeros(len(states), dtype=bool)
+        self.ticks = 0
+
+
+    def __len__(self):
+        return len(self.states)
+
+
+    def state(self, index):
+        """
+        Returns the GameState of one game in the batch, brought up to date with the arrays.
+
+        The state is the batch's own: steer the game through steer(), not the state.
+
+        Args:
+            index (int): The index of the game.
+
+        Returns:
+            GameState: The state of the game.
+        """
+        state = self.states[index]
+        state.x, state.y = self.positions[index].tolist()
+        state.speed = tuple(self.velocities[index].tolist())
+        state.ticks = int(self.game_ticks[index])
+        if not self.entered[index]:
+            state.entered_cell = state.vacated_cell = None
+        return state
+
+
+    def steer(self, index, direction):
+        """
+        Steers the snake of one game like GameState.steer().
+
+        Args:
+            index (int): The index of the game.
+            direction (tuple): The direction (x, y), with components -1, 0 or 1.
+
+        Returns:
+            bool: True if the snake changed direction.
+        """
+        state = self.states[index]
+        state.speed = tuple(self.velocities[index].tolist())
+        if not state.steer(direction):
+            return False
+        self.velocities[index] = state.speed
+        return True
+
+
+    def step(self):
+        """
+        Advances every running game in the batch by one tick.
+
+        Returns:
+            None
+        """
+        alive = self.alive.copy()
+        positions = self.positions
+        positions += self.velocities * alive[:, None]
+        np.mod(positions, self.bounds, out=positions)
+        self.game_ticks += alive
+        self.ticks += 1
+
+        columns = positions // self.sizes % self.grid_sizes
+        cells = columns[:, 1] * self.grid_sizes[:, 0] + columns[:, 0]
+        entered = (cells != self.heads) & alive
+        # Games that are over keep the cells of their last move, like a GameState
+        np.copyto(self.entered, entered, where=alive)
+
+        # Only the games whose head entered a new cell need their body, food and collisions updated
+        states = self.states
+        for index, cell in zip(np.flatnonzero(entered).tolist(), cells[entered].tolist()):
+            state = states[index]
+            state.enter(cell)
+            if not state.alive:
+                self.alive[index] = False
+        self.heads[entered] = cells[entered]
+
+
+    def run(self, ticks):
+        """
+        Advances every game in the batch by a number of ticks.
+
+        Args:
+            ticks (int): The number of ticks to simulate.
+
+        Returns:
+            None
+        """
+        for _ in range(ticks):
+            self.step()
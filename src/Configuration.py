@@ -0,0 +1,516 @@
+import json
+import logging
+import os
+import time
+
+from array import array
+from types import MappingProxyType
+
+
+LOG_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "critical": logging.CRITICAL,
+}
+TRUE_STRINGS = ("1", "true", "yes", "on")
+FALSE_STRINGS = ("0", "false", "no", "off")
+
+
+class ConfigurationError(ValueError):
+    """
+    Raised when an option has an invalid value.
+    """
+
+
+class Option:
+    """
+    The Option class describes one configuration option.
+
+    Attributes:
+        name (str): The name of the option (also its command line destination and settings.json key).
+        type (type): The type of the option's value: bool, int, float or str.
+        default: The default value of the option.
+        choices (tuple): The valid values of the option, or None.
+        minimum (float): The smallest valid value of the option, or None.
+        exclusive_minimum (bool): Whether the minimum itself is invalid.
+        aliases (tuple): Other settings.json keys accepted for the option.
+        environmental_variable (str): The environmental variable of the option.
+        description (str): What the option does, documented once here for the Application and its users.
+        flag (str): The command line flag of the option (see add_argument()).
+        metavar (str): The name of the flag's value in the command line help, or None.
+    """
+    def __init__(self, name, type, default=None, choices=None, minimum=None, exclusive_minimum=False, aliases=(),
+                 description="", flag=None, metavar=None):
+        self.name = name
+        self.type = type
+        self.default = default
+        self.choices = choices
+        self.minimum = minimum
+        self.exclusive_minimum = exclusive_minimum
+        self.aliases = aliases
+        self.environmental_variable = name.upper()
+        self.description = description
+        self.flag = flag or "--" + name.replace("_", "-")
+        self.metavar = metavar
+
+
+    def validate(self, value, source):
+        """
+        Validates (and normalizes) a value of the option.
+
+        Args:
+            value: The value to validate. Strings are converted, for example from environmental variables.
+            source (str): Where the value came from, used in error messages.
+
+        Returns:
+            The validated value.
+
+        Raises:
+            ConfigurationError: If the value is invalid.
+        """
+        if value is None:
+            return None
+
+        try:
+            if isinstance(value, str) and self.type is not str:
+                value = self.parse(value)
+            elif self.type is float and isinstance(value, int) and not isinstance(value, bool):
+                value = float(value)
+        except ValueError:
+            raise ConfigurationError(f"{source}: {self.name} must be of type {self.type.__name__}, got {value!r}.") from None
+
+        if not isinstance(value, self.type) or (self.type is not bool and isinstance(value, bool)):
+            raise ConfigurationError(f"{source}: {self.name} must be of type {self.type.__name__}, got {value!r}.")
+
+        if self.type is str and self.choices is not None:
+            value = value.lower()
+        if self.choices is not None and value not in self.choices:
+            raise ConfigurationError(f"{source}: {self.name} must be one of {', '.join(self.choices)}, got {value!r}.")
+
+        if self.minimum is not None:
+            if value < self.minimum or (self.exclusive_minimum and value == self.minimum):
+                relation = "larger than" if self.exclusive_minimum else "at least"
+                raise ConfigurationError(f"{source}: {self.name} must be {relation} {self.minimum}, got {value!r}.")
+
+        return value
+
+
+    def describe(self):
+        """
+        Returns the docstring line of the option: its name, type, description and default.
+        """
+        default = "" if self.default is None else f" Defaults to {self.default!r}."
+        return f"{self.name} ({self.type.__name__}): {self.description}{default}"
+
+
+    def add_argument(self, parser):
+        """
+        Adds the command line flag of the option to an argument parser.
+
+        The flag stores its value under the option's name and defaults to None, so options that
+        aren't given on the command line come from the environment, the configuration file or
+        the default. A bool option is a flag without a value that sets the opposite of its default.
+
+        Args:
+            parser (argparse.ArgumentParser): The parser.
+
+        Returns:
+            None
+        """
+        if self.type is bool:
+            if self.default:
+                parser.add_argument(self.flag, dest=self.name, action="store_false", default=None,
+                                    help=f"Sets {self.name} to false ({self.description[0].lower()}{self.description[1:-1]}).")
+            else:
+                parser.add_argument(self.flag, dest=self.name, action="store_true", default=None, help=self.description)
+            return
+
+        parser.add_argument(self.flag, dest=self.name, type=None if self.type is str else self.type,
+                            choices=self.choices, metavar=self.metavar, help=self.description)
+
+
+    def parse(self, string):
+        """
+        Converts a string (for example an environmental variable) to the option's type.
+        """
+        if self.type is bool:
+            if string.lower() in TRUE_STRINGS:
+                return True
+            if string.lower() in FALSE_STRINGS:
+                return False
+            raise ValueError(string)
+        return self.type(string)
+
+
+# The schema of the configuration, compiled once when the module is imported
+OPTIONS = (
+    Option("log_level", str, "debug", choices=tuple(LOG_LEVELS),
+           description="The log level to be set."),
+    Option("log_directory", str, "logs", aliases=("logging_directory",), flag="--log-dir",
+           description="The directory the log file is written to."),
+    Option("log_file", str, "application.log",
+           description="The name of the log file."),
+    Option("log_async", bool, True, flag="--sync-logging",
+           description="Whether to write log records from a background thread instead of the game loop."),
+    Option("log_queue_size", int, 10000, minimum=1,
+           description="The maximum number of log records waiting to be written."),
+    Option("log_overflow", str, "drop_newest", choices=("drop_newest", "drop_oldest", "block"),
+           description="What to do when the log queue is full."),
+    Option("width", int, 800, minimum=1,
+           description="The width of the game window."),
+    Option("height", int, 600, minimum=1,
+           description="The height of the game window."),
+    Option("headless", bool, False,
+           description="Whether to run the game without a display."),
+    Option("ticks", int, None, minimum=0,
+           description="The number of ticks to simulate in headless mode (None runs until stopped)."),
+    Option("logic_rate", float, 60.0, minimum=0, exclusive_minimum=True,
+           description="The number of logic ticks per second."),
+    Option("render_rate", float, 60.0, minimum=0, exclusive_minimum=True,
+           description="The maximum number of rendered frames per second."),
+    Option("render_mode", str, "dirty", choices=("dirty", "full", "scaled"),
+           description="Either dirty to only redraw changed regions, full to flip the whole screen, or scaled to "
+                       "draw the board offscreen at render_scale pixels per cell and scale it to the window."),
+    Option("render_scale", int, None, minimum=1,
+           description="The number of pixels per board cell drawn offscreen in scaled mode (None uses the cell size)."),
+    Option("display_scaled", bool, False,
+           description="Whether the display scales the board to the window in scaled mode (pygame.SCALED)."),
+    Option("adaptive_resolution", bool, False,
+           description="Whether to lower the render scale while frames go over the render rate's budget, "
+                       "down to the lowest scale that makes frames faster (not with display_scaled)."),
+    Option("seed", int, None,
+           description="The seed used to place food (None picks a random seed)."),
+    Option("snakes", int, 1, minimum=1,
+           description="The number of snakes. More than one plays an arena, where the player steers the first snake."),
+    Option("record", bool, False,
+           description="Whether to record a replay of every game."),
+    Option("replay_directory", str, "replays", flag="--replay-dir",
+           description="The directory to store replay files in."),
+    Option("replay_file", str, None, flag="--replay",
+           description="The path to a replay file to re-simulate instead of playing."),
+    Option("profile", bool, False,
+           description="Whether to time the phases of every frame and periodically dump the numbers."),
+    Option("profile_overlay", bool, False,
+           description="Whether to show the frame timings on screen (toggled with F3)."),
+    Option("profile_interval", float, 5.0, minimum=0, exclusive_minimum=True,
+           description="The number of seconds between dumps of the frame timings."),
+    Option("watch_configuration", bool, True, flag="--no-watch-config",
+           description="Whether to apply changes to the configuration file while the game runs."),
+    Option("input_latency_test", int, None, minimum=1, metavar="PRESSES",
+           description="The number of synthetic key presses to post to measure the input latency (None plays normally)."),
+    Option("autopilot", bool, False,
+           description="Whether the built-in autopilot steers the snake instead of the player."),
+    Option("cache_directory", str, "cache", flag="--cache-dir",
+           description="The directory the autopilot memoizes its precomputed paths in."),
+    Option("results_database", str, None, flag="--results-db",
+           description="The SQLite database the result of every game is stored in (None doesn't store results)."),
+    Option("serve_port", int, None, minimum=0, flag="--serve", metavar="PORT",
+           description="The port to stream the game to network clients on (None plays locally)."),
+    Option("serve_host", str, "127.0.0.1", flag="--host",
+           description="The address the game server listens on."),
+    Option("send_rate", float, 30.0, minimum=0, exclusive_minimum=True,
+           description="The maximum number of times per second the game server sends the game to its clients."),
+)
+OPTIONS_BY_KEY = {key: option for option in OPTIONS for key in (option.name, *option.aliases)}
+
+# Selects an entry of a JSON Lines configuration file, set like the configuration file itself (not in the file)
+CONFIGURATION_INDEX = Option("configuration_index", int, None, minimum=0, flag="--config-index", metavar="INDEX",
+                             description="The entry of a JSON Lines configuration file to load (None loads the first one).")
+
+# The suffix of the offset index next to a JSON Lines configuration file
+INDEX_SUFFIX = ".index"
+
+# Parsed configuration files, keyed by path and entry and memoized on the file's modification time and size
+_configuration_files = {}
+
+# Offset indexes of JSON Lines files without an up to date index file, keyed by path: (signature, offsets)
+_configuration_indexes = {}
+
+
+def write_configuration_index(path, offsets, signature):
+    """
+    Writes the offset index of a JSON Lines configuration file.
+
+    The index is the modification time and size of the file it was built for, followed by
+    the byte offset of every entry, all as unsigned 64-bit integers. It is written to a
+    temporary file first, so readers never see a partial index.
+
+    Args:
+        path (str): The path of the JSON Lines file.
+        offsets (array): The byte offset of every entry (array("Q")).
+        signature (tuple): The modification time (ns) and size of the file.
+
+    Returns:
+        None
+    """
+    index_path = path + INDEX_SUFFIX
+    temporary_path = f"{index_path}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as f:
+        array("Q", signature).tofile(f)
+        offsets.tofile(f)
+    os.replace(temporary_path, index_path)
+
+
+def build_configuration_index(path, signature):
+    """
+    Indexes the entries of a JSON Lines configuration file by scanning it for line starts, without parsing JSON.
+
+    The index is memoized in memory, so a file is only scanned once per process. Nothing is
+    written next to the file: only scripts/GenerateConfigurationFile.py writes index files.
+
+    Args:
+        path (str): The path of the JSON Lines file.
+        signature (tuple): The modification time (ns) and size of the file.
+
+    Returns:
+        array: The byte offset of every entry.
+    """
+    cached = _configuration_indexes.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    offsets = array("Q")
+    offset = 0
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                offsets.append(offset)
+            offset += len(line)
+
+    _configuration_indexes[path] = (signature, offsets)
+    return offsets
+
+
+def read_configuration_entry(path, index, signature):
+    """
+    Reads one entry of a JSON Lines configuration file, seeking to it through the offset index.
+
+    Only the entry's line is read and parsed. Without an index file, or with one built
+    for an older version of the file, the file is indexed in memory first.
+
+    Args:
+        path (str): The path of the JSON Lines file.
+        index (int): The index of the entry.
+        signature (tuple): The modification time (ns) and size of the file.
+
+    Returns:
+        The parsed entry.
+
+    Raises:
+        ConfigurationError: If there is no such entry, or it isn't valid JSON.
+    """
+    offset = count = None
+    try:
+        with open(path + INDEX_SUFFIX, "rb") as f:
+            header = array("Q")
+            header.fromfile(f, 2)
+            if tuple(header) == signature:
+                count = (os.fstat(f.fileno()).st_size - header.itemsize * 2) // header.itemsize
+                if index < count:
+                    f.seek(header.itemsize * (2 + index))
+                    entry = array("Q")
+                    entry.fromfile(f, 1)
+                    offset = entry[0]
+    except (OSError, EOFError):
+        count = None
+
+    if count is None:
+        offsets = build_configuration_index(path, signature)
+        count = len(offsets)
+        if index < count:
+            offset = offsets[index]
+    if offset is None:
+        raise ConfigurationError(f"{path}: no entry {index}, the file has {count} entries.")
+
+    with open(path, "rb") as f:
+        f.seek(offset)
+        line = f.readline()
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as error:
+        raise ConfigurationError(f"{path}: entry {index} is invalid JSON ({error}).") from None
+
+
+def load_configuration_file(path, index=None):
+    """
+    Loads and validates a configuration file.
+
+    The result is memoized on the file's modification time and size, so constructing
+    many Applications with the same file only parses it once. Unknown keys are ignored.
+
+    A JSON Lines file (.jsonl), for example a matrix written by
+    scripts/GenerateConfigurationFile.py, holds one configuration per line, and `index`
+    selects which one is loaded. Only that line is parsed: its byte offset is looked up
+    in the offset index the generator writes next to the file (path + INDEX_SUFFIX), or
+    in an index built in memory for files without one. Loading never writes any file.
+
+    Args:
+        path (str): The path of the configuration file.
+        index (int): The entry of a JSON Lines file to load (None loads the first one).
+
+    Returns:
+        MappingProxyType: The validated options in the file (read only, shared between callers).
+
+    Raises:
+        ConfigurationError: If the file can't be read, isn't valid JSON or contains invalid values,
+            or an index is given for a file that isn't JSON Lines.
+    """
+    try:
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+
+        cached = _configuration_files.get((path, index))
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        if path.endswith(".jsonl"):
+            config = read_configuration_entry(path, index or 0, key)
+        elif index is not None:
+            raise ConfigurationError(f"{path}: a configuration index needs a JSON Lines (.jsonl) file.")
+        else:
+            with open(path) as f:
+                try:
+                    config = json.load(f)
+                except json.JSONDecodeError as error:
+                    raise ConfigurationError(f"{path}: invalid JSON ({error}).") from None
+    except OSError as error:
+        raise ConfigurationError(f"{path}: {error.strerror or error}.") from None
+
+    if not isinstance(config, dict):
+        raise ConfigurationError(f"{path}: expected a JSON object.")
+
+    values = {}
+    for key_name, value in config.items():
+        option = OPTIONS_BY_KEY.get(key_name)
+        if option is not None:
+            values[option.name] = option.validate(value, path)
+
+    values = MappingProxyType(values)
+    _configuration_files[(path, index)] = (key, values)
+    return values
+
+
+def load_environmental_variables(environ):
+    """
+    Loads and validates the options set through environmental variables.
+
+    Args:
+        environ (Mapping): The environmental variables, usually os.environ.
+
+    Returns:
+        dict: The validated options.
+
+    Raises:
+        ConfigurationError: If a variable has an invalid value.
+    """
+    return {
+        option.name: option.validate(environ[option.environmental_variable], f"${option.environmental_variable}")
+        for option in OPTIONS if option.environmental_variable in environ
+    }
+
+
+def load_command_line_arguments(args):
+    """
+    Loads and validates the options set through command line arguments.
+
+    Args:
+        args (dict): The command line arguments. Arguments that are None are ignored.
+
+    Returns:
+        dict: The validated options.
+
+    Raises:
+        ConfigurationError: If an argument has an invalid value.
+    """
+    return {
+        option.name: option.validate(args[option.name], "command line")
+        for option in OPTIONS if args.get(option.name) is not None
+    }
+
+
+class Configuration:
+    """
+    The Configuration class is an immutable snapshot of every option's value.
+
+    Attributes:
+        values (MappingProxyType): The value of every option, by name.
+    """
+    def __init__(self, values):
+        self.__dict__["values"] = MappingProxyType(dict(values))
+
+
+    def __getattr__(self, name):
+        try:
+            return self.values[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Configuration objects are immutable.")
+
+
+    def __eq__(self, other):
+        return isinstance(other, Configuration) and self.values == other.values
+
+
+    def changes(self, other):
+        """
+        Returns the names of the options whose value differs from another configuration.
+
+        Args:
+            other (Configuration): The configuration to compare with.
+
+        Returns:
+            set: The names of the changed options.
+        """
+        return {name for name in self.values if self.values[name] != other.values.get(name)}
+
+
+class ConfigurationWatcher:
+    """
+    The ConfigurationWatcher class notices when a configuration file changes.
+
+    The file is polled with os.stat() at most once per interval, which is cheap
+    enough to do from the game loop.
+
+    Attributes:
+        path (str): The path of the watched file.
+        interval (float): The minimum number of seconds between two checks.
+        signature (tuple): The modification time and size of the file at the last check.
+        next_check (float): The time of the next check.
+    """
+    def __init__(self, path, interval=1.0):
+        self.path = path
+        self.interval = interval
+        self.signature = self.read_signature()
+        self.next_check = time.perf_counter() + interval
+
+
+    def read_signature(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+
+    def changed(self):
+        """
+        Returns whether the file changed since the last time this returned True.
+
+        Returns:
+            bool: True if the file changed.
+        """
+        now = time.perf_counter()
+        if now < self.next_check:
+            return False
+        self.next_check = now + self.interval
+
+        signature = self.read_signature()
+        if signature == self.signature:
+            return False
+        self.signature = signature
+        return True
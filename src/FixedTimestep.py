@@ -0,0 +1,137 @@
+import time
+
+
+class FixedTimestep:
+    """
+    The FixedTimestep class schedules logic ticks and rendered frames independently.
+
+    Elapsed wall time is collected in an accumulator which is consumed in fixed
+    logic_interval steps, so the game runs at the same speed no matter how fast
+    frames can be rendered. Frames are rendered at most render_rate times per
+    second, and alpha tells the renderer how far between two logic ticks it is.
+
+    Attributes:
+        logic_rate (float): The number of logic ticks per second.
+        render_rate (float): The maximum number of rendered frames per second.
+        logic_interval (float): The number of seconds between logic ticks.
+        render_interval (float): The minimum number of seconds between rendered frames.
+        max_frame_time (float): The maximum wall time consumed per call to tick() (avoids a spiral of death).
+        accumulator (float): The wall time not yet consumed by logic ticks.
+    """
+    logic_rate = 60
+    render_rate = 60
+    logic_interval = 1 / 60
+    render_interval = 1 / 60
+    max_frame_time = 0.25
+    accumulator = 0.0
+
+
+    def __init__(self, logic_rate=60, render_rate=60, max_frame_time=0.25, clock=time.perf_counter, sleep=time.sleep):
+        """
+        Initializes the FixedTimestep object.
+
+        Args:
+            logic_rate (float): The number of logic ticks per second.
+            render_rate (float): The maximum number of rendered frames per second.
+            max_frame_time (float): The maximum wall time consumed per call to tick().
+            clock (callable): Returns the current time in seconds.
+            sleep (callable): Sleeps for a number of seconds.
+
+        Returns:
+            None
+        """
+        self.set_rates(logic_rate, render_rate)
+        self.max_frame_time = max_frame_time
+        self.clock = clock
+        self.sleep = sleep
+        self.reset()
+
+
+    @property
+    def alpha(self):
+        """
+        How far the current time is between the last and the next logic tick (0 to 1).
+        """
+        return self.accumulator / self.logic_interval
+
+
+    def reset(self):
+        """
+        Restarts the schedule from the current time.
+
+        Returns:
+            None
+        """
+        now = self.clock()
+        self.accumulator = 0.0
+        self.last_time = now
+        self.next_render_time = now
+
+
+    def set_rates(self, logic_rate, render_rate):
+        """
+        Changes the logic and render rates, keeping the time already accumulated.
+
+        Args:
+            logic_rate (float): The number of logic ticks per second.
+            render_rate (float): The maximum number of rendered frames per second.
+
+        Returns:
+            None
+        """
+        if logic_rate <= 0 or render_rate <= 0:
+            raise ValueError("logic_rate and render_rate must be positive.")
+
+        self.logic_rate = logic_rate
+        self.render_rate = render_rate
+        self.logic_interval = 1 / logic_rate
+        self.render_interval = 1 / render_rate
+
+
+    def tick(self):
+        """
+        Collects the elapsed wall time and returns the number of logic ticks that are due.
+
+        Returns:
+            int: The number of logic ticks to run now.
+        """
+        now = self.clock()
+        self.accumulator += min(now - self.last_time, self.max_frame_time)
+        self.last_time = now
+
+        # The small epsilon keeps floating point error from dropping a tick that is exactly due
+        ticks = int(self.accumulator / self.logic_interval + 1e-9)
+        self.accumulator = max(self.accumulator - ticks * self.logic_interval, 0.0)
+        return ticks
+
+
+    def should_render(self):
+        """
+        Returns whether a frame should be rendered now, honouring the render rate cap.
+
+        Returns:
+            bool: True if a frame should be rendered.
+        """
+        now = self.clock()
+        if now < self.next_render_time:
+            return False
+
+        self.next_render_time += self.render_interval
+        # Don't try to catch up on frames we were too slow to render
+        if self.next_render_time < now:
+            self.next_render_time = now + self.render_interval
+        return True
+
+
+    def wait(self):
+        """
+        Sleeps until the next logic tick or rendered frame is due.
+
+        Returns:
+            None
+        """
+        now = self.clock()
+        next_tick_time = self.last_time + self.logic_interval - self.accumulator
+        delay = min(next_tick_time, self.next_render_time) - now
+        if delay > 0:
+            self.sleep(delay)
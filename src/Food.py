@@ -0,0 +1,63 @@
+import pygame
+
+
+class Food(pygame.sprite.Sprite):
+    """
+    The Food class represents the food in the game.
+
+    The food's position is owned by the GameState; the sprite only mirrors it for drawing.
+
+    Attributes:
+        Pygame Attributes
+            rect (pygame.Rect): The rectangle of the food.
+            image (pygame.Surface): The image of the food.
+
+        Game Attributes
+            state (GameState): The display-independent state holding the food.
+            cell (int): The cell the food is drawn in.
+
+        Application Attributes
+            application (Application): The application object.
+            logger (Logger): The logger object.
+    """
+    application = None
+    logger = None
+    state = None
+    cell = None
+
+
+    def __init__(self, application, state):
+        pygame.sprite.Sprite.__init__(self)
+
+        self.application = application
+        self.state = state
+        self.logger = application.logger
+        self.logger.debug("Food initializing.")
+
+        # The graphic comes from the atlas built by Application.setup_pygame()
+        atlas = getattr(application, "atlas", None)
+        self.image = atlas.surface("food") if atlas is not None else pygame.Surface(state.size)
+        if atlas is None:
+            self.image.fill("red")
+
+        self.rect = self.image.get_rect()
+        self.update()
+
+        self.logger.debug("Food initialized.")
+
+
+    def update(self):
+        """
+        Moves the food to the cell holding it in the game state.
+        """
+        if self.state.food == self.cell:
+            return
+
+        self.cell = self.state.food
+        if self.cell is None:
+            # The board is full, move the food out of sight
+            self.rect.topleft = (-self.rect.width, -self.rect.height)
+            return
+
+        col, row = self.state.body.cell_position(self.cell)
+        self.rect.topleft = (col * self.rect.width, row * self.rect.height)
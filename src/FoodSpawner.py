@@ -0,0 +1,173 @@
+import random
+
+from array import array
+
+
+class FoodSpawner:
+    """
+    The FoodSpawner class places food on free cells of the board.
+
+    It keeps an indexed pool of the free cells: a list of the free cells plus the
+    position of every cell in that list. Removing a cell swaps it with the last
+    one, so taking, releasing and uniformly sampling a free cell are all O(1),
+    even when the board is nearly full.
+
+    Attributes:
+        cell_count (int): The number of cells on the board.
+        free_cells (list): The cells that are neither occupied nor holding food.
+        positions (array): The index of every cell in free_cells, or -1 if it isn't free.
+        seed (int): The seed of the random number generator.
+        rng (random.Random): The random number generator used to place food.
+        draws (int): The number of cells sampled, which determines the state of the random number generator.
+        food (int): The cell holding the food, or None if there is no food.
+    """
+    cell_count = None
+    free_cells = None
+    positions = None
+    seed = None
+    rng = None
+    draws = 0
+    food = None
+
+
+    def __init__(self, cell_count, occupied=(), seed=None):
+        """
+        Initializes the FoodSpawner object.
+
+        Args:
+            cell_count (int): The number of cells on the board.
+            occupied (iterable): The cells that are already occupied.
+            seed (int): The seed of the random number generator (None picks a random seed).
+
+        Returns:
+            None
+        """
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+
+        self.cell_count = cell_count
+        self.free_cells = list(range(cell_count))
+        self.positions = array("i", range(cell_count))
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.draws = 0
+        self.food = None
+
+        for cell in occupied:
+            self.take(cell)
+
+
+    def __len__(self):
+        return len(self.free_cells)
+
+
+    def __contains__(self, cell):
+        return self.positions[cell] != -1
+
+
+    def take(self, cell):
+        """
+        Removes a cell from the free cells.
+
+        Args:
+            cell (int): The cell that became occupied.
+
+        Returns:
+            None
+        """
+        index = self.positions[cell]
+        if index == -1:
+            return
+
+        # Swap the cell with the last free cell and pop it
+        last = self.free_cells.pop()
+        if last != cell:
+            self.free_cells[index] = last
+            self.positions[last] = index
+        self.positions[cell] = -1
+
+
+    def release(self, cell):
+        """
+        Returns a cell to the free cells.
+
+        Args:
+            cell (int): The cell that became free.
+
+        Returns:
+            None
+        """
+        if self.positions[cell] != -1:
+            return
+
+        self.positions[cell] = len(self.free_cells)
+        self.free_cells.append(cell)
+
+
+    def untake(self, cell, index):
+        """
+        Undoes take(): puts a cell back at the index it was taken from.
+
+        Together with unrelease() this restores the exact order of the free cells, so the
+        food placed after rewinding is the same as the first time.
+
+        Args:
+            cell (int): The cell that was taken.
+            index (int): The index the cell had in free_cells before it was taken (-1 if it wasn't free).
+
+        Returns:
+            None
+        """
+        if index == -1:
+            return
+
+        free_cells, positions = self.free_cells, self.positions
+        if index < len(free_cells):
+            # take() moved the last free cell into the cell's place
+            moved = free_cells[index]
+            positions[moved] = len(free_cells)
+            free_cells.append(moved)
+            free_cells[index] = cell
+        else:
+            free_cells.append(cell)
+        positions[cell] = index
+
+
+    def unrelease(self, cell):
+        """
+        Undoes release() of a cell that wasn't free: takes it back off the end of the free cells.
+
+        Args:
+            cell (int): The cell that was released.
+
+        Returns:
+            None
+        """
+        self.free_cells.pop()
+        self.positions[cell] = -1
+
+
+    def sample(self):
+        """
+        Returns a uniformly random free cell without taking it.
+
+        Returns:
+            int: A free cell, or None if the board is full.
+        """
+        if not self.free_cells:
+            return None
+        self.draws += 1
+        return self.free_cells[int(self.rng.random() * len(self.free_cells))]
+
+
+    def spawn(self):
+        """
+        Places the food on a random free cell.
+
+        Returns:
+            int: The cell holding the food, or None if the board is full.
+        """
+        self.food = self.sample()
+        if self.food is not None:
+            self.take(self.food)
+        return self.food
@@ -0,0 +1,166 @@
+import json
+import time
+
+from array import array
+
+
+class FrameProfiler:
+    """
+    The FrameProfiler class times the phases of every frame.
+
+    Every call to mark() records the nanoseconds since the previous mark (or the
+    start of the frame) under a phase name. The last `size` samples of each phase
+    are kept in a fixed-size ring buffer, so profiling never allocates per frame,
+    and percentiles are only computed when they are asked for.
+
+    Attributes:
+        size (int): The number of samples kept per phase.
+        samples (dict): The ring buffer of samples (ns) of every phase.
+        counts (dict): The number of samples recorded for every phase.
+        last_time (int): The time (ns) of the previous mark.
+        frame_start (int): The time (ns) the current frame started.
+
+    Final variables:
+        PERCENTILES (tuple): The percentiles reported by summary().
+    """
+    size = 600
+    samples = None
+    counts = None
+    last_time = 0
+    frame_start = 0
+
+    PERCENTILES = (50, 95, 99)
+
+
+    def __init__(self, size=600):
+        """
+        Initializes the FrameProfiler object.
+
+        Args:
+            size (int): The number of samples kept per phase.
+
+        Returns:
+            None
+        """
+        self.size = size
+        self.samples = {}
+        self.counts = {}
+        self.last_time = self.frame_start = time.perf_counter_ns()
+
+
+    def start_frame(self):
+        """
+        Marks the start of a frame.
+
+        Returns:
+            None
+        """
+        self.last_time = self.frame_start = time.perf_counter_ns()
+
+
+    def mark(self, phase):
+        """
+        Records the time since the previous mark as a sample of a phase.
+
+        Args:
+            phase (str): The name of the phase that just ended.
+
+        Returns:
+            None
+        """
+        now = time.perf_counter_ns()
+        self.record(phase, now - self.last_time)
+        self.last_time = now
+
+
+    def end_frame(self):
+        """
+        Records the time since the start of the frame as a sample of the "frame" phase.
+
+        Returns:
+            None
+        """
+        self.last_time = time.perf_counter_ns()
+        self.record("frame", self.last_time - self.frame_start)
+
+
+    def record(self, phase, nanoseconds):
+        """
+        Records a sample of a phase.
+
+        Args:
+            phase (str): The name of the phase.
+            nanoseconds (int): The duration of the phase.
+
+        Returns:
+            None
+        """
+        samples = self.samples.get(phase)
+        if samples is None:
+            samples = self.samples[phase] = array("q", bytes(8 * self.size))
+            self.counts[phase] = 0
+
+        count = self.counts[phase]
+        samples[count % self.size] = nanoseconds
+        self.counts[phase] = count + 1
+
+
+    def percentiles(self, phase):
+        """
+        Returns the percentiles of the samples of a phase.
+
+        Args:
+            phase (str): The name of the phase.
+
+        Returns:
+            dict: The p50, p95 and p99 durations of the phase in microseconds.
+        """
+        count = min(self.counts.get(phase, 0), self.size)
+        if count == 0:
+            return {f"p{percentile}": 0.0 for percentile in self.PERCENTILES}
+
+        samples = sorted(self.samples[phase][:count])
+        return {
+            f"p{percentile}": samples[min(count - 1, count * percentile // 100)] / 1000
+            for percentile in self.PERCENTILES
+        }
+
+
+    def summary(self):
+        """
+        Returns the percentiles of every phase.
+
+        Returns:
+            dict: The percentiles (microseconds) and sample counts of every phase.
+        """
+        return {
+            phase: dict(self.percentiles(phase), count=self.counts[phase])
+            for phase in self.samples
+        }
+
+
+    def dump(self, path):
+        """
+        Appends the summary to a JSON Lines file.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            None
+        """
+        with open(path, "a") as f:
+            f.write(json.dumps({"time": time.time(), "phases": self.summary()}) + "\n")
+
+
+    def format_lines(self):
+        """
+        Returns the summary as human readable lines, for example for an overlay.
+
+        Returns:
+            list: One line per phase.
+        """
+        lines = []
+        for phase, stats in self.summary().items():
+            lines.append(f"{phase:>8} p50 {stats['p50']:8.1f}us p95 {stats['p95']:8.1f}us p99 {stats['p99']:8.1f}us")
+        return lines
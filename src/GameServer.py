@@ -0,0 +1,565 @@
+import asyncio
+import collections
+import logging
+import time
+
+try:
+    from Replay import decode_direction, encode_direction, encode_varint
+except ImportError:
+    from .Replay import decode_direction, encode_direction, encode_varint
+
+
+# Message types. Every message is framed as a varint length followed by the type and its payload.
+KEYFRAME = 1
+DELTA = 2
+INPUT = 3
+
+# Flags of a delta
+ALIVE = 0x1
+ENTERED = 0x2
+VACATED = 0x4
+FOOD = 0x8
+
+
+def frame(message_type, payload=b""):
+    """
+    Frames a message.
+
+    Args:
+        message_type (int): KEYFRAME, DELTA or INPUT.
+        payload (bytes): The body of the message.
+
+    Returns:
+        bytes: The framed message.
+    """
+    return encode_varint(len(payload) + 1) + bytes([message_type]) + payload
+
+
+def encode_keyframe(state):
+    """
+    Encodes the whole state of a game.
+
+    The payload holds the tick, the board size in cells, the alive flag, the score,
+    the food cell plus one (0 when the board is full), and the body from tail to head.
+
+    Args:
+        state (GameState): The game to encode.
+
+    Returns:
+        bytes: The framed keyframe.
+    """
+    food = state.food
+    payload = bytearray()
+    for value in (state.ticks, state.cols, state.rows, int(state.alive), state.score,
+                  0 if food is None else food + 1, len(state.body)):
+        payload += encode_varint(value)
+    for cell in state.body.cells:
+        payload += encode_varint(cell)
+    return frame(KEYFRAME, bytes(payload))
+
+
+def encode_delta(state, food):
+    """
+    Encodes what changed in the last tick of a game.
+
+    The payload holds the tick, a byte of flags, then only the fields the flags announce:
+    the cell the head entered, the cell the tail vacated, and the new food cell plus one
+    followed by the score (the food only moves when it is eaten). A tick where the head
+    stays in its cell takes 4 to 6 bytes including the framing.
+
+    Args:
+        state (GameState): The game, just stepped.
+        food (int): The food cell before the tick.
+
+    Returns:
+        bytes: The framed delta.
+    """
+    flags = ALIVE if state.alive else 0
+    fields = bytearray()
+    if state.entered_cell is not None:
+        flags |= ENTERED
+        fields += encode_varint(state.entered_cell)
+    if state.vacated_cell is not None:
+        flags |= VACATED
+        fields += encode_varint(state.vacated_cell)
+    if state.food != food:
+        flags |= FOOD
+        fields += encode_varint(0 if state.food is None else state.food + 1) + encode_varint(state.score)
+    return frame(DELTA, encode_varint(state.ticks) + bytes([flags]) + fields)
+
+
+def decode_varints(data, offset, count):
+    """
+    Decodes a number of varints from a buffer.
+
+    Args:
+        data (bytes): The buffer.
+        offset (int): Where the first varint starts.
+        count (int): The number of varints.
+
+    Returns:
+        tuple: The list of values, and the offset after the last one.
+    """
+    values = []
+    for _ in range(count):
+        value = shift = 0
+        while True:
+            byte = data[offset]
+            offset += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        values.append(value)
+    return values, offset
+
+
+class GameMirror:
+    """
+    The GameMirror class rebuilds the state of a game served by a GameServer from its messages.
+
+    Attributes:
+        ticks (int): The tick of the last message applied.
+        cols (int): The number of columns of the board.
+        rows (int): The number of rows of the board.
+        alive (bool): Whether the snake is alive.
+        score (int): The amount of food eaten.
+        food (int): The cell holding the food, or None.
+        body (collections.deque): The cells of the snake's body, from tail to head.
+        synchronized (bool): Whether a keyframe was received yet (deltas are ignored before, and deltas
+            not newer than the last message).
+    """
+    ticks = 0
+    cols = None
+    rows = None
+    alive = True
+    score = 0
+    food = None
+    body = None
+    synchronized = False
+
+
+    def __init__(self):
+        """
+        Initializes the GameMirror object.
+
+        Returns:
+            None
+        """
+        self.body = collections.deque()
+
+
+    def apply(self, message):
+        """
+        Applies a message (without its framing) to the mirrored game.
+
+        Args:
+            message (bytes): The message type and payload.
+
+        Returns:
+            int: The message type.
+
+        Raises:
+            ValueError: If the message type is unknown.
+        """
+        message_type = message[0]
+        if message_type == KEYFRAME:
+            values, offset = decode_varints(message, 1, 7)
+            self.ticks, self.cols, self.rows, alive, self.score, food, length = values
+            self.alive = bool(alive)
+            self.food = food - 1 if food else None
+            self.body = collections.deque(decode_varints(message, offset, length)[0])
+            self.synchronized = True
+        elif message_type == DELTA:
+            if not self.synchronized:
+                return message_type
+            (ticks,), offset = decode_varints(message, 1, 1)
+            # A client joining between two sends gets a keyframe newer than the deltas batched before it
+            if ticks <= self.ticks:
+                return message_type
+            self.ticks = ticks
+            flags = message[offset]
+            offset += 1
+            self.alive = bool(flags & ALIVE)
+            entered = vacated = None
+            if flags & ENTERED:
+                (entered,), offset = decode_varints(message, offset, 1)
+            if flags & VACATED:
+                (vacated,), offset = decode_varints(message, offset, 1)
+            if flags & FOOD:
+                (food, self.score), offset = decode_varints(message, offset, 2)
+                self.food = food - 1 if food else None
+            # The tail leaves before the head enters, it may enter the cell the tail just left
+            if vacated is not None:
+                self.body.popleft()
+            if entered is not None:
+                self.body.append(entered)
+        else:
+            raise ValueError(f"Unknown message type {message_type}.")
+        return message_type
+
+
+class GameClient:
+    """
+    The GameClient class connects to a GameServer to watch or steer its game.
+
+    Attributes:
+        reader (asyncio.StreamReader): Reads the server's messages.
+        writer (asyncio.StreamWriter): Sends inputs to the server.
+        mirror (GameMirror): The game rebuilt from the server's messages.
+    """
+    reader = None
+    writer = None
+    mirror = None
+
+
+    def __init__(self, reader, writer):
+        """
+        Initializes the GameClient object. Use GameClient.connect() to open a connection.
+
+        Args:
+            reader (asyncio.StreamReader): Reads the server's messages.
+            writer (asyncio.StreamWriter): Sends inputs to the server.
+
+        Returns:
+            None
+        """
+        self.reader = reader
+        self.writer = writer
+        self.mirror = GameMirror()
+
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=8765):
+        """
+        Connects to a GameServer.
+
+        Args:
+            host (str): The address of the server.
+            port (int): The port of the server.
+
+        Returns:
+            GameClient: The connected client.
+        """
+        return cls(*await asyncio.open_connection(host, port))
+
+
+    async def receive(self):
+        """
+        Waits for the next message of the server and applies it to the mirror.
+
+        Returns:
+            int: The message type, or None once the server closed the connection.
+        """
+        length = shift = 0
+        try:
+            while True:
+                byte = (await self.reader.readexactly(1))[0]
+                length |= (byte & 0x7F) << shift
+                if byte < 0x80:
+                    break
+                shift += 7
+            message = await self.reader.readexactly(length)
+        except asyncio.IncompleteReadError:
+            return None
+        return self.mirror.apply(message)
+
+
+    async def steer(self, direction):
+        """
+        Asks the server to steer the snake.
+
+        Args:
+            direction (tuple): The direction (x, y), with components -1, 0 or 1.
+
+        Returns:
+            None
+        """
+        self.writer.write(frame(INPUT, bytes([encode_direction(direction)])))
+        await self.writer.drain()
+
+
+    async def close(self):
+        """
+        Closes the connection.
+
+        Returns:
+            None
+        """
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+class GameServer:
+    """
+    The GameServer class runs a game at a fixed tick rate and streams it to clients over TCP.
+
+    Every tick is encoded once as a small delta (the cells the head entered and the tail
+    vacated, and the new food). The deltas are sent send_rate times per second, batched,
+    and the same bytes are handed to every client, so a send costs one non-blocking write
+    per client however many ticks it covers. A keyframe with the whole state is sent when
+    a client connects, every keyframe_interval ticks, and when a new game starts.
+
+    Broadcasting never waits for a client. A client whose unsent data grows past
+    max_buffer bytes is skipped until its connection drains, then resynchronized with a
+    keyframe, so slow spectators only fall behind themselves and never hold up the
+    simulation. Inputs from any client steer the snake on the next tick, in the order
+    they arrived.
+
+    Attributes:
+        new_game (callable): Returns the GameState of a new game.
+        state (GameState): The game being served.
+        host (str): The address to listen on.
+        port (int): The port to listen on (0 picks a free port, which is stored here once listening).
+        logic_rate (float): The number of ticks per second.
+        ticks_per_send (int): The number of ticks batched into a send.
+        keyframe_interval (int): The number of ticks between keyframes.
+        max_buffer (int): The number of unsent bytes past which a client is skipped.
+        max_inputs (int): The number of inputs queued per tick, later inputs are dropped.
+        clients (dict): Whether every connected client (by writer) is waiting for a keyframe.
+        inputs (collections.deque): The directions to steer in on the next tick.
+        pending (bytearray): The messages of the ticks since the last send.
+        pending_keyframe (bool): Whether the pending messages start with a keyframe.
+        pending_ticks (int): The number of ticks since the last send.
+        running (bool): Whether the server is running.
+        games (int): The number of games played.
+        bytes_sent (int): The number of bytes handed to the clients' connections.
+        skipped (int): The number of sends skipped to lagging clients.
+        tick_time (float): The total time spent stepping and broadcasting, in seconds.
+        listening (asyncio.Event): Set once the server accepts connections.
+    """
+    new_game = None
+    state = None
+    host = "127.0.0.1"
+    port = 8765
+    logic_rate = 60.0
+    ticks_per_send = 1
+    keyframe_interval = 300
+    max_buffer = 64 * 1024
+    max_inputs = 64
+    clients = None
+    inputs = None
+    pending = None
+    pending_keyframe = False
+    pending_ticks = 0
+    running = False
+    games = 0
+    bytes_sent = 0
+    skipped = 0
+    tick_time = 0.0
+    listening = None
+
+
+    def __init__(self, new_game, host="127.0.0.1", port=8765, logic_rate=60.0, send_rate=30.0,
+                 keyframe_interval=300, max_buffer=64 * 1024, logger=None):
+        """
+        Initializes the GameServer object.
+
+        Args:
+            new_game (callable): Returns the GameState of a new game, called again when the snake dies.
+            host (str): The address to listen on.
+            port (int): The port to listen on (0 picks a free port).
+            logic_rate (float): The number of ticks per second.
+            send_rate (float): The maximum number of sends per second (None sends every tick).
+            keyframe_interval (int): The number of ticks between keyframes.
+            max_buffer (int): The number of unsent bytes past which a client is skipped.
+            logger (logging.Logger): The logger to use.
+
+        Returns:
+            None
+        """
+        self.new_game = new_game
+        self.host = host
+        self.port = port
+        self.logic_rate = logic_rate
+        self.ticks_per_send = 1 if send_rate is None else max(round(logic_rate / send_rate), 1)
+        self.keyframe_interval = keyframe_interval
+        self.max_buffer = max_buffer
+        self.logger = logger or logging.getLogger(__name__)
+        self.clients = {}
+        self.inputs = collections.deque()
+        self.pending = bytearray()
+        self.listening = asyncio.Event()
+        self.state = new_game()
+        self.games = 1
+
+
+    async def handle_client(self, reader, writer):
+        """
+        Serves a connected client: sends it a keyframe, then queues its inputs until it disconnects.
+
+        Args:
+            reader (asyncio.StreamReader): Reads the client's inputs.
+            writer (asyncio.StreamWriter): Sends messages to the client.
+
+        Returns:
+            None
+        """
+        self.clients[writer] = False
+        self.send(writer, encode_keyframe(self.state))
+        try:
+            while True:
+                length = (await reader.readexactly(1))[0]
+                message = await reader.readexactly(length)
+                if length != 2 or message[0] != INPUT:
+                    self.logger.warning("Disconnecting a client that sent an invalid message.")
+                    break
+                if len(self.inputs) < self.max_inputs:
+                    self.inputs.append(decode_direction(message[1]))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.clients.pop(writer, None)
+            writer.close()
+
+
+    def send(self, writer, data):
+        self.bytes_sent += len(data)
+        writer.write(data)
+
+
+    def broadcast(self, data, keyframe=False):
+        """
+        Hands the pending messages to every client without waiting for any of them.
+
+        Args:
+            data (bytes): The messages.
+            keyframe (bool): Whether the messages start with a keyframe.
+
+        Returns:
+            None
+        """
+        clients = self.clients
+        resynchronization = None
+        for writer, lagging in list(clients.items()):
+            transport = writer.transport
+            if transport.is_closing():
+                clients.pop(writer, None)
+            elif transport.get_write_buffer_size() > self.max_buffer:
+                # Deltas only apply on top of each other, a skipped client needs a keyframe to catch up
+                clients[writer] = True
+                self.skipped += 1
+            elif lagging and not keyframe:
+                if resynchronization is None:
+                    resynchronization = encode_keyframe(self.state)
+                clients[writer] = False
+                self.send(writer, resynchronization)
+            else:
+                clients[writer] = False
+                self.send(writer, data)
+
+
+    def flush(self):
+        """
+        Broadcasts the messages of the ticks since the last flush.
+
+        Returns:
+            None
+        """
+        if self.pending:
+            self.broadcast(bytes(self.pending), self.pending_keyframe)
+        self.pending = bytearray()
+        self.pending_keyframe = False
+        self.pending_ticks = 0
+
+
+    def tick(self):
+        """
+        Applies the queued inputs, advances the game by one tick and queues its delta.
+
+        The queued messages are broadcast every ticks_per_send ticks. Starts a new game
+        once the snake has died.
+
+        Returns:
+            None
+        """
+        state = self.state
+        if not state.alive:
+            self.logger.info(f"Game over after {state.ticks} ticks, score {state.score}, starting a new game.")
+            self.state = state = self.new_game()
+            self.games += 1
+            self.inputs.clear()
+            self.pending = bytearray(encode_keyframe(state))
+            self.pending_keyframe = True
+            self.flush()
+            return
+
+        inputs = self.inputs
+        while inputs:
+            state.steer(inputs.popleft())
+
+        food = state.food
+        state.step()
+        if state.ticks % self.keyframe_interval == 0:
+            # A keyframe makes the deltas before it useless
+            self.pending = bytearray(encode_keyframe(state))
+            self.pending_keyframe = True
+        else:
+            self.pending += encode_delta(state, food)
+
+        self.pending_ticks += 1
+        if self.pending_ticks >= self.ticks_per_send:
+            self.flush()
+
+
+    async def run(self, ticks=None):
+        """
+        Listens for clients and runs the game at the logic rate.
+
+        When the server falls behind, it runs the late ticks right away, but gives up on
+        catching up with more than a quarter second.
+
+        Args:
+            ticks (int): The number of ticks to run (None runs until stop() is called).
+
+        Returns:
+            None
+        """
+        server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        self.logger.info(f"Serving the game on {self.host}:{self.port} at {self.logic_rate:g} ticks/s.")
+        self.listening.set()
+
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.logic_rate
+        next_tick = loop.time()
+        count = 0
+        self.running = True
+        try:
+            while self.running and (ticks is None or count < ticks):
+                start = time.perf_counter()
+                self.tick()
+                self.tick_time += time.perf_counter() - start
+                count += 1
+
+                next_tick += interval
+                now = loop.time()
+                if now - next_tick > 0.25:
+                    next_tick = now
+                # Yield to the clients' reads and writes even when running late
+                await asyncio.sleep(max(next_tick - now, 0))
+        finally:
+            self.running = False
+            self.flush()
+            server.close()
+            for writer in list(self.clients):
+                writer.close()
+            self.clients.clear()
+            await server.wait_closed()
+
+        self.logger.info(f"Served {count} ticks over {self.games} games, {self.bytes_sent} bytes sent, "
+                         f"{self.skipped} sends skipped for lagging clients, "
+                         f"{1e6 * self.tick_time / max(count, 1):.1f}us per tick.")
+
+
+    def stop(self):
+        """
+        Stops the server after the current tick.
+
+        Returns:
+            None
+        """
+        self.running = False
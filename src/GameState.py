@@ -0,0 +1,536 @@
+try:
+    from FoodSpawner import FoodSpawner
+    from SnakeBody import SnakeBody
+    from Snapshot import (Snapshot, SET_OWNER, TAKE, UNTAKE, RELEASE, UNRELEASE, ADVANCE, RETREAT, SET_FOOD,
+                          SET_WALL)
+    from SpatialGrid import SpatialGrid
+except ImportError:
+    from .FoodSpawner import FoodSpawner
+    from .SnakeBody import SnakeBody
+    from .Snapshot import (Snapshot, SET_OWNER, TAKE, UNTAKE, RELEASE, UNRELEASE, ADVANCE, RETREAT, SET_FOOD,
+                           SET_WALL)
+    from .SpatialGrid import SpatialGrid
+
+
+class GameState:
+    """
+    The GameState class holds the display-independent state of a snake game.
+
+    It owns the position, speed and screen wraparound of the snake so the game
+    logic can be stepped without pygame (for example on headless workers). The
+    Snake sprite and Application.loop both drive a GameState.
+
+    The board is divided into a grid of cells the size of the snake's head. Every
+    time the head enters a new cell, the snake's body advances into it. Entering the
+    cell holding the food grows the snake and places new food on a free cell.
+    Entering a cell occupied by the body or by a wall ends the game.
+
+    The grid index records what occupies every cell (the snake's body, the food or
+    a wall), so a move is checked for collisions with a single lookup.
+
+    snapshot() checkpoints the game and restore() returns to any checkpoint, for
+    search-based bots and rewind debugging. Nothing is copied: while snapshots are
+    taken, every move records the handful of cells it changed in a tree of versions
+    of the board (see Snapshot), and restore() walks the tree from the current version
+    to the snapshot's. Snapshots on different branches can be held and restored in any
+    order, so a search forks the game cheaply however large the board is.
+
+    Attributes:
+        Board Attributes
+            width (int): The width of the board in pixels.
+            height (int): The height of the board in pixels.
+            cols (int): The number of grid columns on the board.
+            rows (int): The number of grid rows on the board.
+            grid (SpatialGrid): What occupies every cell of the board.
+            walls (set): The cells blocked by walls.
+
+        Snake Attributes
+            x (int): The x position of the snake's head.
+            y (int): The y position of the snake's head.
+            speed (tuple): The speed of the snake (x, y).
+            size (tuple): The size of the snake's head (width, height), which is also the size of a grid cell.
+            body (SnakeBody): The cells occupied by the snake's body.
+            alive (bool): False once the snake has collided with itself or a wall.
+            score (int): The amount of food eaten.
+
+        Food Attributes
+            food_spawner (FoodSpawner): Places food on the free cells of the board.
+            food (int): The cell holding the food, or None if the board is full.
+            seed (int): The seed used to place food.
+
+        Simulation Attributes
+            ticks (int): The number of ticks that have been simulated.
+            entered_cell (int): The cell the head entered in the last tick, or None.
+            vacated_cell (int): The cell the tail left in the last tick, or None.
+            version (list): The current version of the board while snapshots are taken, or None.
+            rng_checkpoint (tuple): The number of draws and state of the food's random number generator at the last snapshot.
+
+        Final variables:
+            FOOD (str): The entity the grid holds for the food.
+            WALL (str): The entity the grid holds for walls.
+    """
+    width = None
+    height = None
+    x = 0
+    y = 0
+    speed = (-2, -2) # Speed x, y
+    size = (10, 10)
+    cols = None
+    rows = None
+    grid = None
+    walls = None
+    body = None
+    alive = True
+    score = 0
+    food_spawner = None
+    ticks = 0
+    entered_cell = None
+    vacated_cell = None
+    version = None
+    rng_checkpoint = None
+
+    FOOD = "food"
+    WALL = "wall"
+
+
+    def __init__(self, width, height, start_position=(0, 0), speed=(-2, -2), size=(10, 10), seed=None):
+        """
+        Initializes the GameState object.
+
+        Args:
+            width (int): The width of the board in pixels.
+            height (int): The height of the board in pixels.
+            start_position (tuple): The starting position of the snake (x, y).
+            speed (tuple): The speed of the snake (x, y).
+            size (tuple): The size of the snake's head (width, height).
+            seed (int): The seed used to place food (None picks a random seed).
+
+        Returns:
+            None
+        """
+        self.width = int(width)
+        self.height = int(height)
+        self.x, self.y = int(start_position[0]) % self.width, int(start_position[1]) % self.height
+        self.speed = speed
+        self.size = size
+        self.cols = max(self.width // size[0], 1)
+        self.rows = max(self.height // size[1], 1)
+        self.body = SnakeBody(self.cols, self.rows, self.cell_at(self.x, self.y))
+        self.alive = True
+        self.score = 0
+        self.ticks = 0
+
+        self.grid = SpatialGrid(self.cols, self.rows, size)
+        self.grid.insert(self.body.head, self.body)
+        self.walls = set()
+
+        self.food_spawner = FoodSpawner(self.cols * self.rows, self.body, seed)
+        self.spawn_food()
+
+
+    @property
+    def position(self):
+        """
+        The position of the snake's head (x, y).
+        """
+        return (self.x, self.y)
+
+
+    @property
+    def food(self):
+        """
+        The cell holding the food, or None if the board is full.
+        """
+        return self.food_spawner.food
+
+
+    @property
+    def seed(self):
+        """
+        The seed used to place food.
+        """
+        return self.food_spawner.seed
+
+
+    def cell_at(self, x, y):
+        """
+        Returns the index of the grid cell containing a position.
+
+        Positions outside the board map to the cell on the other side.
+
+        Args:
+            x (int): The x position.
+            y (int): The y position.
+
+        Returns:
+            int: The cell index.
+        """
+        return ((y // self.size[1]) % self.rows) * self.cols + (x // self.size[0]) % self.cols
+
+
+    def spawn_food(self):
+        """
+        Places the food on a random free cell.
+
+        Returns:
+            int: The cell holding the food, or None if the board is full.
+        """
+        changes = [] if self.version is not None else None
+        food = self.place_food(changes)
+        if changes is not None:
+            self.commit(changes)
+        return food
+
+
+    def place_food(self, changes):
+        """
+        Places the food on a random free cell, recording the changes that undo it.
+
+        Args:
+            changes (list): The changes undoing the current move, or None when no snapshot is taken.
+
+        Returns:
+            int: The cell holding the food, or None if the board is full.
+        """
+        food_spawner = self.food_spawner
+        if changes is None:
+            food = food_spawner.spawn()
+        else:
+            changes.append((SET_FOOD, food_spawner.food))
+            food = food_spawner.food = food_spawner.sample()
+            if food is not None:
+                changes.append((UNTAKE, food, food_spawner.positions[food]))
+                food_spawner.take(food)
+
+        if food is not None:
+            if changes is not None:
+                changes.append((SET_OWNER, food, self.grid.owners[food]))
+            self.grid.insert(food, self.FOOD)
+        return food
+
+
+    def remove_food(self):
+        """
+        Takes the food off the board without placing new food.
+
+        Returns:
+            None
+        """
+        food = self.food_spawner.food
+        if food is not None:
+            self.grid.remove(food, self.FOOD)
+            self.food_spawner.release(food)
+            self.food_spawner.food = None
+            if self.version is not None:
+                self.commit([(SET_OWNER, food, self.FOOD), (UNRELEASE, food), (SET_FOOD, food)])
+
+
+    def add_wall(self, cell):
+        """
+        Blocks a cell with a wall. Food is never placed on walls, and the snake dies entering one.
+
+        Args:
+            cell (int): The cell index.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the cell is occupied by the snake or holds the food.
+        """
+        occupant = self.grid[cell]
+        if occupant is not None and occupant is not self.WALL:
+            raise ValueError(f"Cell {cell} is occupied by the {'food' if occupant is self.FOOD else 'snake'}.")
+
+        if self.version is not None:
+            self.commit([(SET_WALL, cell, cell in self.walls), (SET_OWNER, cell, occupant),
+                         (UNTAKE, cell, self.food_spawner.positions[cell])])
+        self.walls.add(cell)
+        self.grid.insert(cell, self.WALL)
+        self.food_spawner.take(cell)
+
+
+    def blocked(self, cell):
+        """
+        Returns whether moving the head into a cell would end the game.
+
+        Args:
+            cell (int): The cell the head would move into.
+
+        Returns:
+            bool: True if the cell holds a wall, or a part of the body that won't move out of the way.
+        """
+        occupant = self.grid.owners[cell]
+        if occupant is None or occupant is self.FOOD:
+            return False
+        return occupant is not self.body or self.body.collides(cell)
+
+
+    def grow(self, amount=1):
+        """
+        Grows the snake by a number of segments.
+
+        Args:
+            amount (int): The number of segments to add.
+
+        Returns:
+            None
+        """
+        self.body.grow(amount)
+
+
+    def steer(self, direction):
+        """
+        Steers the snake in a direction, keeping its current speed.
+
+        The snake can't reverse into its own body.
+
+        Args:
+            direction (tuple): The direction (x, y), with components -1, 0 or 1.
+
+        Returns:
+            bool: True if the snake changed direction.
+        """
+        step = max(abs(self.speed[0]), abs(self.speed[1]))
+        speed = (direction[0] * step, direction[1] * step)
+
+        if speed == self.speed:
+            return False
+        if len(self.body) > 1 and speed == (-self.speed[0], -self.speed[1]):
+            return False
+
+        self.speed = speed
+        return True
+
+
+    def step(self):
+        """
+        Advances the game by one tick.
+
+        The board wraps around: a snake leaving one side of the screen comes back in on
+        the other side, so x stays between 0 and width and y between 0 and height.
+
+        Once the snake has collided with itself or a wall, the game no longer advances.
+
+        Returns:
+            None
+        """
+        if not self.alive:
+            return
+
+        x = (self.x + self.speed[0]) % self.width
+        y = (self.y + self.speed[1]) % self.height
+
+        self.x = x
+        self.y = y
+        self.ticks += 1
+
+        cell = ((y // self.size[1]) % self.rows) * self.cols + (x // self.size[0]) % self.cols
+        if cell == self.body.cells[-1]:
+            self.entered_cell = self.vacated_cell = None
+            return
+        self.enter(cell)
+
+
+    def enter(self, cell):
+        """
+        Moves the snake's body into the cell its head just entered.
+
+        The snake eats the food, dies or simply advances. Called by step() whenever the
+        head crosses into a new cell, and by BatchSnakeEnv for the games of a batch.
+
+        Args:
+            cell (int): The cell the head entered.
+
+        Returns:
+            None
+        """
+        body = self.body
+        owners = self.grid.owners
+        occupant = owners[cell]
+        if occupant is not None and occupant is not self.FOOD and (occupant is not body or body.collides(cell)):
+            self.alive = False
+
+        food_spawner = self.food_spawner
+        eaten = cell == food_spawner.food
+        # The changes that undo the move, for restore()
+        changes = None
+        if self.version is not None:
+            changes = [(SET_OWNER, cell, occupant), (UNTAKE, cell, food_spawner.positions[cell])]
+            was_occupied = body.occupied[cell]
+        if eaten:
+            self.score += 1
+            body.grow()
+        else:
+            food_spawner.take(cell)
+
+        self.entered_cell = cell
+        self.vacated_cell = vacated = body.advance(cell)
+        # The head may move into the cell its own tail just left
+        if vacated is not None and vacated != cell:
+            owners[vacated] = None
+            food_spawner.release(vacated)
+            if changes is not None:
+                changes.append((SET_OWNER, vacated, body))
+                changes.append((UNRELEASE, vacated))
+        # A wall stays a wall, the snake is dead anyway
+        if occupant is not self.WALL:
+            owners[cell] = body
+
+        if changes is not None:
+            changes.append((RETREAT, vacated, was_occupied))
+        if eaten:
+            self.place_food(changes)
+        if changes is not None:
+            self.commit(changes)
+
+
+    def run(self, ticks):
+        """
+        Advances the game by a number of ticks as fast as possible, or until the snake dies.
+
+        Args:
+            ticks (int): The number of ticks to simulate.
+
+        Returns:
+            None
+        """
+        step = self.step
+        for _ in range(ticks):
+            step()
+            if not self.alive:
+                break
+
+
+    def snapshot(self):
+        """
+        Checkpoints the game, to return to it later with restore().
+
+        The first snapshot starts recording the changes every move makes to the board,
+        until discard_snapshots() is called.
+
+        Returns:
+            Snapshot: The checkpoint.
+        """
+        if self.version is None:
+            self.version = [None, None]
+        food_spawner = self.food_spawner
+        if self.rng_checkpoint is None or self.rng_checkpoint[0] != food_spawner.draws:
+            self.rng_checkpoint = (food_spawner.draws, food_spawner.rng.getstate())
+        return Snapshot(self.version, (self.x, self.y, self.speed, self.alive, self.score, self.ticks,
+                                       self.entered_cell, self.vacated_cell, self.body.growth), *self.rng_checkpoint)
+
+
+    def restore(self, snapshot):
+        """
+        Returns the game to a snapshot, wherever it has been played since.
+
+        Every snapshot of the game stays valid, this one and the ones taken on other branches.
+
+        Args:
+            snapshot (Snapshot): A snapshot of this game.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the snapshot wasn't taken of this game, or its snapshots were discarded since.
+        """
+        current = self.version
+        path = []
+        version = snapshot.version
+        while version is not current:
+            path.append(version)
+            version = version[1]
+            if version is None:
+                raise ValueError("The snapshot wasn't taken of this game since its snapshots were last discarded.")
+
+        # Undo the moves from the current version back to the snapshot's, turning every link around
+        for version in reversed(path):
+            newer = version[1]
+            newer[0], newer[1] = self.apply_changes(version[0]), version
+            version[0] = version[1] = None
+        self.version = snapshot.version
+
+        (self.x, self.y, self.speed, self.alive, self.score, self.ticks,
+         self.entered_cell, self.vacated_cell, self.body.growth) = snapshot.values
+        food_spawner = self.food_spawner
+        if food_spawner.draws != snapshot.draws:
+            food_spawner.draws = snapshot.draws
+            food_spawner.rng.setstate(snapshot.rng_state)
+
+
+    def discard_snapshots(self):
+        """
+        Stops recording the changes to the board. Every snapshot becomes invalid.
+
+        Returns:
+            None
+        """
+        self.version = None
+
+
+    def commit(self, changes):
+        """
+        Adds a version of the board after a move.
+
+        Args:
+            changes (list): The changes undoing the move, in the order they were made.
+
+        Returns:
+            None
+        """
+        changes.reverse()
+        newer = [None, None]
+        self.version[0], self.version[1] = changes, newer
+        self.version = newer
+
+
+    def apply_changes(self, changes):
+        """
+        Applies changes recorded in a version to the board.
+
+        Args:
+            changes (list): The changes, in order.
+
+        Returns:
+            list: The changes that undo them.
+        """
+        body, owners, food_spawner, walls = self.body, self.grid.owners, self.food_spawner, self.walls
+        positions = food_spawner.positions
+        undo = []
+        for change in changes:
+            operation, cell = change[0], change[1]
+            if operation == SET_OWNER:
+                undo.append((SET_OWNER, cell, owners[cell]))
+                owners[cell] = change[2]
+            elif operation == TAKE:
+                undo.append((UNTAKE, cell, positions[cell]))
+                food_spawner.take(cell)
+            elif operation == UNTAKE:
+                undo.append((TAKE, cell))
+                food_spawner.untake(cell, change[2])
+            elif operation == RELEASE:
+                undo.append((UNRELEASE, cell) if positions[cell] == -1 else (RELEASE, cell))
+                food_spawner.release(cell)
+            elif operation == UNRELEASE:
+                undo.append((RELEASE, cell))
+                food_spawner.unrelease(cell)
+            elif operation == ADVANCE:
+                was_occupied = body.occupied[cell]
+                undo.append((RETREAT, body.push(cell, change[2]), was_occupied))
+            elif operation == RETREAT:
+                # cell is the cell the tail vacated
+                undo.append((ADVANCE, body.head, cell is not None))
+                body.retreat(cell, change[2])
+            elif operation == SET_FOOD:
+                undo.append((SET_FOOD, food_spawner.food))
+                food_spawner.food = cell
+            elif operation == SET_WALL:
+                undo.append((SET_WALL, cell, cell in walls))
+                if change[2]:
+                    walls.add(cell)
+                else:
+                    walls.discard(cell)
+        undo.reverse()
+        return undo
@@ -0,0 +1,64 @@
+import time
+
+
+class HeadlessMode:
+    """
+    The HeadlessMode class plays a single snake without a display.
+
+    The game state is stepped as fast as the CPU allows, without any event polling,
+    frame limiting or rendering, for the configured number of ticks or until the snake
+    dies. The autopilot steers the snake when it is on.
+
+    Attributes:
+        application (Application): The application playing the game.
+    """
+    application = None
+
+
+    def __init__(self, application):
+        """
+        Initializes the HeadlessMode object.
+
+        Args:
+            application (Application): The application playing the game.
+
+        Returns:
+            None
+        """
+        self.application = application
+
+
+    def run(self):
+        """
+        Plays the game and stores its result.
+
+        Returns:
+            None
+        """
+        application = self.application
+        state, ticks = application.state, application.ticks
+        start_time = time.perf_counter()
+        start_ticks = state.ticks
+
+        if application.pilot is not None:
+            pilot, step, steer = application.pilot, state.step, application.steer
+            steps = 0
+            while application.running and state.alive and (ticks is None or steps < ticks):
+                direction = pilot(state)
+                if direction is not None:
+                    steer(direction)
+                step()
+                steps += 1
+            application.running = False
+        elif ticks is None:
+            step = state.step
+            while application.running and state.alive:
+                step()
+        else:
+            state.run(ticks)
+            application.running = False
+
+        elapsed = time.perf_counter() - start_time
+        simulated = state.ticks - start_ticks
+        application.logger.info(f"Simulated {simulated} ticks in {elapsed:.3f}s ({simulated / max(elapsed, 1e-9):.0f} ticks/s).")
+        application.store_result(elapsed)
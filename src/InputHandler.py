@@ -0,0 +1,227 @@
+import collections
+import random
+import threading
+import time
+
+import pygame as pg
+
+
+class InputHandler:
+    """
+    The InputHandler class receives the game's input events as soon as they arrive.
+
+    Only the event types the game uses are let onto the event queue (pg.event.set_allowed),
+    so pygame never wakes the game up for mouse motion, window or joystick events. Instead
+    of sleeping between frames, the game waits on the event queue with wait(), so an event
+    is received and timestamped the moment it arrives, not when the next frame starts.
+
+    Direction keys are buffered as turns and applied by apply() on the next logic tick,
+    one turn per tick, so a quick sequence of turns (for example up then left within
+    one tick) is played in order instead of the last key overwriting the first. Every
+    applied turn remembers when its key arrived, and presented() returns how long ago
+    that was once a frame showing the turn has been pushed to the display: the
+    input-to-photon latency, up to the display's own delay.
+
+    Attributes:
+        direction_keys (dict): The direction each key code steers in.
+        max_turns (int): The number of turns buffered, later turns are dropped until the buffer drains.
+        clock (callable): Returns the current time in seconds.
+        events (list): The received events that aren't turns, waiting for poll().
+        turns (collections.deque): The buffered turns, (direction, arrival time).
+        applied (list): The arrival times of the turns applied since the last presented frame.
+        received (int): The number of turns received.
+        dropped (int): The number of turns dropped because the buffer was full.
+        synthetic_thread (threading.Thread): Posts synthetic key presses, or None.
+
+    Final variables:
+        EVENT_TYPES (tuple): The event types let onto the event queue.
+        SYNTHETIC_KEYS (tuple): The keys pressed in turn by post_synthetic_input() (every turn is perpendicular to the last).
+    """
+    direction_keys = None
+    max_turns = 3
+    clock = None
+    events = None
+    turns = None
+    applied = None
+    received = 0
+    dropped = 0
+    synthetic_thread = None
+
+    EVENT_TYPES = (pg.QUIT, pg.KEYDOWN)
+    SYNTHETIC_KEYS = ("right", "down", "right", "up")
+
+
+    def __init__(self, direction_keys, max_turns=3, clock=time.perf_counter):
+        """
+        Initializes the InputHandler object and filters the event queue.
+
+        Args:
+            direction_keys (dict): The direction each key code steers in.
+            max_turns (int): The number of turns buffered.
+            clock (callable): Returns the current time in seconds.
+
+        Returns:
+            None
+        """
+        self.direction_keys = direction_keys
+        self.max_turns = max_turns
+        self.clock = clock
+        self.events = []
+        self.turns = collections.deque()
+        self.applied = []
+        self.received = 0
+        self.dropped = 0
+
+        pg.event.set_blocked(None)
+        pg.event.set_allowed(self.EVENT_TYPES)
+
+
+    def receive(self, event, now):
+        """
+        Handles an event that just arrived.
+
+        Args:
+            event (pg.event.Event): The event.
+            now (float): The time it was received. Synthetic events carry the time they were posted instead.
+
+        Returns:
+            None
+        """
+        if event.type == pg.KEYDOWN and event.key in self.direction_keys:
+            self.received += 1
+            if len(self.turns) < self.max_turns:
+                self.turns.append((self.direction_keys[event.key], getattr(event, "timestamp", now)))
+            else:
+                self.dropped += 1
+        else:
+            self.events.append(event)
+
+
+    def pump(self):
+        """
+        Receives the events waiting on the queue.
+
+        Returns:
+            None
+        """
+        events = pg.event.get()
+        if events:
+            now = self.clock()
+            for event in events:
+                self.receive(event, now)
+
+
+    def poll(self):
+        """
+        Returns the events received since the last poll that aren't turns.
+
+        Returns:
+            list: The events.
+        """
+        self.pump()
+        events, self.events = self.events, []
+        return events
+
+
+    def wait(self, seconds):
+        """
+        Waits for a number of seconds, receiving events the moment they arrive.
+
+        Used instead of time.sleep() between frames.
+
+        Args:
+            seconds (float): The number of seconds to wait.
+
+        Returns:
+            None
+        """
+        deadline = self.clock() + seconds
+        while True:
+            remaining = deadline - self.clock()
+            # pg.event.wait() only takes whole milliseconds
+            if remaining < 0.001:
+                if remaining > 0:
+                    time.sleep(remaining)
+                return
+
+            event = pg.event.wait(int(remaining * 1000))
+            if event.type != pg.NOEVENT:
+                self.receive(event, self.clock())
+                self.pump()
+
+
+    def apply(self, steer):
+        """
+        Applies the next buffered turn. Called once per logic tick.
+
+        Turns that don't change the direction (the same direction, or reversing into the body)
+        are skipped, so they don't hold up the turns after them.
+
+        Args:
+            steer (callable): Steers the snake in a direction, returns whether the direction changed.
+
+        Returns:
+            bool: True if a turn was applied.
+        """
+        turns = self.turns
+        while turns:
+            direction, arrival = turns.popleft()
+            if steer(direction):
+                self.applied.append(arrival)
+                return True
+        return False
+
+
+    def presented(self):
+        """
+        Returns the input-to-photon latencies of the turns shown by the frame just pushed to the display.
+
+        Returns:
+            list: The latency of every turn applied since the last presented frame, in seconds.
+        """
+        if not self.applied:
+            return []
+        now = self.clock()
+        latencies = [now - arrival for arrival in self.applied]
+        self.applied.clear()
+        return latencies
+
+
+    def finished(self, count):
+        """
+        Returns whether a number of turns were received, and every one of them was applied and presented (or skipped).
+
+        Args:
+            count (int): The number of turns expected.
+
+        Returns:
+            bool: True once the turns are done with.
+        """
+        return self.received >= count and not self.turns and not self.applied
+
+
+    def post_synthetic_input(self, count, interval=(0.05, 0.15), seed=None):
+        """
+        Starts posting synthetic key presses from a background thread, to measure the latency distribution.
+
+        Presses are posted at random intervals, so they arrive at random points of the frame.
+        Each press carries the time it was posted, which is used as its arrival time.
+
+        Args:
+            count (int): The number of key presses.
+            interval (tuple): The minimum and maximum number of seconds between presses.
+            seed (int): The seed of the random intervals.
+
+        Returns:
+            None
+        """
+        rng = random.Random(seed)
+        keys = [pg.key.key_code(name) for name in self.SYNTHETIC_KEYS]
+
+        def post():
+            for index in range(count):
+                time.sleep(rng.uniform(*interval))
+                pg.event.post(pg.event.Event(pg.KEYDOWN, key=keys[index % len(keys)], timestamp=self.clock()))
+
+        self.synthetic_thread = threading.Thread(target=post, name="SyntheticInput", daemon=True)
+        self.synthetic_thread.start()
@@ -0,0 +1,70 @@
+class InputLatencyTest:
+    """
+    The InputLatencyTest class measures the input-to-photon latency of synthetic key presses.
+
+    The key presses are posted from a background thread by the InputHandler, and the game
+    loop records the latency of every presented turn in the profiler under "input". Once
+    every press was received and presented, the distribution is logged and the game ends.
+
+    Attributes:
+        input (InputHandler): Receives the key presses.
+        profiler (FrameProfiler): Holds the measured latencies.
+        logger (logging.Logger): The latencies are logged to it.
+        presses (int): The number of key presses to post.
+    """
+    input = None
+    profiler = None
+    logger = None
+    presses = 0
+
+
+    def __init__(self, input, profiler, logger, presses):
+        """
+        Initializes the InputLatencyTest object.
+
+        Args:
+            input (InputHandler): Receives the key presses.
+            profiler (FrameProfiler): Holds the measured latencies.
+            logger (logging.Logger): The latencies are logged to it.
+            presses (int): The number of key presses to post.
+
+        Returns:
+            None
+        """
+        self.input = input
+        self.profiler = profiler
+        self.logger = logger
+        self.presses = presses
+
+
+    def start(self, seed=None):
+        """
+        Starts posting the key presses.
+
+        Args:
+            seed (int): The seed of the random intervals between the presses.
+
+        Returns:
+            None
+        """
+        self.input.post_synthetic_input(self.presses, seed=seed)
+
+
+    def finished(self):
+        """
+        Returns whether every key press was received and presented.
+        """
+        return self.input.finished(self.presses)
+
+
+    def log(self):
+        """
+        Logs the distribution of the input-to-photon latency of the presented turns.
+
+        Returns:
+            None
+        """
+        count = self.profiler.counts.get("input", 0)
+        percentiles = ", ".join(f"{name} {value / 1000:.1f}ms" for name, value in self.profiler.percentiles("input").items())
+        self.logger.info(f"Input-to-photon latency over {count} turns: {percentiles} "
+                         f"({self.input.dropped} turns dropped by the full buffer).")
@@ -0,0 +1,61 @@
+"""
+Policies steer a snake in games without a player, for example in self-play.
+
+A policy is a callable policy(state, rng) that is called before every tick with
+the GameState and a random.Random object owned by the game. It returns the
+direction (x, y) to steer the snake in, or None to keep going straight. The
+policies here assume the snake moves one cell per tick.
+"""
+
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+def current_direction(state):
+    """
+    Returns the direction the snake is moving in, with components -1, 0 or 1.
+    """
+    return tuple((speed > 0) - (speed < 0) for speed in state.speed)
+
+
+def safe_directions(state):
+    """
+    Returns the directions the snake can move in without colliding with itself or a wall.
+    """
+    body = state.body
+    heading = current_direction(state)
+    return [
+        direction for direction in DIRECTIONS
+        if direction != (-heading[0], -heading[1]) and not state.blocked(body.neighbor(body.head, direction))
+    ]
+
+
+def random_policy(state, rng):
+    """
+    Turns into a random safe direction now and then, and whenever going straight isn't safe.
+    """
+    directions = safe_directions(state)
+    if not directions:
+        return None
+    if current_direction(state) in directions and rng.random() < 0.9:
+        return None
+    return rng.choice(directions)
+
+
+def greedy_policy(state, rng):
+    """
+    Moves towards the food along the shortest wrapped distance, avoiding the snake's body and walls.
+    """
+    directions = safe_directions(state)
+    if not directions or state.food is None:
+        return None
+
+    body = state.body
+    food_col, food_row = body.cell_position(state.food)
+
+    def distance(direction):
+        col, row = body.cell_position(body.neighbor(body.head, direction))
+        dx, dy = abs(col - food_col), abs(row - food_row)
+        return min(dx, body.cols - dx) + min(dy, body.rows - dy)
+
+    best = min(distance(direction) for direction in directions)
+    return rng.choice([direction for direction in directions if distance(direction) == best])
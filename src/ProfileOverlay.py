@@ -0,0 +1,68 @@
+import time
+
+import pygame as pg
+
+
+class ProfileOverlay:
+    """
+    The ProfileOverlay class draws the frame timings of a FrameProfiler on screen.
+
+    The text is only re-rendered every `interval` seconds, in between the cached surface is blitted.
+
+    Attributes:
+        profiler (FrameProfiler): The profiler whose timings are drawn.
+        interval (float): The number of seconds between re-renders of the text.
+        surface (pg.Surface): The rendered text, or None before the first draw.
+        rect (pg.Rect): Where the overlay was last drawn, or None once the caller erased it.
+        font (pg.font.Font): The font of the text, loaded by the first draw.
+        updated (float): When the text was last rendered.
+    """
+    profiler = None
+    interval = 0.5
+    surface = None
+    rect = None
+    font = None
+    updated = 0.0
+
+
+    def __init__(self, profiler, interval=0.5):
+        """
+        Initializes the ProfileOverlay object.
+
+        Args:
+            profiler (FrameProfiler): The profiler whose timings are drawn.
+            interval (float): The number of seconds between re-renders of the text.
+
+        Returns:
+            None
+        """
+        self.profiler = profiler
+        self.interval = interval
+
+
+    def draw(self, screen):
+        """
+        Draws the frame timings in the top left corner of the screen.
+
+        Args:
+            screen (pg.Surface): The surface to draw on.
+
+        Returns:
+            pg.Rect: The region of the screen the overlay was drawn in.
+        """
+        now = time.perf_counter()
+        if self.surface is None or now >= self.updated + self.interval:
+            if self.font is None:
+                pg.font.init()
+                self.font = pg.font.Font(None, 18)
+
+            lines = self.profiler.format_lines() or ["Collecting frame timings..."]
+            line_height = self.font.get_linesize()
+            self.surface = pg.Surface((max(self.font.size(line)[0] for line in lines) + 8,
+                                       line_height * len(lines) + 8)).convert()
+            for index, line in enumerate(lines):
+                self.surface.blit(self.font.render(line, True, "yellow"), (4, 4 + index * line_height))
+            self.updated = now
+
+        self.rect = screen.blit(self.surface, (0, 0))
+        return self.rect
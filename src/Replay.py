@@ -0,0 +1,273 @@
+import io
+import json
+
+try:
+    from GameState import GameState
+except ImportError:
+    from .GameState import GameState
+
+
+MAGIC = b"SNKR"
+VERSION = 1
+END = 0xFF
+
+
+def encode_varint(value):
+    """
+    Encodes a non-negative integer as a LEB128 varint.
+
+    Args:
+        value (int): The integer to encode.
+
+    Returns:
+        bytes: The encoded integer (1 byte for values below 128).
+    """
+    data = bytearray()
+    while value >= 0x80:
+        data.append((value & 0x7F) | 0x80)
+        value >>= 7
+    data.append(value)
+    return bytes(data)
+
+
+def read_varint(stream):
+    """
+    Reads a LEB128 varint from a binary stream.
+
+    Args:
+        stream (io.BufferedIOBase): The stream to read from.
+
+    Returns:
+        int: The decoded integer, or None at the end of the stream.
+    """
+    value = 0
+    shift = 0
+    while True:
+        byte = stream.read(1)
+        if not byte:
+            return None
+        value |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            return value
+        shift += 7
+
+
+def encode_direction(direction):
+    """
+    Packs a direction (x, y) with components -1, 0 or 1 into 4 bits.
+    """
+    return (direction[0] + 1) | ((direction[1] + 1) << 2)
+
+
+def decode_direction(code):
+    """
+    Unpacks a direction packed by encode_direction().
+    """
+    return ((code & 0x3) - 1, (code >> 2) - 1)
+
+
+class ReplayRecorder:
+    """
+    The ReplayRecorder class records a game so it can be re-simulated exactly.
+
+    A replay file starts with a small JSON header holding everything needed to
+    rebuild the initial GameState (board, start position, speed and the food seed).
+    The header doesn't hold the body, the food or the state of the food's random
+    number generator, so a recording must start with a new game (at tick 0).
+    It is followed by one record per input: the number of ticks since the previous
+    input as a varint, and the direction packed into one byte. Most inputs take
+    two bytes. The file is append-only; closing it appends an end record with the
+    final tick, score and length so a replay can be verified.
+
+    Attributes:
+        path (str): The path of the replay file.
+        file (io.BufferedWriter): The replay file.
+        last_tick (int): The tick of the last recorded input.
+        inputs (int): The number of recorded inputs.
+    """
+    path = None
+    file = None
+    last_tick = 0
+    inputs = 0
+
+
+    def __init__(self, path, state, configuration=None):
+        """
+        Initializes the ReplayRecorder object and writes the replay header.
+
+        Args:
+            path (str): The path of the replay file.
+            state (GameState): The game state at the start of the recording.
+            configuration (dict): Extra configuration to store in the header.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the game has already started, its state couldn't be rebuilt from the header.
+        """
+        if state.ticks != 0:
+            raise ValueError(f"Replays must start with a new game, the game is at tick {state.ticks}.")
+
+        self.path = path
+        self.last_tick = state.ticks
+        self.inputs = 0
+
+        header = {
+            "width": state.width,
+            "height": state.height,
+            "start_position": list(state.position),
+            "speed": list(state.speed),
+            "size": list(state.size),
+            "seed": state.seed,
+            "ticks": state.ticks,
+            "configuration": configuration or {},
+        }
+        header = json.dumps(header, separators=(",", ":")).encode("utf-8")
+
+        self.file = open(path, "wb")
+        self.file.write(MAGIC + bytes([VERSION]) + encode_varint(len(header)) + header)
+
+
+    def record(self, tick, direction):
+        """
+        Records an input.
+
+        Args:
+            tick (int): The number of ticks simulated when the input was applied.
+            direction (tuple): The direction the snake was steered in.
+
+        Returns:
+            None
+        """
+        self.file.write(encode_varint(tick - self.last_tick) + bytes([encode_direction(direction)]))
+        self.last_tick = tick
+        self.inputs += 1
+
+
+    def close(self, state):
+        """
+        Writes the end record and closes the replay file.
+
+        Args:
+            state (GameState): The game state at the end of the recording.
+
+        Returns:
+            None
+        """
+        if self.file is None:
+            return
+
+        self.file.write(encode_varint(state.ticks - self.last_tick) + bytes([END])
+                        + encode_varint(state.score) + encode_varint(len(state.body)))
+        self.file.close()
+        self.file = None
+
+
+class ReplayReader:
+    """
+    The ReplayReader class re-simulates a game recorded by a ReplayRecorder.
+
+    Attributes:
+        path (str): The path of the replay file.
+        header (dict): The replay header.
+        inputs (list): The recorded inputs as (tick, direction) tuples.
+        end (tuple): The recorded (ticks, score, length) at the end of the game, or None
+            if the recording wasn't closed.
+    """
+    path = None
+    header = None
+    inputs = None
+    end = None
+
+
+    def __init__(self, path):
+        """
+        Initializes the ReplayReader object and reads the replay file.
+
+        Args:
+            path (str): The path of the replay file.
+
+        Returns:
+            None
+        """
+        self.path = path
+        self.inputs = []
+        self.end = None
+
+        with open(path, "rb") as f:
+            stream = io.BytesIO(f.read())
+
+        if stream.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a replay file.")
+        version = stream.read(1)[0]
+        if version != VERSION:
+            raise ValueError(f"Unsupported replay version {version}.")
+
+        header_length = read_varint(stream)
+        self.header = json.loads(stream.read(header_length))
+
+        tick = self.header["ticks"]
+        while True:
+            delta = read_varint(stream)
+            code = stream.read(1)
+            if delta is None or not code:
+                # The recording was cut off, replay what is there
+                break
+
+            tick += delta
+            if code[0] == END:
+                self.end = (tick, read_varint(stream), read_varint(stream))
+                break
+            self.inputs.append((tick, decode_direction(code[0])))
+
+
+    def create_state(self):
+        """
+        Creates the game state at the start of the recording.
+
+        Returns:
+            GameState: The initial game state.
+        """
+        header = self.header
+        state = GameState(header["width"], header["height"], header["start_position"],
+                          tuple(header["speed"]), tuple(header["size"]), header["seed"])
+        state.ticks = header["ticks"]
+        return state
+
+
+    def replay(self, state=None):
+        """
+        Re-simulates the recording as fast as possible.
+
+        Args:
+            state (GameState): The initial game state (None creates it from the header).
+
+        Returns:
+            GameState: The game state at the end of the recording.
+        """
+        if state is None:
+            state = self.create_state()
+
+        for tick, direction in self.inputs:
+            state.run(tick - state.ticks)
+            state.steer(direction)
+
+        if self.end is not None:
+            state.run(self.end[0] - state.ticks)
+        return state
+
+
+    def verify(self, state):
+        """
+        Returns whether a re-simulated game ended like the recorded one.
+
+        Args:
+            state (GameState): The re-simulated game state.
+
+        Returns:
+            bool: True if the ticks, score and length match (or the recording has no end record).
+        """
+        if self.end is None:
+            return True
+        return self.end == (state.ticks, state.score, len(state.body))
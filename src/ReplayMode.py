@@ -0,0 +1,54 @@
+import time
+
+try:
+    from Replay import ReplayReader
+except ImportError:
+    from .Replay import ReplayReader
+
+
+class ReplayMode:
+    """
+    The ReplayMode class re-simulates a replay file as fast as possible, without a display.
+
+    Attributes:
+        application (Application): The application replaying the game.
+        reader (ReplayReader): The recording.
+        state (GameState): The re-simulated game, created from the replay header.
+    """
+    application = None
+    reader = None
+    state = None
+
+
+    def __init__(self, application):
+        """
+        Initializes the ReplayMode object and reads the replay file.
+
+        Args:
+            application (Application): The application replaying the game.
+
+        Returns:
+            None
+        """
+        self.application = application
+        self.reader = ReplayReader(application.replay_file)
+        self.state = self.reader.create_state()
+
+
+    def run(self):
+        """
+        Re-simulates the recording and checks that it ended like the recorded game.
+
+        Returns:
+            None
+        """
+        application, reader, state = self.application, self.reader, self.state
+        start_time = time.perf_counter()
+        reader.replay(state)
+        elapsed = time.perf_counter() - start_time
+        application.running = False
+
+        application.logger.info(f"Replayed {len(reader.inputs)} inputs over {state.ticks} ticks in {elapsed:.3f}s "
+                                f"(score {state.score}, length {len(state.body)}).")
+        if not reader.verify(state):
+            application.logger.warning(f"Replay diverged from the recording, which ended at (ticks, score, length) {reader.end}.")
@@ -0,0 +1,100 @@
+class ResolutionScaler:
+    """
+    The ResolutionScaler class picks the internal render resolution from the measured frame times.
+
+    The scale is the number of pixels per board cell of the offscreen surface the game
+    is drawn on before it is scaled to the window. When the average frame time goes over
+    the budget, the scale is lowered one step; when it stays well under the budget, it
+    is raised one step again, up to max_scale. After every change the average starts over
+    and the scale is held for `cooldown` frames, so the scale doesn't oscillate.
+
+    A lower scale doesn't always make frames faster: when the board is scaled to the window
+    in software, the cost is bound by the size of the window, and below a few pixels per cell
+    the scaling gets slower again. The average frame time of every scale is therefore kept,
+    and when a lower scale turns out no faster than the one above it, the scaler goes back up
+    and never goes below that scale again (it becomes min_scale).
+
+    Attributes:
+        scale (int): The current number of pixels per cell.
+        min_scale (int): The lowest scale.
+        max_scale (int): The highest scale.
+        budget (float): The target frame time in seconds.
+        raise_ratio (float): The fraction of the budget the average has to stay under to raise the scale.
+        smoothing (float): The weight of a new frame time in the moving average (0 to 1).
+        cooldown (int): The number of frames the scale is held after a change.
+        average (float): The moving average of the frame times, or None before the first frame.
+        frames (int): The number of frames since the last change.
+        costs (dict): The last average frame time measured at every scale.
+    """
+    scale = 1
+    min_scale = 1
+    max_scale = 1
+    budget = 1 / 60
+    raise_ratio = 0.5
+    smoothing = 0.1
+    cooldown = 30
+    average = None
+    frames = 0
+    costs = None
+
+
+    def __init__(self, max_scale, budget, min_scale=1, raise_ratio=0.5, smoothing=0.1, cooldown=30):
+        """
+        Initializes the ResolutionScaler object at the highest scale.
+
+        Args:
+            max_scale (int): The highest scale.
+            budget (float): The target frame time in seconds.
+            min_scale (int): The lowest scale.
+            raise_ratio (float): The fraction of the budget the average has to stay under to raise the scale.
+            smoothing (float): The weight of a new frame time in the moving average (0 to 1).
+            cooldown (int): The number of frames the scale is held after a change.
+
+        Returns:
+            None
+        """
+        self.max_scale = max_scale
+        self.min_scale = min(min_scale, max_scale)
+        self.scale = max_scale
+        self.budget = budget
+        self.raise_ratio = raise_ratio
+        self.smoothing = smoothing
+        self.cooldown = cooldown
+        self.average = None
+        self.frames = 0
+        self.costs = {}
+
+
+    def update(self, frame_time):
+        """
+        Records the time a frame took and adapts the scale.
+
+        Args:
+            frame_time (float): The time the frame took in seconds.
+
+        Returns:
+            bool: True if the scale changed.
+        """
+        if self.average is None:
+            self.average = frame_time
+        else:
+            self.average += self.smoothing * (frame_time - self.average)
+        self.frames += 1
+        if self.frames < self.cooldown:
+            return False
+
+        scale = self.scale
+        self.costs[scale] = self.average
+        if self.average > self.budget and self.costs.get(scale + 1, float("inf")) <= self.average:
+            # The last step down didn't make frames faster, so it only cost resolution
+            self.min_scale = self.scale = scale + 1
+        elif self.average > self.budget and self.scale > self.min_scale:
+            self.scale -= 1
+        elif self.average < self.budget * self.raise_ratio and self.scale < self.max_scale:
+            self.scale += 1
+        else:
+            return False
+
+        self.average = None
+        self.frames = 0
+        return True
@@ -0,0 +1,391 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from collections import deque
+from pathlib import Path
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS configurations (
+    config_hash TEXT PRIMARY KEY,
+    configuration TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    config_hash TEXT NOT NULL,
+    seed INTEGER,
+    score INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    ticks INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    finished REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_by_configuration ON games (config_hash, score DESC, ticks);
+CREATE INDEX IF NOT EXISTS games_by_score ON games (score DESC, ticks);
+"""
+
+
+def configuration_hash(configuration):
+    """
+    Returns a short stable hash of a configuration, the same whatever the order of its options.
+
+    Args:
+        configuration (dict): The options the games were played with.
+
+    Returns:
+        str: 16 hexadecimal digits.
+    """
+    canonical = json.dumps(configuration, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+
+class ResultsReader:
+    """
+    The ResultsReader class queries a results database without ever writing to it.
+
+    The database is opened read-only, so scripts/QueryResults.py never changes it and
+    also works on read-only media. ResultsStore adds the writing.
+
+    Attributes:
+        path (str): The path to the database file.
+        connection (sqlite3.Connection): The connection to the database.
+
+    Final variables:
+        PERCENTILES (tuple): The percentiles returned by percentiles().
+        COLUMNS (tuple): The columns of a game returned by leaderboard().
+    """
+    path = None
+    connection = None
+
+    PERCENTILES = (50, 90, 99)
+    COLUMNS = ("config_hash", "seed", "score", "length", "ticks", "duration", "finished")
+
+
+    def __init__(self, path):
+        """
+        Initializes the ResultsReader object and opens the database read-only.
+
+        Args:
+            path (str): The path to the database file.
+
+        Returns:
+            None
+
+        Raises:
+            sqlite3.OperationalError: If the database can't be opened.
+        """
+        self.path = path
+        uri = f"{Path(path).resolve().as_uri()}?mode=ro"
+        self.connection = sqlite3.connect(uri, uri=True)
+        try:
+            self.connection.execute("PRAGMA schema_version")
+        except sqlite3.OperationalError:
+            # A WAL database on read-only media can't get its shared-memory file, but nobody can be writing to it
+            self.connection.close()
+            self.connection = sqlite3.connect(f"{uri}&immutable=1", uri=True)
+            self.connection.execute("PRAGMA schema_version")
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+    def query(self, sql, parameters=()):
+        """
+        Runs a query on the database.
+
+        Args:
+            sql (str): The query.
+            parameters (tuple): The query's parameters.
+
+        Returns:
+            list: The rows.
+        """
+        return self.connection.execute(sql, parameters).fetchall()
+
+
+    def leaderboard(self, limit=10, config_hash=None):
+        """
+        Returns the best games, by score and then by the fewest ticks.
+
+        Args:
+            limit (int): The number of games.
+            config_hash (str): Only games played with this configuration (None ranks every game).
+
+        Returns:
+            list: The best games, as dicts of COLUMNS.
+        """
+        columns = ", ".join(self.COLUMNS)
+        if config_hash is None:
+            rows = self.query(f"SELECT {columns} FROM games ORDER BY score DESC, ticks LIMIT ?", (limit,))
+        else:
+            rows = self.query(f"SELECT {columns} FROM games WHERE config_hash = ? ORDER BY score DESC, ticks LIMIT ?",
+                              (config_hash, limit))
+        return [dict(zip(self.COLUMNS, row)) for row in rows]
+
+
+    def percentiles(self, config_hash):
+        """
+        Returns the score percentiles of the games played with a configuration.
+
+        Each percentile walks the (config_hash, score) index in score order up to its
+        offset, so nothing is sorted, but the cost grows with the number of games of
+        the configuration.
+
+        Args:
+            config_hash (str): The hash of the configuration.
+
+        Returns:
+            dict: The p50, p90 and p99 scores, None without games.
+        """
+        count = self.query("SELECT COUNT(*) FROM games WHERE config_hash = ?", (config_hash,))[0][0]
+        percentiles = {}
+        for percentile in self.PERCENTILES:
+            if count == 0:
+                percentiles[f"p{percentile}"] = None
+                continue
+            offset = count - 1 - min(count - 1, count * percentile // 100)
+            percentiles[f"p{percentile}"] = self.query(
+                "SELECT score FROM games WHERE config_hash = ? ORDER BY score DESC LIMIT 1 OFFSET ?",
+                (config_hash, offset))[0][0]
+        return percentiles
+
+
+    def summary(self):
+        """
+        Returns the number of games and the mean and best score of every configuration.
+
+        Returns:
+            list: A dict per configuration (config_hash, configuration, games, mean_score, best_score), most games first.
+        """
+        rows = self.query("SELECT games.config_hash, configurations.configuration, COUNT(*), AVG(score), MAX(score) "
+                          "FROM games LEFT JOIN configurations USING (config_hash) "
+                          "GROUP BY games.config_hash ORDER BY COUNT(*) DESC")
+        return [
+            {"config_hash": config_hash, "configuration": json.loads(configuration) if configuration else None,
+             "games": games, "mean_score": mean_score, "best_score": best_score}
+            for config_hash, configuration, games, mean_score, best_score in rows
+        ]
+
+
+    def close(self):
+        """
+        Closes the database.
+
+        Returns:
+            None
+        """
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+class ResultsStore(ResultsReader):
+    """
+    The ResultsStore class keeps the results of finished games in a local SQLite database.
+
+    Recording a game only appends a row to a deque, so game loops and self-play
+    collectors never wait on the disk. A single writer thread wakes up every
+    flush_interval seconds (or as soon as batch_size rows are waiting) and inserts
+    everything queued with one executemany() in one transaction. The database uses
+    write-ahead logging, so readers in other processes (scripts/QueryResults.py) never
+    block the writer, and several processes can each run a store on the same file:
+    their batches take turns on SQLite's write lock.
+
+    Games are indexed by configuration and score, so leaderboards and percentiles
+    are read in order from an index instead of sorting the table.
+
+    If the writer thread fails, the rows stop being written and the error is raised
+    again by the next flush() or close().
+
+    Attributes:
+        path (str): The path to the database file.
+        batch_size (int): The number of queued rows that wakes the writer up early.
+        flush_interval (float): The maximum number of seconds a row waits to be written.
+        queue (deque): The rows waiting to be written.
+        written (int): The number of rows written.
+        connection (sqlite3.Connection): The connection used by the writer, and by queries under the write lock.
+        error (Exception): The error the writer thread failed with, or None.
+    """
+    path = None
+    batch_size = 1000
+    flush_interval = 0.5
+    queue = None
+    written = 0
+    connection = None
+    error = None
+
+
+    def __init__(self, path, batch_size=1000, flush_interval=0.5):
+        """
+        Initializes the ResultsStore object, creates the database if needed and starts the writer thread.
+
+        Args:
+            path (str): The path to the database file.
+            batch_size (int): The number of queued rows that wakes the writer up early.
+            flush_interval (float): The maximum number of seconds a row waits to be written.
+
+        Returns:
+            None
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = deque()
+        self.written = 0
+        self.error = None
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+        self.write_lock = threading.Lock()
+        self.wake = threading.Event()
+        self.stopping = False
+        self.thread = threading.Thread(target=self.run, name="ResultsStore", daemon=True)
+        self.thread.start()
+
+
+    def register_configuration(self, configuration):
+        """
+        Stores a configuration, so its hash can be looked up later.
+
+        Args:
+            configuration (dict): The options the games are played with.
+
+        Returns:
+            str: The hash of the configuration (see configuration_hash()).
+        """
+        config_hash = configuration_hash(configuration)
+        with self.write_lock, self.connection:
+            self.connection.execute("INSERT OR IGNORE INTO configurations VALUES (?, ?)",
+                                    (config_hash, json.dumps(configuration, sort_keys=True)))
+        return config_hash
+
+
+    def record(self, config_hash, seed, score, length, ticks, duration):
+        """
+        Queues the result of a game.
+
+        Args:
+            config_hash (str): The hash of the game's configuration.
+            seed (int): The seed of the game.
+            score (int): The amount of food eaten.
+            length (int): The length of the snake at the end.
+            ticks (int): The number of ticks played.
+            duration (float): The number of seconds the game took.
+
+        Returns:
+            None
+        """
+        self.queue.append((config_hash, seed, score, length, ticks, duration, time.time()))
+        if len(self.queue) >= self.batch_size:
+            self.wake.set()
+
+
+    def record_game(self, configuration, state, duration):
+        """
+        Stores the configuration of a finished game and queues its result.
+
+        Args:
+            configuration (dict): The options the game was played with.
+            state (GameState): The game at its end.
+            duration (float): The number of seconds the game took.
+
+        Returns:
+            str: The hash of the configuration.
+        """
+        config_hash = self.register_configuration(configuration)
+        self.record(config_hash, state.seed, state.score, len(state.body), state.ticks, duration)
+        return config_hash
+
+
+    def run(self):
+        """
+        Writes the queued rows in batches until the store is closed.
+
+        Returns:
+            None
+        """
+        try:
+            while not self.stopping:
+                self.wake.wait(self.flush_interval)
+                self.wake.clear()
+                self.flush()
+        except Exception as error:
+            # Kept for flush() and close() to raise in the threads using the store
+            self.error = error
+
+
+    def flush(self):
+        """
+        Writes every queued row in one transaction.
+
+        Returns:
+            int: The number of rows written.
+
+        Raises:
+            RuntimeError: If the writer thread failed.
+        """
+        if self.error is not None:
+            raise RuntimeError(f"The results writer thread failed, {len(self.queue)} games weren't stored.") from self.error
+        with self.write_lock:
+            queue = self.queue
+            rows = [queue.popleft() for _ in range(len(queue))]
+            if not rows:
+                return 0
+            with self.connection:
+                self.connection.executemany("INSERT INTO games (config_hash, seed, score, length, ticks, duration, finished) "
+                                            "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self.written += len(rows)
+            return len(rows)
+
+
+    def query(self, sql, parameters=()):
+        """
+        Runs a query on the database, under the write lock.
+
+        Args:
+            sql (str): The query.
+            parameters (tuple): The query's parameters.
+
+        Returns:
+            list: The rows.
+        """
+        with self.write_lock:
+            return self.connection.execute(sql, parameters).fetchall()
+
+
+    def close(self):
+        """
+        Writes the remaining rows, stops the writer thread and closes the database.
+
+        Returns:
+            None
+
+        Raises:
+            RuntimeError: If the writer thread failed.
+        """
+        if self.connection is None:
+            return
+        self.stopping = True
+        self.wake.set()
+        if self.thread is not threading.current_thread():
+            self.thread.join()
+        try:
+            self.flush()
+        finally:
+            self.connection.close()
+            self.connection = None
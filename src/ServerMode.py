@@ -0,0 +1,70 @@
+import asyncio
+
+try:
+    from GameServer import GameServer
+    from GameState import GameState
+except ImportError:
+    from .GameServer import GameServer
+    from .GameState import GameState
+
+
+class ServerMode:
+    """
+    The ServerMode class runs the game at the logic rate and streams it to network clients until stopped.
+
+    The clients render the game, the server only simulates it. Every new game (after the snake
+    dies) uses the next seed when a seed is configured.
+
+    Attributes:
+        application (Application): The application serving the game.
+        seeds (list): The seed of every game served so far.
+    """
+    application = None
+    seeds = None
+
+
+    def __init__(self, application):
+        """
+        Initializes the ServerMode object.
+
+        Args:
+            application (Application): The application serving the game, its state is the first game.
+
+        Returns:
+            None
+        """
+        self.application = application
+        self.seeds = []
+
+
+    def new_game(self):
+        """
+        Returns the game to serve next: the application's game the first time, then a new one.
+
+        Returns:
+            GameState: The game.
+        """
+        application = self.application
+        if self.seeds:
+            seed = None if application.seed is None else application.seed + len(self.seeds)
+            application.state = GameState(application.width, application.height,
+                                          (application.width / 2, application.height / 2), seed=seed)
+        self.seeds.append(application.state.seed)
+        return application.state
+
+
+    def run(self):
+        """
+        Serves games until the configured number of ticks or until interrupted.
+
+        Returns:
+            None
+        """
+        application = self.application
+        application.server = GameServer(self.new_game, application.serve_host, application.serve_port,
+                                         application.logic_rate, application.send_rate, logger=application.logger)
+        try:
+            asyncio.run(application.server.run(application.ticks))
+        except KeyboardInterrupt:
+            application.logger.info("Server interrupted.")
+        application.running = False
@@ -1,6 +1,11 @@
 import pygame
 
-from logging import Logger
+try:
+    from GameState import GameState
+    from SpriteAtlas import SpriteAtlas
+except ImportError:
+    from .GameState import GameState
+    from .SpriteAtlas import SpriteAtlas
 
 class Snake(pygame.sprite.Sprite):
     """
@@ -15,6 +20,15 @@ class Snake(pygame.sprite.Sprite):
             image (pygame.Surface): The image of the snake.
             screen (pygame.Surface): The screen the snake is in.
             area (pygame.Rect): The area of the scene the snake is in.
+            atlas (SpriteAtlas): The pre-rendered tiles the snake is drawn with.
+            orientation (tuple): The direction the head's image faces.
+            oriented_speed (tuple): The speed the orientation was worked out for.
+            cell_rects (dict): The screen rectangle of every cell drawn so far, by cell index.
+
+        Game Attributes
+            state (GameState): The display-independent state driving the snake.
+            previous_position (tuple): The position of the snake before the last update, used for interpolation.
+            touched_cells (set): The body cells that changed since the body was last drawn.
 
         Application Attributes
             application (Application): The application object.
@@ -22,10 +36,17 @@ class Snake(pygame.sprite.Sprite):
     """
     application = None
     logger = None
+    state = None
+    previous_position = None
+    touched_cells = None
+    atlas = None
+    orientation = None
+    oriented_speed = None
+    cell_rects = None
     speed = (-2, -2) # Speed x, y
 
 
-    def __init__(self, application, screen, start_position=(0, 0)):
+    def __init__(self, application, screen, start_position=(0, 0), state=None):
         pygame.sprite.Sprite.__init__(self)
 
         self.application = application
@@ -34,12 +55,24 @@ class Snake(pygame.sprite.Sprite):
         self.logger = application.logger
         self.logger.debug("Snake initializing.")
         
-        # Initilization sprite graphic 
-        self.image = pygame.Surface((10, 10))
-        self.image.fill("white")
-        
+        # The graphics come from the atlas built by Application.setup_pygame()
+        self.atlas = getattr(application, "atlas", None)
+        if self.atlas is None:
+            self.atlas = SpriteAtlas(state.size if state is not None else (10, 10))
+
+        # The game state owns the snake's position; the rect only mirrors it for drawing
+        if state is None:
+            state = GameState(self.area.width, self.area.height, start_position, self.speed, self.atlas.size)
+        self.state = state
+        self.cell_rects = {}
+
+        self.oriented_speed = self.state.speed
+        self.orientation = self.atlas.orientation(self.oriented_speed)
+        self.image = self.atlas.surface("head", self.orientation)
         self.rect = self.image.get_rect()
-        self.rect.x, self.rect.y = start_position
+        self.rect.x, self.rect.y = self.state.position
+        self.previous_position = self.state.position
+        self.touched_cells = set(self.state.body)
 
         self.logger.debug("Snake initialized.")
         
@@ -47,23 +80,103 @@ class Snake(pygame.sprite.Sprite):
     def update(self):
         """
         Updates the snake.
+
+        The movement and screen wraparound are handled by GameState.step().
+        """
+        self.previous_position = self.state.position
+        self.state.step()
+        self.rect.x, self.rect.y = self.state.position
+
+        # The head only needs a new image when the snake was steered
+        if self.state.speed != self.oriented_speed:
+            self.oriented_speed = self.state.speed
+            orientation = self.atlas.orientation(self.oriented_speed)
+            if orientation != self.orientation:
+                self.orientation = orientation
+                self.image = self.atlas.surface("head", orientation)
+
+        # Remember which body cells changed so only those have to be redrawn
+        if self.state.entered_cell is not None:
+            self.touched_cells.add(self.state.entered_cell)
+            if self.state.vacated_cell is not None:
+                self.touched_cells.add(self.state.vacated_cell)
+
+
+    def interpolate(self, alpha):
+        """
+        Moves the snake's rect between its previous and current position for drawing.
+
+        Args:
+            alpha (float): How far between the previous and the current position to draw (0 to 1).
         """
-        new_position = self.rect.move(self.speed)
-
-        # If the snake is outside the screen, move to the other side of the screen
-        # 1. If snake.x is larger than screen.width, set snake.x to 0
-        # 2. If snake.x is smaller than 0, set snake.x to screen.width
-        # 3. If snake.y is larger than screen.height, set snake.y to 0
-        # 4. If snake.y is smaller than 0, set snake.y to screen.height
-        if not (self.area.contains(new_position)):
-            if new_position.x > self.area.width:
-                new_position.x = 0
-            elif self.rect.x < 0:
-                new_position.x = self.area.width
-
-            if new_position.y > self.area.height:
-                new_position.y = 0
-            elif new_position.y < 0:
-                new_position.y = self.area.height
-
-        self.rect = new_position
\ No newline at end of file
+        (previous_x, previous_y), (x, y) = self.previous_position, self.state.position
+
+        # Don't interpolate across the screen when the snake wrapped around
+        if abs(x - previous_x) > abs(self.state.speed[0]) or abs(y - previous_y) > abs(self.state.speed[1]):
+            self.rect.x, self.rect.y = x, y
+            return
+
+        self.rect.x = round(previous_x + (x - previous_x) * alpha)
+        self.rect.y = round(previous_y + (y - previous_y) * alpha)
+
+
+    def cell_rect(self, cell):
+        """
+        Returns the screen rectangle of a body cell.
+
+        The rectangles are cached, so don't modify them.
+
+        Args:
+            cell (int): The cell index.
+
+        Returns:
+            pygame.Rect: The rectangle of the cell.
+        """
+        rect = self.cell_rects.get(cell)
+        if rect is None:
+            col, row = self.state.body.cell_position(cell)
+            width, height = self.state.size
+            rect = self.cell_rects[cell] = pygame.Rect(col * width, row * height, width, height)
+        return rect
+
+
+    def draw_body(self, surface, background, damaged_rects=(), full=False):
+        """
+        Draws the snake's body.
+
+        Only the cells that changed since the last call, and the body cells overlapping
+        damaged_rects (for example regions where a sprite was just cleared), are redrawn.
+
+        Args:
+            surface (pygame.Surface): The surface to draw on.
+            background (pygame.Surface): The background to restore vacated cells from.
+            damaged_rects (list): Regions of the surface that have been overwritten.
+            full (bool): Whether to draw every body cell instead of only the changed ones.
+
+        Returns:
+            list: The rectangles of the surface that were changed.
+        """
+        body = self.state.body
+
+        if full:
+            cells = body.cells
+        else:
+            cells = self.touched_cells
+            query = self.state.grid.query
+            for rect in damaged_rects:
+                # Only the body cells overlapping the damaged rect need to be redrawn
+                cells.update(query(rect.left, rect.top, rect.width, rect.height, body))
+
+        # Draw every cell with one batched blit: body tiles come from the atlas sheet,
+        # vacated cells are restored from the background
+        sheet, body_area = self.atlas.sheet, self.atlas.area("body")
+        occupied = body.occupied
+        cell_rect = self.cell_rect
+        blits = [
+            (sheet, rect, body_area) if occupied[cell] else (background, rect, rect)
+            for rect, cell in ((cell_rect(cell), cell) for cell in cells)
+        ]
+        dirty_rects = surface.blits(blits) if blits else []
+
+        self.touched_cells = set()
+        return dirty_rects
@@ -0,0 +1,209 @@
+from collections import deque
+
+
+class SnakeBody:
+    """
+    The SnakeBody class represents the body of the snake on a grid of cells.
+
+    Cells are stored as integer indices (row * cols + col). The body is a deque of
+    cells (the head is at the right end) together with an occupancy map over the
+    whole board, so advancing, growing and checking for self-collision are O(1)
+    no matter how long the snake is.
+
+    Attributes:
+        cols (int): The number of columns in the grid.
+        rows (int): The number of rows in the grid.
+        cells (deque): The cells occupied by the snake, from tail to head.
+        occupied (bytearray): 1 for every cell occupied by the snake, 0 otherwise.
+        growth (int): The number of segments still to be added to the snake.
+    """
+    cols = None
+    rows = None
+    cells = None
+    occupied = None
+    growth = 0
+
+
+    def __init__(self, cols, rows, start_cell, length=1):
+        """
+        Initializes the SnakeBody object.
+
+        Args:
+            cols (int): The number of columns in the grid.
+            rows (int): The number of rows in the grid.
+            start_cell (int): The cell index of the snake's head.
+            length (int): The length the snake grows to as it moves.
+
+        Returns:
+            None
+        """
+        self.cols = cols
+        self.rows = rows
+        self.cells = deque([start_cell])
+        self.occupied = bytearray(cols * rows)
+        self.occupied[start_cell] = 1
+        self.growth = length - 1
+
+
+    def __len__(self):
+        return len(self.cells)
+
+
+    def __contains__(self, cell):
+        return self.occupied[cell] == 1
+
+
+    def __iter__(self):
+        return iter(self.cells)
+
+
+    @property
+    def head(self):
+        """
+        The cell index of the snake's head.
+        """
+        return self.cells[-1]
+
+
+    @property
+    def tail(self):
+        """
+        The cell index of the snake's tail.
+        """
+        return self.cells[0]
+
+
+    def cell_index(self, col, row):
+        """
+        Returns the index of the cell at a column and row.
+
+        Args:
+            col (int): The column of the cell.
+            row (int): The row of the cell.
+
+        Returns:
+            int: The cell index.
+        """
+        return row * self.cols + col
+
+
+    def cell_position(self, cell):
+        """
+        Returns the column and row of a cell index.
+
+        Args:
+            cell (int): The cell index.
+
+        Returns:
+            tuple: The column and row of the cell.
+        """
+        return (cell % self.cols, cell // self.cols)
+
+
+    def neighbor(self, cell, direction):
+        """
+        Returns the cell next to a cell in a direction, wrapping around the edges of the board.
+
+        Args:
+            cell (int): The cell index.
+            direction (tuple): The direction (x, y), with components -1, 0 or 1.
+
+        Returns:
+            int: The index of the neighboring cell.
+        """
+        col, row = cell % self.cols, cell // self.cols
+        return ((row + direction[1]) % self.rows) * self.cols + (col + direction[0]) % self.cols
+
+
+    def grow(self, amount=1):
+        """
+        Grows the snake by a number of segments over the next moves.
+
+        Args:
+            amount (int): The number of segments to add.
+
+        Returns:
+            None
+        """
+        self.growth += amount
+
+
+    def collides(self, cell):
+        """
+        Returns whether moving the head into a cell would collide with the body.
+
+        The tail cell doesn't count when the snake isn't growing, because the tail
+        moves out of the way in the same move.
+
+        Args:
+            cell (int): The cell the head would move into.
+
+        Returns:
+            bool: True if the snake would collide with itself.
+        """
+        if not self.occupied[cell]:
+            return False
+        return self.growth > 0 or cell != self.cells[0]
+
+
+    def advance(self, cell):
+        """
+        Moves the head of the snake into a cell.
+
+        Args:
+            cell (int): The cell the head moves into.
+
+        Returns:
+            int: The cell vacated by the tail, or None if the snake grew.
+        """
+        if self.growth > 0:
+            self.growth -= 1
+            vacated = None
+        else:
+            vacated = self.cells.popleft()
+            self.occupied[vacated] = 0
+
+        self.cells.append(cell)
+        self.occupied[cell] = 1
+        return vacated
+
+
+    def push(self, cell, vacate):
+        """
+        Moves the head of the snake into a cell like advance(), but vacates the tail or not regardless of the growth.
+
+        Args:
+            cell (int): The cell the head moves into.
+            vacate (bool): Whether the tail moves out of its cell.
+
+        Returns:
+            int: The cell vacated by the tail, or None.
+        """
+        vacated = None
+        if vacate:
+            vacated = self.cells.popleft()
+            self.occupied[vacated] = 0
+
+        self.cells.append(cell)
+        self.occupied[cell] = 1
+        return vacated
+
+
+    def retreat(self, vacated, was_occupied=0):
+        """
+        Undoes advance() or push(): moves the head back out of its cell and the tail back into the cell it vacated.
+
+        The growth isn't changed back; GameState.restore() restores it with the other scalars.
+
+        Args:
+            vacated (int): The cell advance() returned, or None if the snake grew.
+            was_occupied (int): Whether the head's cell was occupied by the body before advance() (1 or 0).
+
+        Returns:
+            None
+        """
+        cell = self.cells.pop()
+        self.occupied[cell] = was_occupied
+        if vacated is not None:
+            self.cells.appendleft(vacated)
+            self.occupied[vacated] = 1
@@ -0,0 +1,206 @@
+import numpy as np
+
+try:
+    from GameState import GameState
+    from Policies import DIRECTIONS
+except ImportError:
+    from .GameState import GameState
+    from .Policies import DIRECTIONS
+
+
+class SnakeEnv:
+    """
+    The SnakeEnv class wraps the game logic in a reset/step environment for training agents.
+
+    It follows the Gymnasium API (reset() returns (observation, info), step() returns
+    (observation, reward, terminated, truncated, info)) without depending on it.
+
+    The board observation is a (rows, cols) uint8 array allocated once. Every step only
+    rewrites the few cells that changed (the new head, the old head, the vacated tail and
+    the food), and the same read-only view over it is returned every time, so stepping
+    never copies or rebuilds the board. Copy the observation to keep it past the next step.
+
+    With pixels=True the observation is instead a (width, height, 3) view over the pixels of
+    an offscreen pygame surface, made with pygame.surfarray.pixels3d() so it isn't copied
+    either. The surface is also updated cell by cell.
+
+    Actions are indices in Policies.DIRECTIONS (left, right, up, down), or -1 to keep going
+    straight. The snake moves one cell per step. Eating food is rewarded with 1 and dying
+    with -1.
+
+    Attributes:
+        width (int): The width of the board in pixels.
+        height (int): The height of the board in pixels.
+        size (int): The size of a cell in pixels.
+        max_ticks (int): The number of steps after which an episode is truncated.
+        state (GameState): The game being played.
+        board (np.ndarray): The board observation buffer (rows, cols).
+        cells (np.ndarray): A flat view of the board, indexed by cell.
+        observation (np.ndarray): The read-only view returned as the observation.
+        surface (pygame.Surface): The offscreen surface of the pixel observation, or None.
+        pixels (np.ndarray): The pixel observation, a view of the surface's pixels, or None.
+        head (int): The cell of the head drawn on the board.
+        food (int): The cell of the food drawn on the board.
+
+    Final variables:
+        EMPTY, BODY, HEAD, FOOD (int): The values of the board cells.
+        COLORS (dict): The color of every board value in the pixel observation.
+    """
+    width = None
+    height = None
+    size = 10
+    max_ticks = None
+    state = None
+    board = None
+    cells = None
+    observation = None
+    surface = None
+    pixels = None
+    head = None
+    food = None
+
+    EMPTY = 0
+    BODY = 1
+    HEAD = 2
+    FOOD = 3
+    COLORS = {
+        EMPTY: (0, 0, 0),
+        BODY: (255, 255, 255),
+        HEAD: (160, 160, 255),
+        FOOD: (255, 0, 0),
+    }
+
+
+    def __init__(self, width=400, height=400, size=10, max_ticks=10000, pixels=False, board=None):
+        """
+        Initializes the SnakeEnv object. Call reset() to start an episode.
+
+        Args:
+            width (int): The width of the board in pixels.
+            height (int): The height of the board in pixels.
+            size (int): The size of a cell in pixels.
+            max_ticks (int): The number of steps after which an episode is truncated.
+            pixels (bool): Whether to observe the pixels of the board instead of its cells.
+            board (np.ndarray): A (rows, cols) uint8 buffer to keep the board in, for example in shared
+                memory. A new buffer is allocated by default.
+
+        Returns:
+            None
+        """
+        self.width = width
+        self.height = height
+        self.size = size
+        self.max_ticks = max_ticks
+
+        shape = (height // size, width // size)
+        if board is None:
+            board = np.zeros(shape, dtype=np.uint8)
+        elif board.shape != shape or board.dtype != np.uint8:
+            raise ValueError(f"The board buffer must be a {shape} uint8 array.")
+        self.board = board
+        self.observation = self.board.view()
+        self.observation.flags.writeable = False
+        self.cells = self.board.reshape(-1)
+
+        if pixels:
+            import pygame
+
+            # A plain offscreen surface, so no display is needed
+            self.surface = pygame.Surface((width, height))
+            self.pixels = pygame.surfarray.pixels3d(self.surface)
+            self.pixels.flags.writeable = False
+            self.observation = self.pixels
+
+
+    def reset(self, seed=None):
+        """
+        Starts a new episode.
+
+        Args:
+            seed (int): The seed used to place food (None picks a random seed).
+
+        Returns:
+            tuple: The observation and the info dictionary.
+        """
+        width, height, size = self.width, self.height, self.size
+        start = (width // size // 2 * size, height // size // 2 * size)
+        self.state = GameState(width, height, start, (size, 0), (size, size), seed)
+
+        # Only a reset redraws the whole board
+        self.board.fill(self.EMPTY)
+        if self.surface is not None:
+            self.surface.fill(self.COLORS[self.EMPTY])
+
+        self.head = self.state.body.head
+        self.food = self.state.food
+        self.set_cell(self.head, self.HEAD)
+        if self.food is not None:
+            self.set_cell(self.food, self.FOOD)
+
+        return self.observation, self.info()
+
+
+    def step(self, action):
+        """
+        Steers the snake and advances the game by one tick.
+
+        Args:
+            action (int): An index in Policies.DIRECTIONS, or -1 (or None) to keep going straight.
+
+        Returns:
+            tuple: The observation, the reward, whether the snake died, whether the episode
+                was truncated, and the info dictionary.
+        """
+        state = self.state
+        if action is not None and action >= 0:
+            state.steer(DIRECTIONS[action])
+
+        score = state.score
+        state.step()
+
+        # Only the cells that changed are redrawn
+        set_cell = self.set_cell if self.surface is not None else self.cells.__setitem__
+        if state.vacated_cell is not None and state.vacated_cell != state.entered_cell:
+            set_cell(state.vacated_cell, self.EMPTY)
+        if state.entered_cell is not None:
+            if len(state.body) > 1:
+                set_cell(self.head, self.BODY)
+            self.head = state.entered_cell
+            set_cell(self.head, self.HEAD)
+        if state.food != self.food:
+            self.food = state.food
+            if self.food is not None:
+                set_cell(self.food, self.FOOD)
+
+        terminated = not state.alive
+        reward = -1.0 if terminated else float(state.score - score)
+        truncated = not terminated and state.ticks >= self.max_ticks
+        return self.observation, reward, terminated, truncated, self.info()
+
+
+    def set_cell(self, cell, value):
+        """
+        Writes a value to a cell of the board (and of the pixels).
+
+        Args:
+            cell (int): The cell index.
+            value (int): EMPTY, BODY, HEAD or FOOD.
+
+        Returns:
+            None
+        """
+        self.cells[cell] = value
+        if self.surface is not None:
+            cols, size = self.board.shape[1], self.size
+            self.surface.fill(self.COLORS[value], (cell % cols * size, cell // cols * size, size, size))
+
+
+    def info(self):
+        """
+        Returns the info dictionary of the current step.
+
+        Returns:
+            dict: The score, length and ticks of the game.
+        """
+        state = self.state
+        return {"score": state.score, "length": len(state.body), "ticks": state.ticks}
@@ -0,0 +1,66 @@
+# The changes recorded between the versions of a GameState's board, as plain tuples (operation, arguments...)
+SET_OWNER = 0 # (SET_OWNER, cell, entity): the grid's owner of a cell
+TAKE = 1 # (TAKE, cell): FoodSpawner.take()
+UNTAKE = 2 # (UNTAKE, cell, index): FoodSpawner.untake()
+RELEASE = 3 # (RELEASE, cell): FoodSpawner.release()
+UNRELEASE = 4 # (UNRELEASE, cell): FoodSpawner.unrelease()
+ADVANCE = 5 # (ADVANCE, cell, vacate): SnakeBody.push()
+RETREAT = 6 # (RETREAT, vacated, was_occupied): SnakeBody.retreat()
+SET_FOOD = 7 # (SET_FOOD, cell): the food cell, or None
+SET_WALL = 8 # (SET_WALL, cell, present): whether a cell is in the walls
+
+
+class Snapshot:
+    """
+    The Snapshot class is a checkpoint of a GameState, returned by GameState.snapshot().
+
+    A snapshot doesn't copy the board, the body or the free cells. While snapshots are
+    taken, the state keeps a tree of versions of its board. A version is a list
+    [changes, newer]: `newer` is the next version on the way to the state's current
+    one, and `changes` are the few cell changes that turn the newer version's board
+    back into this one (the current version is [None, None]). A move adds a version
+    and links the previous one to it, so a snapshot only holds its version and the
+    state's scalars.
+
+    GameState.restore() applies the changes on the way from the current version back
+    to the snapshot's, and reverses every link it follows (storing the changes that
+    redo the move instead), so the snapshot's version becomes the current one and all
+    links lead to it again. Any number of snapshots on any number of branches stay
+    valid: restoring one costs the number of moves between it and the current version,
+    however large the board. Versions are plain lists of tuples that only point
+    towards the current one, so the ones no snapshot can reach are freed as soon as
+    the game moves on.
+
+    The food's random number generator is part of the scalars. Its state only depends
+    on the number of food cells drawn, so snapshots taken between two draws share one
+    copy of it.
+
+    Attributes:
+        version (list): The version of the board the snapshot was taken at.
+        values (tuple): The position, speed, alive, score, ticks, entered and vacated cell of the state and the growth of the snake.
+        draws (int): The number of food cells the food's random number generator had drawn.
+        rng_state (tuple): The state of the food's random number generator.
+    """
+    version = None
+    values = None
+    draws = 0
+    rng_state = None
+
+
+    def __init__(self, version, values, draws, rng_state):
+        """
+        Initializes the Snapshot object.
+
+        Args:
+            version (list): The current version of the state's board.
+            values (tuple): The scalars of the state.
+            draws (int): The number of food cells drawn.
+            rng_state (tuple): The state of the food's random number generator.
+
+        Returns:
+            None
+        """
+        self.version = version
+        self.values = values
+        self.draws = draws
+        self.rng_state = rng_state
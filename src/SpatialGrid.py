@@ -0,0 +1,120 @@
+class SpatialGrid:
+    """
+    The SpatialGrid class is a uniform grid index of the entities on a board.
+
+    Every cell holds the entity occupying it (a snake's body, the food, a wall, ...)
+    or None. Entities update the index incrementally as they move, so asking what
+    occupies a cell is a single list lookup, and asking what occupies a region only
+    visits the cells overlapping it, however many entities there are.
+
+    The grid doesn't depend on pygame, so the same index serves headless simulation
+    and the rendered Application.
+
+    Attributes:
+        cols (int): The number of columns in the grid.
+        rows (int): The number of rows in the grid.
+        cell_size (tuple): The width and height of a cell in pixels.
+        owners (list): The entity occupying every cell, or None.
+    """
+    cols = None
+    rows = None
+    cell_size = (1, 1)
+    owners = None
+
+
+    def __init__(self, cols, rows, cell_size=(1, 1)):
+        """
+        Initializes the SpatialGrid object.
+
+        Args:
+            cols (int): The number of columns in the grid.
+            rows (int): The number of rows in the grid.
+            cell_size (tuple): The width and height of a cell in pixels.
+
+        Returns:
+            None
+        """
+        self.cols = cols
+        self.rows = rows
+        self.cell_size = tuple(cell_size)
+        self.owners = [None] * (cols * rows)
+
+
+    def __getitem__(self, cell):
+        return self.owners[cell]
+
+
+    def insert(self, cell, entity):
+        """
+        Puts an entity in a cell.
+
+        Args:
+            cell (int): The cell index.
+            entity: The entity occupying the cell.
+
+        Returns:
+            None
+        """
+        self.owners[cell] = entity
+
+
+    def remove(self, cell, entity=None):
+        """
+        Empties a cell.
+
+        Args:
+            cell (int): The cell index.
+            entity: If given, the cell is only emptied while it is still occupied by this entity.
+
+        Returns:
+            None
+        """
+        if entity is None or self.owners[cell] is entity:
+            self.owners[cell] = None
+
+
+    def cells_in_rect(self, left, top, width, height):
+        """
+        Returns the cells overlapping a pixel rectangle, clipped to the board.
+
+        Args:
+            left (int): The left edge of the rectangle.
+            top (int): The top edge of the rectangle.
+            width (int): The width of the rectangle.
+            height (int): The height of the rectangle.
+
+        Returns:
+            list: The cell indices.
+        """
+        if width <= 0 or height <= 0:
+            return []
+
+        cell_width, cell_height = self.cell_size
+        first_col, last_col = max(left // cell_width, 0), min((left + width - 1) // cell_width, self.cols - 1)
+        first_row, last_row = max(top // cell_height, 0), min((top + height - 1) // cell_height, self.rows - 1)
+        return [
+            row * self.cols + col
+            for row in range(first_row, last_row + 1)
+            for col in range(first_col, last_col + 1)
+        ]
+
+
+    def query(self, left, top, width, height, entity=None):
+        """
+        Returns the occupied cells overlapping a pixel rectangle.
+
+        Args:
+            left (int): The left edge of the rectangle.
+            top (int): The top edge of the rectangle.
+            width (int): The width of the rectangle.
+            height (int): The height of the rectangle.
+            entity: If given, only the cells occupied by this entity are returned.
+
+        Returns:
+            dict: The entity occupying every occupied cell, by cell index.
+        """
+        owners = self.owners
+        return {
+            cell: owners[cell] for cell in self.cells_in_rect(left, top, width, height)
+            if owners[cell] is not None and (entity is None or owners[cell] is entity)
+        }
@@ -0,0 +1,145 @@
+import pygame
+
+
+class SpriteAtlas:
+    """
+    The SpriteAtlas class pre-renders every tile of the game into one sheet.
+
+    The sheet is converted to the display's pixel format once, so blitting a tile
+    never goes through the slow format conversion path. Tiles are keyed by type
+    ("body", "food" or "head") and orientation (the direction a head faces), and
+    can be blitted either from the sheet with their area, which lets a whole
+    snake be drawn with a single Surface.blits() call, or as subsurfaces for
+    sprite images.
+
+    Attributes:
+        size (tuple): The width and height of a tile in pixels.
+        sheet (pygame.Surface): The surface holding every tile, side by side.
+        areas (dict): The area of every tile on the sheet, by (type, orientation).
+        surfaces (dict): A subsurface of the sheet for every tile, by (type, orientation).
+
+    Final variables:
+        ORIENTATIONS (tuple): The directions a head can face.
+        COLORS (dict): The color of every type of tile.
+    """
+    size = None
+    sheet = None
+    areas = None
+    surfaces = None
+
+    ORIENTATIONS = ((1, 0), (-1, 0), (0, -1), (0, 1))
+    COLORS = {
+        "body": "white",
+        "food": "red",
+        "head": "white",
+        "eyes": "black",
+    }
+
+
+    def __init__(self, size):
+        """
+        Initializes the SpriteAtlas object and renders the tiles.
+
+        Args:
+            size (tuple): The width and height of a tile in pixels.
+
+        Returns:
+            None
+        """
+        self.size = tuple(size)
+        width, height = self.size
+
+        keys = [("body", None), ("food", None)] + [("head", orientation) for orientation in self.ORIENTATIONS]
+        self.sheet = pygame.Surface((width * len(keys), height))
+        # convert() needs a display mode, the atlas still works (just slower) without one
+        if pygame.display.get_surface() is not None:
+            self.sheet = self.sheet.convert()
+
+        self.areas = {}
+        self.surfaces = {}
+        for index, key in enumerate(keys):
+            area = pygame.Rect(index * width, 0, width, height)
+            self.draw_tile(key, area)
+            self.areas[key] = area
+            self.surfaces[key] = self.sheet.subsurface(area)
+
+
+    def draw_tile(self, key, area):
+        """
+        Draws a tile onto the sheet.
+
+        Heads get two eyes on the side they are facing, if the tile is large enough.
+
+        Args:
+            key (tuple): The type and orientation of the tile.
+            area (pygame.Rect): Where to draw the tile on the sheet.
+
+        Returns:
+            None
+        """
+        kind, orientation = key
+        self.sheet.fill(self.COLORS[kind], area)
+        # Eyes don't fit on tiles smaller than 5 pixels
+        if kind != "head" or min(area.size) < 5:
+            return
+
+        eye = max(area.width // 5, 1), max(area.height // 5, 1)
+        dx, dy = orientation
+        if dx:
+            x = area.right - 2 * eye[0] if dx > 0 else area.left + eye[0]
+            eyes = [(x, area.top + eye[1]), (x, area.bottom - 2 * eye[1])]
+        else:
+            y = area.bottom - 2 * eye[1] if dy > 0 else area.top + eye[1]
+            eyes = [(area.left + eye[0], y), (area.right - 2 * eye[0], y)]
+
+        for position in eyes:
+            self.sheet.fill(self.COLORS["eyes"], pygame.Rect(position, eye))
+
+
+    def area(self, kind, orientation=None):
+        """
+        Returns the area of a tile on the sheet.
+
+        Args:
+            kind (str): The type of the tile.
+            orientation (tuple): The direction the tile faces (only for heads).
+
+        Returns:
+            pygame.Rect: The area of the tile.
+        """
+        return self.areas[(kind, orientation)]
+
+
+    def surface(self, kind, orientation=None):
+        """
+        Returns a tile as a surface.
+
+        Args:
+            kind (str): The type of the tile.
+            orientation (tuple): The direction the tile faces (only for heads).
+
+        Returns:
+            pygame.Surface: A subsurface of the sheet.
+        """
+        return self.surfaces[(kind, orientation)]
+
+
+    @classmethod
+    def orientation(cls, speed):
+        """
+        Returns the direction a head moving at a speed faces.
+
+        Diagonal movement faces the direction of its larger component, horizontal on a tie.
+
+        Args:
+            speed (tuple): The speed (x, y).
+
+        Returns:
+            tuple: One of ORIENTATIONS.
+        """
+        x, y = speed
+        if x == 0 and y == 0:
+            return cls.ORIENTATIONS[0]
+        if abs(x) >= abs(y):
+            return (1 if x > 0 else -1, 0)
+        return (0, 1 if y > 0 else -1)
@@ -0,0 +1,303 @@
+import multiprocessing
+import os
+
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+try:
+    from SnakeEnv import SnakeEnv
+except ImportError:
+    from .SnakeEnv import SnakeEnv
+
+
+# The arrays shared between the VectorSnakeEnv and its workers: name, dtype and shape after the number of environments
+BUFFERS = (
+    ("observations", np.uint8, "board"),
+    ("actions", np.int64, ()),
+    ("rewards", np.float64, ()),
+    ("terminated", np.bool_, ()),
+    ("truncated", np.bool_, ()),
+    ("scores", np.int64, ()),
+    ("lengths", np.int64, ()),
+    ("ticks", np.int64, ()),
+)
+
+
+def create_buffers(buffer, num_envs, board_shape):
+    """
+    Lays the shared arrays out over one block of memory.
+
+    Args:
+        buffer (memoryview): The block of memory, or None to only compute its size.
+        num_envs (int): The number of environments.
+        board_shape (tuple): The shape of a board observation (rows, cols).
+
+    Returns:
+        tuple: The arrays by name (empty when buffer is None), and the size of the block in bytes.
+    """
+    arrays = {}
+    offset = 0
+    for name, dtype, shape in BUFFERS:
+        shape = (num_envs, *(board_shape if shape == "board" else shape))
+        size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        if buffer is not None:
+            arrays[name] = np.ndarray(shape, dtype, buffer, offset)
+        # Keep every array 8 byte aligned
+        offset += (size + 7) // 8 * 8
+    return arrays, offset
+
+
+def run_worker(connection, memory_name, num_envs, first, last, env_options):
+    """
+    Runs environments first to last (excluded) of a VectorSnakeEnv in a worker process.
+
+    The environments read their actions from and write their observations, rewards, flags and
+    info straight into the shared memory. Only commands and acknowledgements go over the pipe.
+
+    Args:
+        connection (multiprocessing.connection.Connection): The worker's end of the pipe.
+        memory_name (str): The name of the shared memory block.
+        num_envs (int): The total number of environments.
+        first (int): The first environment run by this worker.
+        last (int): The environment after the last one run by this worker.
+        env_options (dict): Passed on to SnakeEnv().
+
+    Returns:
+        None
+    """
+    # Workers share the parent's resource tracker, which frees the block if the parent dies without closing it
+    memory = SharedMemory(memory_name)
+
+    envs = arrays = None
+    try:
+        board_shape = SnakeEnv(**env_options).board.shape
+        arrays, _ = create_buffers(memory.buf, num_envs, board_shape)
+        envs = {index: SnakeEnv(board=arrays["observations"][index], **env_options) for index in range(first, last)}
+        seeds = {}
+
+        def write_info(index, info):
+            arrays["scores"][index] = info["score"]
+            arrays["lengths"][index] = info["length"]
+            arrays["ticks"][index] = info["ticks"]
+
+        def reset(index):
+            seed = seeds[index]
+            if seed is not None:
+                # Later episodes of an environment get seeds no other environment uses
+                seeds[index] = seed + num_envs
+            return envs[index].reset(seed)[1]
+
+        while True:
+            command, argument = connection.recv()
+            if command == "reset":
+                for index in envs:
+                    seeds[index] = None if argument is None else argument + index
+                    write_info(index, reset(index))
+            elif command == "step":
+                actions = arrays["actions"]
+                for index, env in envs.items():
+                    _, reward, terminated, truncated, info = env.step(int(actions[index]))
+                    arrays["rewards"][index] = reward
+                    arrays["terminated"][index] = terminated
+                    arrays["truncated"][index] = truncated
+                    write_info(index, info)
+                    # The info keeps describing the step that ended the episode
+                    if terminated or truncated:
+                        reset(index)
+            elif command == "close":
+                break
+            connection.send(None)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # The arrays are views of the block and have to go before it can be closed
+        envs = arrays = None
+        memory.close()
+        connection.close()
+
+
+class VectorSnakeEnv:
+    """
+    The VectorSnakeEnv class steps many SnakeEnvs in parallel worker processes.
+
+    Observations, actions, rewards, done flags and the info (score, length and ticks)
+    live in one block of shared memory that the environments in the workers write into
+    directly, so stepping never pickles an array. Only tiny commands go over the pipes.
+
+    step_async() sends the actions and returns at once, so the learner can compute
+    something else (for example the next batch of inference) while the workers simulate.
+    step_wait() waits for the workers and returns views of the shared arrays, which stay
+    valid until the next step_async(); copy them to keep them longer.
+
+    An environment whose episode ended is reset right away: the observation returned for
+    it is the first one of its next episode, while its reward, terminated and truncated
+    flags and info describe the step that ended the previous one.
+
+    Attributes:
+        num_envs (int): The number of environments.
+        workers (int): The number of worker processes.
+        memory (SharedMemory): The block of shared memory holding the arrays.
+        arrays (dict): The shared arrays, by name (see BUFFERS).
+        connections (list): The parent's end of the pipe to every worker.
+        processes (list): The worker processes.
+        waiting (bool): Whether a step was sent and not waited for yet.
+    """
+    num_envs = None
+    workers = None
+    memory = None
+    arrays = None
+    connections = None
+    processes = None
+    waiting = False
+
+
+    def __init__(self, num_envs, workers=None, context=None, **env_options):
+        """
+        Initializes the VectorSnakeEnv object and starts the workers.
+
+        Args:
+            num_envs (int): The number of environments.
+            workers (int): The number of worker processes (None uses one per core, at most one per environment).
+            context (str): The multiprocessing start method (None uses the default).
+            env_options: Passed on to SnakeEnv() (width, height, size, max_ticks).
+
+        Returns:
+            None
+        """
+        if env_options.get("pixels"):
+            raise ValueError("VectorSnakeEnv only supports board observations.")
+
+        self.num_envs = num_envs
+        self.workers = min(workers or os.cpu_count() or 1, num_envs)
+
+        board_shape = SnakeEnv(**env_options).board.shape
+        _, size = create_buffers(None, num_envs, board_shape)
+        self.memory = SharedMemory(create=True, size=size)
+        self.arrays, _ = create_buffers(self.memory.buf, num_envs, board_shape)
+
+        context = multiprocessing.get_context(context)
+        self.connections = []
+        self.processes = []
+        bounds = np.linspace(0, num_envs, self.workers + 1).astype(int)
+        for first, last in zip(bounds[:-1], bounds[1:]):
+            parent_connection, child_connection = context.Pipe()
+            process = context.Process(target=run_worker, daemon=True, args=(
+                child_connection, self.memory.name, num_envs, int(first), int(last), env_options))
+            process.start()
+            child_connection.close()
+            self.connections.append(parent_connection)
+            self.processes.append(process)
+
+
+    def __len__(self):
+        return self.num_envs
+
+
+    def send(self, command, argument=None):
+        for connection in self.connections:
+            connection.send((command, argument))
+
+
+    def wait(self):
+        for connection in self.connections:
+            connection.recv()
+
+
+    def info(self):
+        """
+        Returns the info of every environment.
+
+        Returns:
+            dict: The score, length and ticks of every environment's game.
+        """
+        return {"score": self.arrays["scores"], "length": self.arrays["lengths"], "ticks": self.arrays["ticks"]}
+
+
+    def reset(self, seed=None):
+        """
+        Starts a new episode in every environment.
+
+        Args:
+            seed (int): Environment i uses seed + i (None picks random seeds).
+
+        Returns:
+            tuple: The observations and the info.
+        """
+        self.send("reset", seed)
+        self.wait()
+        return self.arrays["observations"], self.info()
+
+
+    def step_async(self, actions):
+        """
+        Starts stepping every environment without waiting for the result.
+
+        Args:
+            actions (np.ndarray): An action for every environment (see SnakeEnv.step()).
+
+        Returns:
+            None
+        """
+        self.arrays["actions"][:] = actions
+        self.send("step")
+        self.waiting = True
+
+
+    def step_wait(self):
+        """
+        Waits for the step started by step_async().
+
+        Returns:
+            tuple: The observations, rewards, terminated flags, truncated flags and info.
+        """
+        self.wait()
+        self.waiting = False
+        arrays = self.arrays
+        return arrays["observations"], arrays["rewards"], arrays["terminated"], arrays["truncated"], self.info()
+
+
+    def step(self, actions):
+        """
+        Steps every environment and waits for the result.
+
+        Args:
+            actions (np.ndarray): An action for every environment (see SnakeEnv.step()).
+
+        Returns:
+            tuple: The observations, rewards, terminated flags, truncated flags and info.
+        """
+        self.step_async(actions)
+        return self.step_wait()
+
+
+    def close(self):
+        """
+        Stops the workers and frees the shared memory.
+
+        Returns:
+            None
+        """
+        if self.memory is None:
+            return
+
+        if self.waiting:
+            self.wait()
+        self.send("close")
+        for process in self.processes:
+            process.join()
+        for connection in self.connections:
+            connection.close()
+
+        self.arrays = None
+        self.memory.close()
+        self.memory.unlink()
+        self.memory = None
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
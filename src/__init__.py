@@ -1 +1,7 @@
-from .Application import Application
\ No newline at end of file
+def __getattr__(name):
+    # Import Application lazily, so importing the package (for example to run src.selfplay)
+    # doesn't load the game and pygame
+    if name == "Application":
+        from .Application import Application
+        return Application
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,31 +1,58 @@
 from argparse import ArgumentParser
 
-from Application import Application
+try:
+    from Configuration import CONFIGURATION_INDEX, OPTIONS, ConfigurationError
+except ImportError:
+    from .Configuration import CONFIGURATION_INDEX, OPTIONS, ConfigurationError
 
 
 def setup_argparse():
     """
-    Sets up the command line argument parser.
+    Sets up the command line argument parser, with a flag for every option in Configuration.OPTIONS.
 
     Returns:
-        None
+        ArgumentParser: The parser.
     """
     parser = ArgumentParser()
-    parser.add_argument("--log-level", dest="log_level", choices=["debug", "info", "warning", "error", "critical"], help="The log level to be set.")
-    parser.add_argument("--width", dest="width", type=int, help="The width of the game window.")
-    parser.add_argument("--height", dest="height", type=int, help="The height of the game window.")
     parser.add_argument("--config-file", dest="configuration_file", help="The path to the configuration file.")
-    parser.add_argument("--log-dir", dest="log_directory", help="The directory to store log files.")
-    parser.add_argument("--log-file", dest="log_file", help="The name of the log file.")
-    
-    return parser.parse_args()
+    CONFIGURATION_INDEX.add_argument(parser)
+    for option in OPTIONS:
+        option.add_argument(parser)
+
+    return parser
+
+
+def main():
+    """
+    Runs the Snake Game.
+
+    The Application (and with it pygame) is only imported once the command line arguments
+    are valid, so --help and argument errors return immediately. Invalid options (from the
+    command line, the environment or the configuration file) are reported like argument
+    errors, with a usage message and exit status 2.
+
+    Returns:
+        None
+    """
+    parser = setup_argparse()
+    args = parser.parse_args()
+
+    try:
+        from Application import Application
+    except ImportError:
+        from .Application import Application
+
+    try:
+        app = Application(args)
+    except ConfigurationError as error:
+        parser.error(str(error))
+    app.start()
+    app.loop()
+    app.stop()
 
 
 if __name__ == "__main__":
     """
     This is the main entry point of the Snake Game.
     """
-    args = setup_argparse()
-    app = Application(args)
-    app.start()
-    app.loop()
\ No newline at end of file
+    main()
@@ -0,0 +1,182 @@
+import importlib
+import json
+import os
+import random
+import sys
+import time
+
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    import Policies
+    from GameState import GameState
+    from ResultsStore import ResultsStore
+except ImportError:
+    from . import Policies
+    from .GameState import GameState
+    from .ResultsStore import ResultsStore
+
+
+def load_policy(name):
+    """
+    Loads a policy by name.
+
+    Args:
+        name (str): Either the name of a policy in Policies (for example "greedy"),
+            or "module:function" for a policy defined elsewhere.
+
+    Returns:
+        callable: The policy.
+    """
+    if ":" in name:
+        module_name, function_name = name.split(":", 1)
+        return getattr(importlib.import_module(module_name), function_name)
+    return getattr(Policies, f"{name}_policy")
+
+
+def play_game(seed, policy, width=400, height=400, size=10, max_ticks=100000):
+    """
+    Plays one game without a display.
+
+    The snake moves one cell per tick, steered by the policy before every tick.
+
+    Args:
+        seed (int): The seed of the game (used to place food and for the policy's random numbers).
+        policy (callable): The policy steering the snake.
+        width (int): The width of the board in pixels.
+        height (int): The height of the board in pixels.
+        size (int): The size of a cell in pixels.
+        max_ticks (int): The number of ticks after which the game is stopped.
+
+    Returns:
+        dict: The seed, score, length, ticks and wall time (seconds) of the game.
+    """
+    start_time = time.perf_counter()
+    state = GameState(width, height, (width // size // 2 * size, height // size // 2 * size), (size, 0), (size, size), seed)
+    rng = random.Random(f"policy-{seed}")
+
+    step = state.step
+    steer = state.steer
+    while state.alive and state.ticks < max_ticks:
+        direction = policy(state, rng)
+        if direction is not None:
+            steer(direction)
+        step()
+
+    return {
+        "seed": seed,
+        "score": state.score,
+        "length": len(state.body),
+        "ticks": state.ticks,
+        "wall_time": time.perf_counter() - start_time,
+    }
+
+
+def play_games(seeds, policy_name, **game_options):
+    """
+    Plays a chunk of games in a worker process.
+
+    Args:
+        seeds (list): The seeds of the games to play.
+        policy_name (str): The name of the policy (see load_policy()).
+        game_options: Passed on to play_game().
+
+    Returns:
+        list: The results of the games.
+    """
+    policy = load_policy(policy_name)
+    return [play_game(seed, policy, **game_options) for seed in seeds]
+
+
+def run(games, workers=None, chunk_size=16, seed=0, policy_name="greedy", **game_options):
+    """
+    Plays games across a pool of worker processes.
+
+    Game i is played with the seed `seed + i`, so the results don't depend on the number of workers.
+
+    Args:
+        games (int): The number of games to play.
+        workers (int): The number of worker processes (None uses every core).
+        chunk_size (int): The number of games sent to a worker at a time.
+        seed (int): The seed of the first game.
+        policy_name (str): The name of the policy (see load_policy()).
+        game_options: Passed on to play_game().
+
+    Yields:
+        list: The results of a chunk of games, as soon as the chunk is finished.
+    """
+    seeds = list(range(seed, seed + games))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(play_games, seeds[index:index + chunk_size], policy_name, **game_options)
+            for index in range(0, games, chunk_size)
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def setup_argparse():
+    """
+    Sets up the command line argument parser.
+
+    Returns:
+        argparse.Namespace: The parsed command line arguments.
+    """
+    parser = ArgumentParser(description="Play many headless games in parallel and stream their results as JSON Lines.")
+    parser.add_argument("--games", type=int, default=1000, help="The number of games to play.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="The number of worker processes.")
+    parser.add_argument("--chunk-size", dest="chunk_size", type=int, default=16, help="The number of games sent to a worker at a time.")
+    parser.add_argument("--seed", type=int, default=0, help="The seed of the first game.")
+    parser.add_argument("--policy", default="greedy", help='The policy: "greedy", "random" or "module:function".')
+    parser.add_argument("--width", type=int, default=400, help="The width of the board in pixels.")
+    parser.add_argument("--height", type=int, default=400, help="The height of the board in pixels.")
+    parser.add_argument("--max-ticks", dest="max_ticks", type=int, default=100000, help="The number of ticks after which a game is stopped.")
+    parser.add_argument("--output", help="Write the results to this file instead of stdout.")
+    parser.add_argument("--database", help="Store the results in this SQLite database (see scripts/QueryResults.py), instead of writing them to stdout.")
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    """
+    Runs the self-play games and writes one JSON line per game, or stores the games in a database.
+    """
+    args = setup_argparse()
+    load_policy(args.policy)
+
+    output = None
+    if args.output:
+        output = open(args.output, "w")
+    elif not args.database:
+        output = sys.stdout
+
+    # The workers send their results back here, so this process is the database's only writer
+    store = config_hash = None
+    if args.database:
+        store = ResultsStore(args.database)
+        config_hash = store.register_configuration({"policy": args.policy, "width": args.width, "height": args.height,
+                                                    "max_ticks": args.max_ticks})
+
+    start_time = time.perf_counter()
+    played = 0
+
+    try:
+        for results in run(args.games, args.workers, args.chunk_size, args.seed, args.policy,
+                           width=args.width, height=args.height, max_ticks=args.max_ticks):
+            if output is not None:
+                output.write("".join(json.dumps(result) + "\n" for result in results))
+                output.flush()
+            if store is not None:
+                for result in results:
+                    store.record(config_hash, result["seed"], result["score"], result["length"], result["ticks"],
+                                 result["wall_time"])
+            played += len(results)
+    finally:
+        if output is not None and output is not sys.stdout:
+            output.close()
+        if store is not None:
+            store.close()
+
+    elapsed = time.perf_counter() - start_time
+    print(f"Played {played} games with {args.workers} workers in {elapsed:.2f}s ({played / elapsed:.1f} games/s).", file=sys.stderr)
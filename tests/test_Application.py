@@ -3,14 +3,18 @@ import unittest
 import json
 import pygame
 import os
+import subprocess
+import shutil
+import sys
+import tempfile
 
-from json import JSONDecodeError
-# Not sure where to use MagicMock, but it's freaking cool and I want to use it!
-# https://docs.python.org/3/library/unittest.mock.html#unittest.mock.MagicMock
-from unittest.mock import MagicMock
+# Allow the tests to run on machines without a display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
 
 from src.Application import Application
-import os
+from src.ResultsStore import ResultsReader
+from src.Configuration import OPTIONS, ConfigurationError
+from src.Replay import ReplayRecorder
 
 
 class TestApplication(unittest.TestCase):
@@ -37,9 +41,6 @@ class TestApplication(unittest.TestCase):
     def test_load_invalid_configuration_file(self):
         """
         Test that the configuration file is not loaded if it contains invalid data.
-
-        TODO:
-            - Fix Application.load_configuration_file() so that this test passes.
         """
         # Set up a mock configuration file that contains invalid data
         mock_config_file = f"""{self.configuration_file_dir}/invalid_config.json"""
@@ -59,12 +60,13 @@ class TestApplication(unittest.TestCase):
             json.dump(invalid_configuration, f, indent=4)
 
         # Load the configuration file
+        width = self.application.width
         self.application.configuration_file = mock_config_file
-        self.assertRaises(AttributeError, self.application.load_configuration_file)
+        self.assertRaises(ConfigurationError, self.application.load_configuration_file)
 
-        # TODO
-        #  - Assert that the configuration file was not loaded successfully
-        
+        # Assert that the configuration file was not loaded successfully
+        self.assertEqual(self.application.width, width)
+        self.assertEqual(self.application.log_level_name, "debug")
 
 
     def test_load_valid_configuration_file(self):
@@ -135,7 +137,345 @@ class TestApplication(unittest.TestCase):
         self.assertEqual(pygame.display.get_caption(), ("Snake Game", "Snake Game"))
 
 
+    def test_options_are_attributes(self):
+        """
+        Test that every option of the schema is an attribute of the Application and documented in its docstring.
+        """
+        for option in OPTIONS:
+            self.assertIn(option.name, vars(Application))
+            self.assertIn(option.describe(), Application.__doc__)
+        self.assertNotIn("{options}", Application.__doc__)
+
+        # Docstrings are stripped under -OO
+        subprocess.run([sys.executable, "-OO", "-c", "import src.Application"], check=True,
+                       cwd=os.path.join(os.path.dirname(__file__), ".."))
+
+
+    def test_configuration_priority(self):
+        """
+        Test that command line arguments override environmental variables, which override the configuration file.
+        """
+        mock_config_file = f"""{self.configuration_file_dir}/rates_config.json"""
+        os.makedirs(os.path.dirname(mock_config_file), exist_ok=True)
+
+        with open(mock_config_file, "w") as f:
+            json.dump({"log_level": "info", "logic_rate": 30, "render_rate": 20, "width": 640}, f, indent=4)
+
+        os.environ["LOGIC_RATE"] = "120"
+        os.environ["RENDER_RATE"] = "50"
+        try:
+            application = Application({"configuration_file": mock_config_file, "render_rate": 144, "headless": True})
+        finally:
+            del os.environ["LOGIC_RATE"]
+            del os.environ["RENDER_RATE"]
+
+        self.assertEqual(application.width, 640)
+        self.assertEqual(application.logic_rate, 120)
+        self.assertEqual(application.render_rate, 144)
+
+
+    def test_invalid_environmental_variable(self):
+        os.environ["LOGIC_RATE"] = "fast"
+        try:
+            self.assertRaises(ConfigurationError, Application, {"headless": True})
+        finally:
+            del os.environ["LOGIC_RATE"]
+
+
+    def test_reload_configuration(self):
+        """
+        Test that a changed configuration file is applied to the running game.
+        """
+        mock_config_file = f"""{self.configuration_file_dir}/reload_config.json"""
+        os.makedirs(os.path.dirname(mock_config_file), exist_ok=True)
+
+        with open(mock_config_file, "w") as f:
+            json.dump({"logic_rate": 30, "width": 400, "height": 300}, f)
+
+        application = Application({"configuration_file": mock_config_file})
+        self.assertEqual(application.timestep.logic_rate, 30)
+
+        with open(mock_config_file, "w") as f:
+            json.dump({"logic_rate": 90, "render_rate": 30, "width": 640, "height": 480}, f)
+        os.utime(mock_config_file, ns=(0, 0))
+
+        changes = application.reload_configuration()
+        self.assertEqual(changes, {"logic_rate", "render_rate", "width", "height"})
+        self.assertEqual(application.timestep.logic_rate, 90)
+        self.assertEqual(application.timestep.render_rate, 30)
+        self.assertEqual(application.screen.get_size(), (640, 480))
+        self.assertEqual((application.state.width, application.state.height), (640, 480))
+
+        # An invalid file is ignored and the running configuration is kept
+        with open(mock_config_file, "w") as f:
+            json.dump({"logic_rate": -1}, f)
+
+        self.assertEqual(application.reload_configuration(), set())
+        self.assertEqual(application.logic_rate, 90)
+        self.assertEqual(application.timestep.logic_rate, 90)
+
+        # Options that need a restart keep their running values
+        with open(mock_config_file, "w") as f:
+            json.dump({"logic_rate": 45, "render_rate": 30, "width": 640, "height": 480, "render_mode": "scaled",
+                       "snakes": 20}, f)
+
+        state = application.state
+        self.assertEqual(application.reload_configuration(), {"logic_rate", "render_mode", "snakes"})
+        self.assertEqual(application.logic_rate, 45)
+        self.assertEqual((application.render_mode, application.snakes), ("dirty", 1))
+        self.assertEqual(application.configuration.render_mode, "dirty")
+        self.assertIs(application.state, state)
+        self.assertIsNone(application.mode)
+
+
+    def test_render_dirty_rects(self):
+        """
+        Test that the dirty rect renderer only pushes the regions the snake moved through.
+        """
+        self.application.render_mode = "dirty"
+        self.application.setup_pygame()
+        self.application.render()
+        self.application.all_sprites.update()
+        self.application.render()
+
+        # The previous and the current 10x10 snake rects overlap and are merged,
+        # the body moved from one 10x10 cell into another and the food was redrawn
+        self.assertEqual(self.application.pixels_pushed, 12 * 12 + 2 * 10 * 10 + 10 * 10)
+        self.assertEqual(self.application.frames_rendered, 2)
+
+
+    def test_render_full_frames(self):
+        self.application.render_mode = "full"
+        self.application.setup_pygame()
+        self.application.render()
+
+        self.assertEqual(self.application.pixels_pushed, self.application.width * self.application.height)
+
+
+    def test_render_scaled(self):
+        """
+        Test that the board is drawn offscreen at the render scale and scaled to fill the window.
+        """
+        application = Application({"render_mode": "scaled", "render_scale": 2, "width": 400, "height": 300})
+        state = application.state
+        application.render()
+
+        self.assertEqual(application.scaled_renderer.surface.get_size(), (80, 60))
+        self.assertEqual(application.pixels_pushed, 400 * 300)
+        # A cell of the board covers 10x10 pixels of the window
+        food_x, food_y = state.food % state.cols * 10, state.food // state.cols * 10
+        self.assertEqual(application.screen.get_at((food_x + 5, food_y + 5)), pygame.Color("red"))
+        head_x, head_y = state.body.head % state.cols * 10, state.body.head // state.cols * 10
+        self.assertEqual(application.screen.get_at((head_x + 5, head_y + 5)), pygame.Color("white"))
+
+
+    def test_render_scaled_display(self):
+        application = Application({"render_mode": "scaled", "render_scale": 1, "display_scaled": True,
+                                   "width": 400, "height": 300})
+        application.render()
+        renderer = application.scaled_renderer
+        self.assertEqual(renderer.surface.get_size(), (40, 30))
+
+        # Displays without a renderer that can scale fall back to scaling in software
+        if renderer.display_scaled:
+            self.assertIs(renderer.surface, application.screen)
+        else:
+            self.assertEqual(application.screen.get_size(), (400, 300))
+
+
+    def test_adaptive_resolution(self):
+        """
+        Test that the render scale is lowered while frames take longer than the render rate allows.
+        """
+        application = Application({"render_mode": "scaled", "adaptive_resolution": True, "width": 400, "height": 300})
+        renderer = application.scaled_renderer
+        self.assertEqual(renderer.scale, 10)
+
+        while not renderer.adapt(1.0):
+            pass
+        application.render()
+
+        self.assertEqual(renderer.scale, 9)
+        self.assertEqual(renderer.surface.get_size(), (40 * 9, 30 * 9))
+
+        # Frames as slow at the lower scale: back to the scale above it, and no lower again
+        while not renderer.adapt(1.0):
+            pass
+        self.assertEqual(renderer.scale, 10)
+        self.assertEqual(renderer.scaler.min_scale, 10)
+
+
+    def test_input_latency_test(self):
+        """
+        Test that the input latency test mode measures the latency of synthetic key presses and quits.
+        """
+        application = Application({"input_latency_test": 4, "record": False, "watch_configuration": False, "seed": 1})
+        application.start()
+        application.loop()
+
+        self.assertFalse(application.running)
+        self.assertEqual(application.input.received, 4)
+        self.assertGreaterEqual(application.profiler.counts["input"], 1)
+        self.assertGreater(application.profiler.percentiles("input")["p50"], 0)
+
+
+    def test_render_profile_overlay(self):
+        self.application.setup_pygame()
+        self.application.profile_overlay = True
+        self.application.render(profiling=True)
+        self.application.render(profiling=True)
+
+        self.assertIsNotNone(self.application.overlay.rect)
+        self.assertEqual(set(self.application.profiler.samples), {"clear", "draw", "display"})
+
+        # Hiding the overlay restores the background under it
+        self.application.profile_overlay = False
+        self.application.render()
+        self.assertIsNone(self.application.overlay.rect)
+
+
+    def test_headless_loop(self):
+        """
+        Test that the game runs without a display in headless mode.
+        """
+        application = Application({"headless": True, "ticks": 1000})
+
+        self.assertIsNone(application.screen)
+        application.start()
+        application.loop()
+
+        self.assertFalse(application.running)
+        self.assertEqual(application.state.ticks, 1000)
+
+
+    def test_headless_autopilot(self):
+        """
+        Test that the autopilot plays a headless game without dying, memoizing its cycle in the cache directory.
+        """
+        cache_directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_directory)
+        application = Application({"headless": True, "ticks": 5000, "width": 100, "height": 100, "seed": 1,
+                                   "autopilot": True, "cache_directory": cache_directory})
+        application.start()
+        application.loop()
+
+        self.assertTrue(application.state.alive)
+        self.assertEqual(application.state.ticks, 5000)
+        self.assertGreater(application.state.score, 0)
+        self.assertTrue(os.path.exists(os.path.join(cache_directory, "hamiltonian-10x10.bin")))
+
+
+    def test_configuration_matrix_entry(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "matrix.jsonl")
+        with open(path, "w") as f:
+            for width in (200, 300, 400):
+                f.write(json.dumps({"width": width, "height": 100, "headless": True}) + "\n")
+
+        application = Application({"configuration_file": path, "configuration_index": 1})
+        self.assertEqual((application.width, application.height, application.configuration_index), (300, 100, 1))
+
+        with self.assertRaises(ConfigurationError):
+            Application({"configuration_file": path, "configuration_index": 3})
+
+
+    def test_results_database(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "results.db")
+        application = Application({"headless": True, "ticks": 100, "seed": 1, "results_database": path})
+        for seed in (1, 2):
+            application.seed = seed
+            application.setup_game()
+            application.start()
+            application.loop()
+        store = application.results_store
+        application.stop()
+        self.assertIsNone(application.results_store)
+        self.assertIsNone(store.connection)
+
+        with ResultsReader(path) as store:
+            games = store.leaderboard()
+            summary = store.summary()
+        self.assertEqual(sorted(game["seed"] for game in games), [1, 2])
+        self.assertEqual(games[0]["ticks"], 100)
+        self.assertEqual(len(summary), 1)
+        self.assertEqual(summary[0]["configuration"]["width"], application.width)
+
+
+    def test_headless_does_not_load_pygame(self):
+        """
+        Test that headless games never import pygame.
+        """
+        code = ("import sys; from src.Application import Application; "
+                "Application({'headless': True, 'ticks': 10, 'log_level': 'error'}).loop(); "
+                "print('pygame' in sys.modules)")
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                cwd=os.path.join(os.path.dirname(__file__), ".."))
+
+        self.assertEqual(result.stdout.strip(), "False")
+
+
+    def test_arena(self):
+        """
+        Test that an arena with many snakes runs headless and on screen.
+        """
+        application = Application({"snakes": 30, "headless": True, "ticks": 100, "seed": 1})
+        application.start()
+        application.loop()
+        self.assertIsNone(application.state)
+        self.assertEqual(application.arena.ticks, 100)
+
+        application = Application({"snakes": 30, "seed": 1})
+        application.steer((0, 1))
+        self.assertEqual(application.arena.actions()[0], 3)
+
+        application.mode.render()
+        self.assertEqual(application.pixels_pushed, application.width * application.height)
+        application.arena.step()
+        application.mode.render()
+        self.assertLess(application.pixels_pushed, application.width * application.height / 10)
+
+
+    def test_serve(self):
+        """
+        Test that serving the game runs it headless at the logic rate.
+        """
+        application = Application({"serve_port": 0, "ticks": 20, "logic_rate": 1000, "seed": 1})
+        self.assertTrue(application.headless)
+        application.start()
+        application.loop()
+
+        self.assertFalse(application.running)
+        self.assertEqual(application.state.ticks, 20)
+        self.assertNotEqual(application.server.port, 0)
+
+
+    def test_replay(self):
+        """
+        Test that a recorded game is re-simulated headless.
+        """
+        replay_file = f"""{self.configuration_file_dir}/game.replay"""
+        os.makedirs(os.path.dirname(replay_file), exist_ok=True)
+        self.files_to_delete.append(replay_file)
+
+        state = self.application.state
+        self.application.recorder = ReplayRecorder(replay_file, state)
+        for direction in [(1, 0), (0, 1), (-1, 0)]:
+            state.run(20)
+            self.application.steer(direction)
+        state.run(20)
+        self.application.recorder.close(state)
+
+        application = Application({"replay_file": replay_file})
+        self.assertTrue(application.headless)
+        application.start()
+        application.loop()
+
+        self.assertEqual(application.state.position, state.position)
+        self.assertEqual(application.state.ticks, state.ticks)
+
+
 if __name__ == "__main__":
     unittest.main()
-
-    
\ No newline at end of file
@@ -0,0 +1,223 @@
+import unittest
+
+import numpy as np
+
+from src.Arena import EMPTY, FOOD, WALL, Arena, greedy_controller, random_controller
+
+
+class TestArena(unittest.TestCase):
+    def setUp(self):
+        self.arena = Arena(40, 30, 50, seed=1)
+
+
+    def place(self, snake, cells, direction):
+        """
+        Moves a snake onto a straight line of cells (tail first) heading in a direction.
+        """
+        arena = self.arena
+        arena.grid[arena.body(snake)] = EMPTY
+        arena.lengths[snake] = len(cells)
+        arena.heads[snake] = len(cells) - 1
+        arena.pool[arena.offsets[snake]:arena.offsets[snake] + len(cells)] = cells
+        arena.grid[cells] = snake + 1
+        arena.directions[snake] = direction
+
+
+    def clear(self):
+        """
+        Removes every snake but the first two and all food from the board.
+        """
+        arena = self.arena
+        arena.alive[2:] = False
+        arena.grid[:] = EMPTY
+        for snake in range(2):
+            arena.grid[arena.body(snake)] = snake + 1
+
+
+    def assert_grid_matches_bodies(self):
+        arena = self.arena
+        expected = np.zeros_like(arena.grid)
+        expected[arena.grid == FOOD] = FOOD
+        expected[arena.grid == WALL] = WALL
+        for snake in np.flatnonzero(arena.alive):
+            expected[arena.body(snake)] = snake + 1
+        np.testing.assert_array_equal(arena.grid, expected)
+
+
+    def test_initialization(self):
+        self.assertEqual(len(self.arena), 50)
+        self.assertEqual(np.count_nonzero(self.arena.grid > 0), 50)
+        self.assertEqual(np.count_nonzero(self.arena.grid == FOOD), 50)
+        self.assertRaises(ValueError, Arena, 4, 4, 10)
+
+
+    def test_step_moves_every_snake(self):
+        heads = self.arena.head_cells
+        self.arena.step()
+
+        alive = self.arena.alive
+        expected = self.arena.neighbors(heads, self.arena.directions)
+        np.testing.assert_array_equal(self.arena.head_cells[alive], expected[alive])
+        self.assert_grid_matches_bodies()
+
+
+    def test_eating_grows_the_snake(self):
+        self.clear()
+        self.place(0, [41, 42], 1)
+        self.arena.grid[43] = FOOD
+
+        self.arena.step()
+        self.assertEqual(self.arena.scores[0], 1)
+        self.assertEqual(np.count_nonzero(self.arena.grid == FOOD), 1)
+
+        self.arena.step()
+        self.assertEqual(self.arena.lengths[0], 3)
+        self.assertEqual(list(self.arena.body(0)), [44, 43, 42])
+
+
+    def test_collisions(self):
+        self.clear()
+        # Snake 1 runs into the side of snake 0
+        self.place(0, [122, 162, 202], 3)
+        self.place(1, [160, 161], 1)
+        died = self.arena.step()
+
+        self.assertEqual(list(died), [1])
+        self.assertTrue(self.arena.alive[0])
+        self.assert_grid_matches_bodies()
+
+
+    def test_head_on_collision(self):
+        self.clear()
+        self.place(0, [401, 402], 1)
+        self.place(1, [405, 404], 0)
+        self.arena.step()
+
+        self.assertFalse(self.arena.alive[:2].any())
+        self.assertFalse((self.arena.grid > 0).any())
+
+
+    def test_head_swap(self):
+        self.clear()
+        # Two snakes of one segment moving into each other's cell can't pass through each other
+        self.place(0, [401], 1)
+        self.place(1, [402], 0)
+        died = self.arena.step()
+
+        self.assertEqual(list(died), [0, 1])
+        self.assertFalse((self.arena.grid > 0).any())
+
+
+    def test_following_a_tail(self):
+        self.clear()
+        # Snake 1 moves into the cell snake 0's tail leaves in the same tick
+        self.place(0, [301, 302, 303], 1)
+        self.place(1, [299, 300], 1)
+        self.arena.step()
+
+        self.assertTrue(self.arena.alive[:2].all())
+        self.assert_grid_matches_bodies()
+
+
+    def test_walls(self):
+        self.clear()
+        self.place(0, [41, 42], 1)
+        self.arena.add_walls([43])
+        self.arena.step()
+
+        self.assertFalse(self.arena.alive[0])
+        self.assertEqual(self.arena.grid[43], WALL)
+
+
+    def test_steer_does_not_reverse(self):
+        self.clear()
+        self.place(0, [41, 42], 1)
+        self.place(1, [400], 1)
+        actions = np.full(50, -1)
+        actions[:2] = 0
+        self.arena.steer(actions)
+
+        self.assertEqual(list(self.arena.directions[:2]), [1, 0])
+
+
+    def test_controllers(self):
+        for controller in (random_controller, greedy_controller):
+            arena = Arena(40, 30, 50, seed=2)
+            arena.controllers = [(controller, np.arange(50))]
+            arena.run(200)
+
+            self.assertEqual(arena.ticks, 200)
+            self.assertGreater(arena.scores.sum(), 0)
+            self.arena = arena
+            self.assert_grid_matches_bodies()
+
+
+    def test_snakes_grow_past_the_initial_capacity(self):
+        self.clear()
+        self.place(0, [41, 42], 1)
+        self.arena.growth[0] = 30
+        self.arena.alive[1] = False
+        self.arena.grid[self.arena.body(1)] = EMPTY
+        for _ in range(30):
+            self.arena.step()
+
+        self.assertEqual(self.arena.lengths[0], 32)
+        self.assertEqual(self.arena.capacities[0], 32)
+        self.assertEqual(list(self.arena.body(0)), list(range(72, 40, -1)))
+        self.assert_grid_matches_bodies()
+
+
+    def test_capacity_grows_per_snake(self):
+        arena = Arena(40, 30, 50, seed=2)
+        arena.controllers = [(greedy_controller, np.arange(50))]
+        arena.growth[0] = 200
+        arena.run(300)
+        self.arena = arena
+
+        # Only the snakes that outgrew their ring buffer got a larger one
+        self.assertGreater(arena.capacities.max(), Arena.INITIAL_CAPACITY)
+        self.assertTrue((arena.capacities >= arena.lengths).all())
+        self.assertTrue((arena.capacities[arena.lengths <= Arena.INITIAL_CAPACITY] == Arena.INITIAL_CAPACITY).all())
+        self.assertLess(arena.used, 4 * (arena.capacities.sum()))
+        self.assert_grid_matches_bodies()
+
+
+    def test_nearest_food(self):
+        arena = Arena(100, 80, 20, food=200, seed=3)
+        food = np.flatnonzero(arena.grid == FOOD)
+        cells = arena.rng.choice(len(arena.grid), 300)
+        nearest = arena.nearest_food(cells)
+
+        self.assertTrue((arena.grid[nearest] == FOOD).all())
+        # The closest food of the first bucket ring holding any: within a couple of buckets of the closest
+        best = arena.distances(cells[:, None], food[None, :]).min(axis=1)
+        self.assertTrue((arena.distances(cells, nearest) <= best + 4 * int(np.sqrt(100 * 80 / 200))).all())
+
+        arena.grid[food] = EMPTY
+        self.assertEqual(list(arena.nearest_food(cells[:3])), [-1, -1, -1])
+
+
+    def test_greedy_controller_keeps_its_targets(self):
+        arena = Arena(40, 30, 50, seed=2)
+        snakes = np.arange(50)
+        greedy_controller(arena, snakes, arena.rng)
+        targets = arena.targets.copy()
+        self.assertTrue((arena.grid[targets] == FOOD).all())
+
+        arena.grid[targets[0]] = EMPTY
+        greedy_controller(arena, snakes, arena.rng)
+        self.assertNotEqual(arena.targets[0], targets[0])
+        kept = targets != targets[0]
+        np.testing.assert_array_equal(arena.targets[kept], targets[kept])
+
+
+    def test_take_dirty(self):
+        self.assertEqual(len(self.arena.take_dirty()), 40 * 30)
+        self.assertEqual(len(self.arena.take_dirty()), 0)
+
+        self.arena.step()
+        self.assertGreater(len(self.arena.take_dirty()), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import io
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+
+from src.AsyncLogHandler import AsyncLogHandler
+
+
+class TestAsyncLogHandler(unittest.TestCase):
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.target = logging.StreamHandler(self.stream)
+        self.target.setFormatter(logging.Formatter("%(levelname)s:%(message)s"))
+        self.logger = logging.getLogger(f"{__name__}.{self.id()}")
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.propagate = False
+
+
+    def tearDown(self):
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+            handler.close()
+
+
+    def create_handler(self, **kwargs):
+        handler = AsyncLogHandler([self.target], **kwargs)
+        self.logger.addHandler(handler)
+        return handler
+
+
+    def test_records_are_written_in_order(self):
+        handler = self.create_handler()
+        for index in range(100):
+            self.logger.info("message %d", index)
+        handler.flush()
+
+        self.assertEqual(self.stream.getvalue().splitlines(), [f"INFO:message {index}" for index in range(100)])
+
+
+    def test_records_are_written_by_the_writer_thread(self):
+        self.create_handler(flush_interval=0.01)
+        written = threading.Event()
+        self.target.flush = written.set
+
+        self.logger.info("message")
+        self.assertTrue(written.wait(1))
+        self.assertEqual(self.stream.getvalue(), "INFO:message\n")
+
+
+    def test_drop_newest(self):
+        handler = self.create_handler(max_size=5, flush_interval=60)
+        for index in range(8):
+            self.logger.info("message %d", index)
+        handler.flush()
+
+        lines = self.stream.getvalue().splitlines()
+        self.assertEqual(lines[:5], [f"INFO:message {index}" for index in range(5)])
+        self.assertEqual(lines[5], "WARNING:3 log records were dropped because the log queue was full.")
+
+
+    def test_drop_oldest(self):
+        handler = self.create_handler(max_size=5, overflow="drop_oldest", flush_interval=60)
+        for index in range(8):
+            self.logger.info("message %d", index)
+        handler.flush()
+
+        lines = self.stream.getvalue().splitlines()
+        self.assertEqual(lines[:5], [f"INFO:message {index}" for index in range(3, 8)])
+
+
+    def test_block(self):
+        handler = self.create_handler(max_size=5, overflow="block", flush_interval=0.01)
+        for index in range(50):
+            self.logger.info("message %d", index)
+        handler.flush()
+
+        self.assertEqual(len(self.stream.getvalue().splitlines()), 50)
+
+
+    def test_block_wakes_up_on_flush(self):
+        # The writer thread would only make room after a minute
+        handler = self.create_handler(max_size=1, overflow="block", flush_interval=60)
+        self.logger.info("message 0")
+        thread = threading.Thread(target=self.logger.info, args=("message 1",))
+        thread.start()
+        thread.join(0.1)
+        self.assertTrue(thread.is_alive())
+
+        handler.flush()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        handler.flush()
+        self.assertEqual(self.stream.getvalue().splitlines(), ["INFO:message 0", "INFO:message 1"])
+
+
+    def test_close_writes_remaining_records(self):
+        handler = self.create_handler(flush_interval=60)
+        self.logger.info("message")
+        self.logger.removeHandler(handler)
+
+        # Closing the handler also closes the StringIO, so keep what was written
+        self.target.close = lambda: None
+        handler.close()
+        self.assertEqual(self.stream.getvalue(), "INFO:message\n")
+        self.assertFalse(handler.thread.is_alive())
+
+
+    def test_drops_are_counted_across_threads(self):
+        handler = self.create_handler(max_size=1, flush_interval=60)
+        threads = [threading.Thread(target=lambda: [self.logger.info("message") for _ in range(1000)]) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        handler.flush()
+
+        lines = self.stream.getvalue().splitlines()
+        self.assertEqual(lines, ["INFO:message", "WARNING:7999 log records were dropped because the log queue was full."])
+
+
+    def test_queued_records_are_written_at_exit(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "game.log")
+            # The handler is never closed and the writer thread would only wake up after a minute
+            script = (
+                "import logging\n"
+                "from src.AsyncLogHandler import AsyncLogHandler\n"
+                f"handler = AsyncLogHandler([logging.FileHandler({path!r})], flush_interval=60)\n"
+                "handler.handle(logging.makeLogRecord({'msg': 'message', 'levelno': logging.INFO}))\n"
+            )
+            subprocess.run([sys.executable, "-c", script], check=True, timeout=30,
+                           cwd=os.path.join(os.path.dirname(__file__), ".."))
+
+            with open(path) as f:
+                self.assertEqual(f.read(), "message\n")
+
+
+    def test_invalid_overflow_policy(self):
+        self.assertRaises(ValueError, AsyncLogHandler, [self.target], overflow="invalid")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from array import array
+
+from src import Autopilot as AutopilotModule
+from src.Autopilot import Autopilot, build_hamiltonian_cycle, load_hamiltonian_cycle
+from src.GameState import GameState
+from src.selfplay import play_game
+
+
+class TestAutopilot(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        AutopilotModule._cycles.clear()
+
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        AutopilotModule._cycles.clear()
+
+
+    def assertHamiltonianCycle(self, cycle, cols, rows):
+        self.assertEqual(sorted(cycle), list(range(cols * rows)))
+        for index, cell in enumerate(cycle):
+            following = cycle[(index + 1) % len(cycle)]
+            dx = abs(cell % cols - following % cols)
+            dy = abs(cell // cols - following // cols)
+            # Neighbors on a board wrapping around its edges
+            dx, dy = min(dx, cols - dx), min(dy, rows - dy)
+            self.assertEqual(dx + dy, 1 if len(cycle) > 1 else 0, (cols, rows, index))
+
+
+    def test_build_hamiltonian_cycle(self):
+        for cols, rows in ((4, 4), (5, 4), (4, 5), (3, 3), (3, 5), (5, 3), (7, 9), (1, 6), (5, 1), (2, 3), (80, 60)):
+            self.assertHamiltonianCycle(build_hamiltonian_cycle(cols, rows), cols, rows)
+
+
+    def test_cycle_is_memoized_on_disk(self):
+        cycle, positions = load_hamiltonian_cycle(9, 7, self.directory)
+        path = os.path.join(self.directory, "hamiltonian-9x7.bin")
+        self.assertEqual(os.path.getsize(path), 4 * 63)
+        self.assertEqual(positions[cycle[10]], 10)
+
+        # Later processes load the file instead of building the cycle
+        AutopilotModule._cycles.clear()
+        with open(path, "r+b") as f:
+            f.write(array("I", [62]).tobytes())
+        self.assertEqual(load_hamiltonian_cycle(9, 7, self.directory)[0][0], 62)
+        self.assertIs(load_hamiltonian_cycle(9, 7, self.directory)[0], load_hamiltonian_cycle(9, 7)[0])
+
+        # A truncated file is rebuilt
+        AutopilotModule._cycles.clear()
+        with open(path, "wb") as f:
+            f.write(bytes(8))
+        self.assertEqual(list(load_hamiltonian_cycle(9, 7, self.directory)[0]), list(cycle))
+
+
+    def test_fills_the_board(self):
+        """
+        Test that the autopilot never dies, and eats every food until the board is full.
+        """
+        for width, height in ((60, 60), (50, 70)):
+            result = play_game(1, Autopilot(), width=width, height=height, max_ticks=20000)
+            self.assertEqual(result["length"], width * height // 100, (width, height))
+
+
+    def test_shortcuts(self):
+        """
+        Test that shortcuts reach the food far sooner than following the cycle.
+        """
+        shortcuts = play_game(2, Autopilot(), width=200, height=200, max_ticks=3000)
+        cycle_only = play_game(2, Autopilot(shortcut_limit=0), width=200, height=200, max_ticks=3000)
+        self.assertGreater(shortcuts["score"], 2 * cycle_only["score"])
+
+
+    def test_bounded_distance_field(self):
+        state = GameState(400, 400, (200, 200), (10, 0), (10, 10), seed=1)
+        autopilot = Autopilot(bfs_budget=10)
+        autopilot(state)
+
+        reached = sum(autopilot.distance(cell) >= 0 for cell in range(state.cols * state.rows))
+        self.assertLessEqual(reached, 1 + 10 * 4)
+        self.assertEqual(autopilot.distance(state.food), 0)
+
+        # A new food starts a new field without clearing the board
+        state.remove_food()
+        state.spawn_food()
+        autopilot(state)
+        self.assertEqual(autopilot.distance(state.food), 0)
+        self.assertLessEqual(sum(autopilot.distance(cell) >= 0 for cell in range(state.cols * state.rows)), 1 + 10 * 4)
+
+
+    def test_steers_once_per_cell(self):
+        """
+        Test that a snake moving several ticks per cell is steered once in every cell it enters.
+        """
+        # 50x50 and 810x610 start at a half-size position that is never aligned with a cell
+        for width, height in ((100, 100), (50, 50), (810, 610)):
+            state = GameState(width, height, (width / 2, height / 2), (-2, -2), (10, 10), seed=1)
+            autopilot = Autopilot()
+            rng = random.Random(0)
+            decisions = 0
+            cells_entered = 0
+            for _ in range(2000):
+                direction = autopilot(state, rng)
+                if direction is not None:
+                    decisions += 1
+                    state.steer(direction)
+                state.step()
+                cells_entered += state.entered_cell is not None
+                self.assertTrue(state.alive, (width, height))
+            # One decision at the start, then one per cell entered (except the one just entered)
+            self.assertGreaterEqual(decisions, cells_entered, (width, height))
+            self.assertLessEqual(decisions, cells_entered + 1, (width, height))
+            self.assertGreater(state.score, 0, (width, height))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import random
+import unittest
+
+import numpy as np
+
+from src.BatchSnakeEnv import BatchSnakeEnv
+from src.GameState import GameState
+
+
+class TestBatchSnakeEnv(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.states = []
+
+        # Small boards and fast snakes, so the games eat, grow and die within a few hundred ticks
+        for seed in range(500):
+            width, height = rng.randint(20, 120), rng.randint(20, 120)
+            start = (rng.randint(-5, width), rng.randint(-5, height))
+            speed = (rng.randint(-15, 15), rng.randint(-15, 15))
+            self.states.append(GameState(width, height, start, speed, seed=seed))
+
+        self.env = BatchSnakeEnv.from_states(self.states)
+
+
+    def assert_games_match(self):
+        for index, state in enumerate(self.states):
+            batched = self.env.state(index)
+            self.assertEqual((batched.position, batched.alive, batched.score, batched.ticks, batched.food),
+                             (state.position, state.alive, state.score, state.ticks, state.food))
+            self.assertEqual(list(batched.body), list(state.body))
+            self.assertEqual((batched.entered_cell, batched.vacated_cell), (state.entered_cell, state.vacated_cell))
+
+
+    def test_initialization(self):
+        self.assertEqual(len(self.env), 500)
+        self.assertEqual(self.env.positions.shape, (500, 2))
+        self.assertEqual(self.env.state(3).position, self.states[3].position)
+        self.assertIsNot(self.env.state(3), self.states[3])
+
+
+    def test_step_matches_game_state(self):
+        """
+        Test that every game in the batch plays out exactly like its GameState stepped on its own.
+        """
+        for tick in range(400):
+            self.env.step()
+            for state in self.states:
+                state.step()
+
+            np.testing.assert_array_equal(self.env.positions, [state.position for state in self.states])
+            np.testing.assert_array_equal(self.env.alive, [state.alive for state in self.states])
+            if tick % 50 == 0:
+                self.assert_games_match()
+        self.assert_games_match()
+
+        # The comparison covered games that ate, grew and died
+        self.assertGreater(sum(state.score > 1 for state in self.states), 10)
+        self.assertGreater(sum(not state.alive for state in self.states), 10)
+
+
+    def test_steer_matches_game_state(self):
+        rng = random.Random(1)
+        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+        for _ in range(300):
+            for index, state in enumerate(self.states):
+                if rng.random() < 0.1:
+                    direction = rng.choice(directions)
+                    self.assertEqual(self.env.steer(index, direction), state.steer(direction))
+            self.env.step()
+            for state in self.states:
+                state.step()
+        self.assert_games_match()
+
+
+    def test_broadcast_arguments(self):
+        env = BatchSnakeEnv([(400, 300), (0, 0)], (-2, -2), (800, 600), seeds=[1, 2])
+        env.run(2)
+
+        self.assertEqual(env.state(0).position, (396, 296))
+        self.assertEqual(env.state(1).position, (796, 596))
+        self.assertEqual(env.state(1).food, GameState(800, 600, (0, 0), seed=2).food)
+        self.assertEqual(env.ticks, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
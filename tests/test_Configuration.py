@@ -0,0 +1,145 @@
+import json
+import os
+import tempfile
+import unittest
+
+from array import array
+
+from src.Configuration import (OPTIONS, Configuration, ConfigurationError, ConfigurationWatcher,
+                               load_command_line_arguments, load_configuration_file, load_environmental_variables,
+                               write_configuration_index)
+
+
+class TestConfiguration(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "settings.json")
+
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+
+    def write(self, config, mtime_ns=None):
+        with open(self.path, "w") as f:
+            json.dump(config, f)
+        if mtime_ns is not None:
+            os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+
+    def test_load_configuration_file(self):
+        self.write({"log_level": "INFO", "logging_directory": "logs", "logic_rate": 30, "unknown": 1})
+
+        values = load_configuration_file(self.path)
+        self.assertEqual(dict(values), {"log_level": "info", "log_directory": "logs", "logic_rate": 30.0})
+        self.assertIsInstance(values["logic_rate"], float)
+
+
+    def test_configuration_file_is_memoized(self):
+        self.write({"width": 640}, mtime_ns=1_000_000_000)
+        first = load_configuration_file(self.path)
+        self.assertIs(load_configuration_file(self.path), first)
+
+        # A changed file is parsed again
+        self.write({"width": 1024}, mtime_ns=2_000_000_000)
+        self.assertEqual(load_configuration_file(self.path)["width"], 1024)
+
+
+    def test_invalid_values(self):
+        for config in ({"width": "wide"}, {"width": 0}, {"logic_rate": 0}, {"headless": 1},
+                       {"render_mode": "sometimes"}, {"log_queue_size": True}):
+            self.write(config)
+            with self.assertRaises(ConfigurationError):
+                load_configuration_file(self.path)
+
+        with open(self.path, "w") as f:
+            f.write("{")
+        self.assertRaises(ConfigurationError, load_configuration_file, self.path)
+
+        # Missing files are configuration errors too
+        self.assertRaises(ConfigurationError, load_configuration_file, os.path.join(self.directory.name, "missing.json"))
+
+
+    def test_environmental_variables(self):
+        values = load_environmental_variables({"HEADLESS": "yes", "TICKS": "100", "RENDER_RATE": "30", "HOME": "/"})
+        self.assertEqual(values, {"headless": True, "ticks": 100, "render_rate": 30.0})
+
+        self.assertRaises(ConfigurationError, load_environmental_variables, {"HEADLESS": "maybe"})
+        self.assertRaises(ConfigurationError, load_environmental_variables, {"WIDTH": "-1"})
+
+
+    def test_command_line_arguments(self):
+        values = load_command_line_arguments({"width": 640, "height": None, "configuration_file": "settings.json"})
+        self.assertEqual(values, {"width": 640})
+
+
+    def test_configuration_changes(self):
+        defaults = Configuration({option.name: option.default for option in OPTIONS})
+        changed = Configuration(dict(defaults.values, width=640, logic_rate=30.0))
+
+        self.assertEqual(changed.width, 640)
+        self.assertEqual(changed.changes(defaults), {"width", "logic_rate"})
+        self.assertRaises(AttributeError, setattr, changed, "width", 800)
+
+
+    def test_options_are_described(self):
+        for option in OPTIONS:
+            self.assertTrue(option.description, option.name)
+        self.assertEqual(OPTIONS[0].describe(), "log_level (str): The log level to be set. Defaults to 'debug'.")
+
+
+    def write_lines(self, lines, mtime_ns):
+        path = os.path.join(self.directory.name, "matrix.jsonl")
+        with open(path, "w") as f:
+            f.write("".join(line + "\n" for line in lines))
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+        return path
+
+
+    def test_json_lines_entry_by_index(self):
+        """
+        Test that one entry of a JSON Lines file is loaded through the offset index, without parsing the others.
+        """
+        lines = [json.dumps({"width": 100 + index}) for index in range(50)] + ["not json"]
+        path = self.write_lines(lines, mtime_ns=1_000_000_000)
+
+        # Without an index file, the file is indexed in memory and nothing is written next to it
+        self.assertEqual(dict(load_configuration_file(path, 7)), {"width": 107})
+        self.assertEqual(dict(load_configuration_file(path)), {"width": 100})
+        self.assertEqual(os.listdir(self.directory.name), ["matrix.jsonl"])
+
+        # The index file written by the generator is used instead of scanning the file: a bogus offset is followed
+        offsets = array("Q", [0])
+        for line in lines[:-1]:
+            offsets.append(offsets[-1] + len(line) + 1)
+        offsets[12] = len(lines[0]) + 1
+        write_configuration_index(path, offsets, (1_000_000_000, os.path.getsize(path)))
+        self.assertEqual(dict(load_configuration_file(path, 12)), {"width": 101})
+
+        self.assertRaises(ConfigurationError, load_configuration_file, path, 50)
+        self.assertRaises(ConfigurationError, load_configuration_file, path, 51)
+        self.write({"width": 640})
+        self.assertRaises(ConfigurationError, load_configuration_file, self.path, 0)
+
+
+    def test_stale_index_is_rebuilt(self):
+        path = self.write_lines(['{"width": 1}', '{"width": 2}'], mtime_ns=1_000_000_000)
+        self.assertEqual(load_configuration_file(path, 1)["width"], 2)
+
+        path = self.write_lines(['{"height": 3}', "", '{"width": 4}', '{"width": 5}'], mtime_ns=2_000_000_000)
+        self.assertEqual(load_configuration_file(path, 1)["width"], 4)
+        self.assertEqual(load_configuration_file(path, 2)["width"], 5)
+
+
+    def test_watcher(self):
+        self.write({"width": 640}, mtime_ns=1_000_000_000)
+        watcher = ConfigurationWatcher(self.path, interval=0)
+        self.assertFalse(watcher.changed())
+
+        self.write({"width": 1024}, mtime_ns=2_000_000_000)
+        self.assertTrue(watcher.changed())
+        self.assertFalse(watcher.changed())
+
+
+if __name__ == "__main__":
+    unittest.main()
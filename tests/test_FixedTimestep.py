@@ -0,0 +1,67 @@
+import unittest
+
+from src.FixedTimestep import FixedTimestep
+
+
+class FakeClock:
+    """
+    A clock that only moves when told to.
+    """
+    def __init__(self):
+        self.time = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.time
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.time += seconds
+
+
+class TestFixedTimestep(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.timestep = FixedTimestep(logic_rate=100, render_rate=25, clock=self.clock, sleep=self.clock.sleep)
+
+
+    def test_tick_consumes_fixed_steps(self):
+        self.clock.time += 0.035
+        self.assertEqual(self.timestep.tick(), 3)
+        self.assertAlmostEqual(self.timestep.alpha, 0.5)
+
+        self.clock.time += 0.005
+        self.assertEqual(self.timestep.tick(), 1)
+        self.assertAlmostEqual(self.timestep.alpha, 0.0)
+
+
+    def test_slow_frames_do_not_spiral(self):
+        self.clock.time += 10
+        self.assertEqual(self.timestep.tick(), 25) # max_frame_time / logic_interval
+
+
+    def test_render_rate_is_capped(self):
+        frames = 0
+        ticks = 0
+
+        for _ in range(1000):
+            self.clock.time += 0.001
+            ticks += self.timestep.tick()
+            frames += self.timestep.should_render()
+
+        self.assertAlmostEqual(ticks, 100, delta=1)
+        self.assertAlmostEqual(frames, 25, delta=1)
+
+
+    def test_wait_sleeps_until_next_event(self):
+        self.timestep.should_render()
+        self.timestep.wait()
+        self.assertAlmostEqual(self.clock.sleeps[-1], 0.01)
+
+
+    def test_invalid_rates(self):
+        self.assertRaises(ValueError, FixedTimestep, 0, 60)
+
+
+if __name__ == "__main__":
+    unittest.main()
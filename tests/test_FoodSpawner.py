@@ -0,0 +1,64 @@
+import unittest
+
+from src.FoodSpawner import FoodSpawner
+
+
+class TestFoodSpawner(unittest.TestCase):
+    def setUp(self):
+        self.spawner = FoodSpawner(100, occupied=[0, 1, 2], seed=42)
+
+
+    def test_initialization(self):
+        self.assertEqual(len(self.spawner), 97)
+        self.assertNotIn(1, self.spawner)
+        self.assertIn(3, self.spawner)
+
+
+    def test_take_and_release(self):
+        self.spawner.take(50)
+        self.spawner.take(50)
+        self.assertNotIn(50, self.spawner)
+        self.assertEqual(len(self.spawner), 96)
+
+        self.spawner.release(50)
+        self.spawner.release(50)
+        self.assertIn(50, self.spawner)
+        self.assertEqual(len(self.spawner), 97)
+        self.assertEqual(sorted(self.spawner.free_cells), list(range(3, 100)))
+
+
+    def test_untake_and_unrelease_restore_the_order(self):
+        """
+        Test that undoing take() and release() restores the exact order of the free cells.
+        """
+        free_cells, positions = list(self.spawner.free_cells), list(self.spawner.positions)
+        last = free_cells[-1]
+        for cell in (50, last, 7):
+            index = self.spawner.positions[cell]
+            self.spawner.take(cell)
+            self.spawner.untake(cell, index)
+            self.assertEqual(self.spawner.free_cells, free_cells)
+
+        self.spawner.release(1)
+        self.spawner.unrelease(1)
+        self.assertEqual(self.spawner.free_cells, free_cells)
+        self.assertEqual(list(self.spawner.positions), positions)
+
+
+    def test_spawn_on_free_cell(self):
+        for _ in range(97):
+            food = self.spawner.spawn()
+            self.assertGreaterEqual(food, 3)
+            self.assertNotIn(food, self.spawner)
+
+        # The board is full
+        self.assertIsNone(self.spawner.spawn())
+
+
+    def test_seed_is_reproducible(self):
+        other = FoodSpawner(100, occupied=[0, 1, 2], seed=42)
+        self.assertEqual([self.spawner.spawn() for _ in range(10)], [other.spawn() for _ in range(10)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import json
+import os
+import tempfile
+import unittest
+
+from src.FrameProfiler import FrameProfiler
+
+
+class TestFrameProfiler(unittest.TestCase):
+    def setUp(self):
+        self.profiler = FrameProfiler(size=100)
+
+
+    def test_percentiles(self):
+        for value in range(1, 101):
+            self.profiler.record("update", value * 1000)
+
+        percentiles = self.profiler.percentiles("update")
+        self.assertEqual(percentiles, {"p50": 51.0, "p95": 96.0, "p99": 100.0})
+        self.assertEqual(self.profiler.percentiles("missing")["p99"], 0.0)
+
+
+    def test_ring_buffer_keeps_last_samples(self):
+        for value in range(1000):
+            self.profiler.record("draw", value)
+
+        self.assertEqual(len(self.profiler.samples["draw"]), 100)
+        self.assertEqual(self.profiler.counts["draw"], 1000)
+        self.assertGreaterEqual(min(self.profiler.samples["draw"]), 900)
+
+
+    def test_marks(self):
+        self.profiler.start_frame()
+        self.profiler.mark("events")
+        self.profiler.mark("update")
+        self.profiler.end_frame()
+
+        self.assertEqual(set(self.profiler.summary()), {"events", "update", "frame"})
+        self.assertEqual(len(self.profiler.format_lines()), 3)
+
+
+    def test_dump(self):
+        self.profiler.record("update", 5000)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "profile.jsonl")
+            self.profiler.dump(path)
+            self.profiler.dump(path)
+
+            with open(path) as f:
+                lines = [json.loads(line) for line in f]
+
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[0]["phases"]["update"]["p50"], 5.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+import asyncio
+import random
+import unittest
+
+from src.GameServer import DELTA, KEYFRAME, GameClient, GameMirror, GameServer, encode_delta, encode_keyframe
+from src.GameState import GameState
+from src.Policies import DIRECTIONS
+
+
+def new_game(seed=1):
+    return lambda: GameState(200, 100, (100, 50), (10, 0), (10, 10), seed)
+
+
+def encode_delta_at(ticks):
+    # The deltas of the first ticks of new_game(), stepped without input
+    state = new_game()()
+    for _ in range(ticks):
+        food = state.food
+        state.step()
+    return encode_delta(state, food)
+
+
+def unframe(data):
+    # Every message in these tests is shorter than 128 bytes, the length fits in one byte
+    assert data[0] == len(data) - 1
+    return data[1:]
+
+
+class FakeTransport:
+    def __init__(self):
+        self.buffered = 0
+
+    def is_closing(self):
+        return False
+
+    def get_write_buffer_size(self):
+        return self.buffered
+
+
+class FakeWriter:
+    def __init__(self):
+        self.transport = FakeTransport()
+        self.messages = []
+
+    def write(self, data):
+        self.messages.append(data[1])
+
+    def close(self):
+        pass
+
+
+class TestGameServer(unittest.TestCase):
+    def assertMirrors(self, mirror, state):
+        self.assertEqual(mirror.ticks, state.ticks)
+        self.assertEqual(list(mirror.body), list(state.body.cells))
+        self.assertEqual((mirror.food, mirror.score, mirror.alive), (state.food, state.score, state.alive))
+
+
+    def test_deltas_rebuild_the_game(self):
+        """
+        Test that a keyframe followed by a delta per tick rebuilds the exact game.
+        """
+        state = new_game()()
+        state.grow(3)
+        mirror = GameMirror()
+        self.assertEqual(mirror.apply(unframe(encode_keyframe(state))), KEYFRAME)
+        self.assertEqual((mirror.cols, mirror.rows), (20, 10))
+
+        rng = random.Random(0)
+        while state.alive and state.ticks < 500:
+            if rng.random() < 0.2:
+                state.steer(rng.choice(DIRECTIONS))
+            food = state.food
+            state.step()
+            delta = unframe(encode_delta(state, food))
+            self.assertLessEqual(len(delta), 10)
+            self.assertEqual(mirror.apply(delta), DELTA)
+            self.assertMirrors(mirror, state)
+
+
+    def test_deltas_before_keyframe_are_ignored(self):
+        state = new_game()()
+        state.step()
+        delta = unframe(encode_delta(state, state.food))
+        mirror = GameMirror()
+        mirror.apply(delta)
+        self.assertFalse(mirror.synchronized)
+        self.assertEqual(len(mirror.body), 0)
+
+        state.step()
+        mirror.apply(unframe(encode_keyframe(state)))
+        mirror.apply(delta)
+        self.assertMirrors(mirror, state)
+
+
+    def test_batched_sends(self):
+        """
+        Test that the deltas of several ticks are sent together, and that a keyframe replaces the deltas before it.
+        """
+        server = GameServer(new_game(), logic_rate=60, send_rate=20, keyframe_interval=5)
+        writer = FakeWriter()
+        writer.write = lambda data: writer.messages.append(data)
+        server.clients[writer] = False
+
+        for _ in range(6):
+            server.tick()
+
+        first, second = writer.messages
+        self.assertEqual(first, b"".join(encode_delta_at(tick) for tick in (1, 2, 3)))
+        self.assertEqual(second[1], KEYFRAME)
+        mirror = GameMirror()
+        for message in writer.messages:
+            offset = 0
+            while offset < len(message):
+                mirror.apply(message[offset + 1:offset + 1 + message[offset]])
+                offset += 1 + message[offset]
+        self.assertMirrors(mirror, server.state)
+
+
+    def test_lagging_client_is_resynchronized(self):
+        """
+        Test that a client with a full connection is skipped instead of waited for, then gets a keyframe.
+        """
+        server = GameServer(new_game(), send_rate=None, max_buffer=100)
+        writer = FakeWriter()
+        server.clients[writer] = False
+
+        server.tick()
+        writer.transport.buffered = 1000
+        server.tick()
+        server.tick()
+        writer.transport.buffered = 0
+        server.tick()
+        server.tick()
+
+        self.assertEqual(writer.messages, [DELTA, KEYFRAME, DELTA])
+        self.assertEqual(server.skipped, 2)
+
+
+    def test_new_game_after_game_over(self):
+        server = GameServer(new_game())
+        writer = FakeWriter()
+        server.clients[writer] = False
+        server.state.alive = False
+
+        server.tick()
+
+        self.assertTrue(server.state.alive)
+        self.assertEqual(server.games, 2)
+        self.assertEqual(writer.messages, [KEYFRAME])
+
+
+    def test_serve_clients(self):
+        """
+        Test that many spectators follow the game over TCP and that inputs from clients steer the snake.
+        """
+        async def watch(client):
+            while await client.receive() is not None:
+                pass
+
+        async def main():
+            server = GameServer(new_game(), port=0, logic_rate=1000, keyframe_interval=50)
+            task = asyncio.create_task(server.run())
+            await server.listening.wait()
+
+            clients = [await GameClient.connect(port=server.port) for _ in range(100)]
+            watchers = [asyncio.create_task(watch(client)) for client in clients]
+            await clients[0].steer((0, 1))
+            ticks = server.state.ticks
+            while server.state.ticks < ticks + 100:
+                await asyncio.sleep(0.01)
+            server.stop()
+            await task
+            await asyncio.gather(*watchers)
+            for client in clients:
+                await client.close()
+            return server, clients
+
+        server, clients = asyncio.run(main())
+
+        self.assertEqual(server.state.speed, (0, 10))
+        self.assertEqual(server.skipped, 0)
+        for client in clients:
+            self.assertMirrors(client.mirror, server.state)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,266 @@
+import random
+import sys
+import unittest
+
+from src.GameState import GameState
+
+
+class TestGameState(unittest.TestCase):
+    def setUp(self):
+        self.state = GameState(800, 600, (400, 300))
+
+
+    def test_initialization(self):
+        self.assertEqual(self.state.position, (400, 300))
+        self.assertEqual(self.state.speed, (-2, -2))
+        self.assertEqual(self.state.ticks, 0)
+
+
+    def test_step(self):
+        self.state.step()
+        self.assertEqual(self.state.position, (398, 298))
+        self.assertEqual(self.state.ticks, 1)
+
+
+    def test_wraparound(self):
+        self.state.x, self.state.y = 0, 0
+        self.state.step()
+        self.assertEqual(self.state.position, (798, 598))
+
+        self.state.speed = (4, 4)
+        self.state.step()
+        self.assertEqual(self.state.position, (2, 2))
+
+
+    def test_crossing_the_edge_moves_into_the_next_cell(self):
+        state = GameState(100, 100, (0, 50), speed=(-10, 0))
+        state.grow(5)
+
+        cells = []
+        for _ in range(3):
+            state.step()
+            cells.append(state.body.cell_position(state.body.head))
+
+        self.assertEqual(cells, [(9, 5), (8, 5), (7, 5)])
+        self.assertTrue(state.alive)
+
+
+    def test_body_follows_head(self):
+        self.assertEqual(self.state.body.head, self.state.cell_at(400, 300))
+
+        self.state.grow(2)
+        self.state.run(10)
+
+        self.assertEqual(self.state.body.head, self.state.cell_at(*self.state.position))
+        self.assertEqual(len(self.state.body), 3)
+
+
+    def test_self_collision_ends_game(self):
+        state = GameState(100, 100, (50, 50), speed=(10, 0))
+        state.grow(4)
+
+        for speed in [(10, 0), (0, 10), (-10, 0), (0, -10)]:
+            state.speed = speed
+            state.step()
+
+        self.assertFalse(state.alive)
+        ticks = state.ticks
+        state.step()
+        self.assertEqual(state.ticks, ticks)
+
+
+    def test_eating_food(self):
+        state = GameState(100, 100, (50, 50), speed=(10, 0), seed=1)
+        state.food_spawner.take(56)
+        state.food_spawner.release(state.food)
+        state.food_spawner.food = 56
+
+        state.step()
+
+        self.assertEqual(state.score, 1)
+        self.assertEqual(len(state.body), 2)
+        self.assertNotEqual(state.food, 56)
+        self.assertNotIn(state.food, state.body)
+        self.assertEqual(len(state.food_spawner), 100 - 2 - 1)
+
+
+    def test_free_cells_track_body(self):
+        state = GameState(100, 100, (50, 50), speed=(10, 0), seed=3)
+        state.grow(3)
+
+        for _ in range(500):
+            state.step()
+            if not state.alive:
+                break
+
+            free_cells = set(state.food_spawner.free_cells)
+            self.assertTrue(free_cells.isdisjoint(state.body))
+            self.assertEqual(len(free_cells) + len(state.body) + (state.food is not None), 100)
+
+
+    def test_grid_tracks_entities(self):
+        state = GameState(100, 100, (50, 50), speed=(10, 0), seed=3)
+        state.grow(3)
+
+        for _ in range(200):
+            state.step()
+            if not state.alive:
+                break
+
+            body_cells = {cell for cell, owner in enumerate(state.grid.owners) if owner is state.body}
+            self.assertEqual(body_cells, set(state.body))
+            self.assertIs(state.grid[state.food], GameState.FOOD)
+
+
+    def test_wall_ends_game(self):
+        state = GameState(100, 100, (50, 50), speed=(10, 0), seed=1)
+        state.remove_food()
+        state.add_wall(state.body.neighbor(state.body.head, (1, 0)))
+
+        self.assertTrue(state.blocked(56))
+        self.assertNotIn(56, state.food_spawner)
+        self.assertRaises(ValueError, state.add_wall, state.body.head)
+
+        state.step()
+        self.assertFalse(state.alive)
+
+
+    def test_steer(self):
+        self.assertTrue(self.state.steer((1, 0)))
+        self.assertEqual(self.state.speed, (2, 0))
+        self.assertFalse(self.state.steer((1, 0)))
+
+        # The snake can't reverse into its own body
+        self.state.grow()
+        self.state.run(5)
+        self.assertFalse(self.state.steer((-1, 0)))
+        self.assertTrue(self.state.steer((0, 1)))
+
+
+    def fingerprint(self, state):
+        """
+        Returns everything a game's future depends on.
+        """
+        spawner = state.food_spawner
+        return (state.position, state.speed, state.alive, state.score, state.ticks, state.entered_cell,
+                state.vacated_cell, state.food, list(state.body), bytes(state.body.occupied), state.body.growth,
+                ["body" if owner is state.body else owner for owner in state.grid.owners], set(state.walls), list(spawner.free_cells), list(spawner.positions),
+                spawner.rng.getstate())
+
+
+    def test_snapshot_restore(self):
+        """
+        Test that restoring a snapshot rewinds everything, including the order food will be placed in.
+        """
+        state = GameState(60, 60, (30, 30), speed=(10, 0), seed=2)
+        state.grow(5)
+        state.run(3)
+        state.add_wall(0)
+        snapshot = state.snapshot()
+        expected = self.fingerprint(state)
+
+        rng = random.Random(0)
+        for branch in range(30):
+            for _ in range(rng.randrange(1, 60)):
+                state.steer(rng.choice(((1, 0), (-1, 0), (0, 1), (0, -1))))
+                state.step()
+                if rng.random() < 0.05:
+                    state.grow(2)
+                if rng.random() < 0.02 and state.grid[35] is None:
+                    state.add_wall(35)
+                if rng.random() < 0.02:
+                    state.remove_food()
+            state.restore(snapshot)
+            self.assertEqual(self.fingerprint(state), expected, branch)
+
+        # The game plays out exactly as it would have without the branches
+        other = GameState(60, 60, (30, 30), speed=(10, 0), seed=2)
+        other.grow(5)
+        other.run(3)
+        other.add_wall(0)
+        for game in (state, other):
+            game.steer((0, 1))
+            game.run(200)
+        self.assertEqual(self.fingerprint(state), self.fingerprint(other))
+
+
+    def test_forks(self):
+        """
+        Test that snapshots on different branches can all be restored, in any order.
+        """
+        state = GameState(100, 100, (50, 50), speed=(10, 0), seed=1)
+        state.grow(3)
+        root = state.snapshot()
+        expected = {root: self.fingerprint(state)}
+
+        rng = random.Random(1)
+        snapshots = [root]
+        for _ in range(40):
+            state.restore(rng.choice(snapshots))
+            for _ in range(rng.randrange(1, 15)):
+                state.steer(rng.choice(((1, 0), (-1, 0), (0, 1), (0, -1))))
+                state.step()
+            snapshot = state.snapshot()
+            snapshots.append(snapshot)
+            expected[snapshot] = self.fingerprint(state)
+
+        for snapshot in rng.sample(snapshots, len(snapshots)):
+            state.restore(snapshot)
+            self.assertEqual(self.fingerprint(state), expected[snapshot])
+
+        self.assertRaises(ValueError, GameState(100, 100).restore, root)
+        state.discard_snapshots()
+        self.assertIsNone(state.version)
+        self.assertRaises(ValueError, state.restore, root)
+
+
+    def versions(self, snapshot, state):
+        """
+        Returns the number of versions between a snapshot and the current version of a game.
+        """
+        count, version = 0, snapshot.version
+        while version is not state.version:
+            count, version = count + 1, version[1]
+        return count
+
+
+    def test_moves_within_a_cell_are_not_recorded(self):
+        state = GameState(100, 100, (50, 50), speed=(2, 0), seed=1)
+        snapshot = state.snapshot()
+        state.run(10)
+        self.assertEqual(self.versions(snapshot, state), 2)
+
+
+    def test_unreachable_versions_are_freed(self):
+        """
+        Test that the versions of the board only live as long as a snapshot can reach them.
+        """
+        state = GameState(200, 200, (100, 100), speed=(10, 0), seed=1)
+        snapshot = state.snapshot()
+        state.run(10)
+        version = snapshot.version
+        del snapshot
+        state.run(10)
+
+        # Only the current version points to it, the older ones were freed
+        self.assertEqual(sys.getrefcount(version), 2)
+
+
+    def test_snapshots_share_the_random_number_generator_state(self):
+        state = GameState(100, 100, (50, 50), speed=(2, 0), seed=1)
+        first = state.snapshot()
+        state.run(3)
+        self.assertIs(state.snapshot().rng_state, first.rng_state)
+
+        state.remove_food()
+        state.spawn_food()
+        self.assertIsNot(state.snapshot().rng_state, first.rng_state)
+
+
+    def test_run(self):
+        self.state.run(1000)
+        self.assertEqual(self.state.ticks, 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
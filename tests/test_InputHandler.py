@@ -0,0 +1,130 @@
+import os
+import threading
+import time
+import unittest
+
+# Allow the tests to run on machines without a display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from src.InputHandler import InputHandler
+
+
+class FakeClock:
+    def __init__(self):
+        self.time = 100.0
+
+    def __call__(self):
+        return self.time
+
+
+class TestInputHandler(unittest.TestCase):
+    def setUp(self):
+        pygame.display.init()
+        pygame.display.set_mode((10, 10))
+        self.keys = {pygame.K_LEFT: (-1, 0), pygame.K_RIGHT: (1, 0), pygame.K_UP: (0, -1), pygame.K_DOWN: (0, 1)}
+        self.clock = FakeClock()
+        self.input = InputHandler(self.keys, clock=self.clock)
+        pygame.event.clear()
+
+
+    def tearDown(self):
+        pygame.event.set_allowed(None)
+        pygame.display.quit()
+
+
+    def press(self, key, **attributes):
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, **attributes))
+
+
+    def test_event_filter(self):
+        self.assertTrue(pygame.event.get_blocked(pygame.MOUSEMOTION))
+        self.assertFalse(pygame.event.get_blocked(pygame.KEYDOWN))
+        self.assertFalse(pygame.event.get_blocked(pygame.QUIT))
+
+
+    def test_turns_are_buffered_in_order(self):
+        """
+        Test that direction keys are buffered with their arrival time, and other events are passed on.
+        """
+        self.press(pygame.K_UP)
+        self.press(pygame.K_LEFT, timestamp=42.0)
+        self.press(pygame.K_SPACE)
+        events = self.input.poll()
+
+        self.assertEqual([event.key for event in events], [pygame.K_SPACE])
+        self.assertEqual(list(self.input.turns), [((0, -1), 100.0), ((-1, 0), 42.0)])
+
+
+    def test_full_buffer_drops_turns(self):
+        for key in (pygame.K_UP, pygame.K_LEFT, pygame.K_DOWN, pygame.K_RIGHT):
+            self.press(key)
+        self.input.poll()
+
+        self.assertEqual([direction for direction, _ in self.input.turns], [(0, -1), (-1, 0), (0, 1)])
+        self.assertEqual((self.input.received, self.input.dropped), (4, 1))
+
+
+    def test_apply_one_turn_per_tick(self):
+        """
+        Test that a quick sequence of turns is applied one per tick, skipping the turns that are rejected.
+        """
+        heading = [(1, 0)]
+
+        def steer(direction):
+            if direction in (heading[0], (-heading[0][0], -heading[0][1])):
+                return False
+            heading[0] = direction
+            return True
+
+        for key in (pygame.K_LEFT, pygame.K_UP, pygame.K_LEFT):
+            self.press(key)
+        self.input.poll()
+
+        # Reversing is skipped, up is applied, left waits for the next tick
+        self.assertTrue(self.input.apply(steer))
+        self.assertEqual(heading[0], (0, -1))
+        self.assertTrue(self.input.apply(steer))
+        self.assertEqual(heading[0], (-1, 0))
+        self.assertFalse(self.input.apply(steer))
+
+
+    def test_input_to_photon_latency(self):
+        self.press(pygame.K_UP)
+        self.input.poll()
+        self.input.apply(lambda direction: True)
+        self.clock.time += 0.025
+
+        latencies = self.input.presented()
+        self.assertEqual(len(latencies), 1)
+        self.assertAlmostEqual(latencies[0], 0.025)
+        self.assertEqual(self.input.presented(), [])
+        self.assertTrue(self.input.finished(1))
+
+
+    def test_wait_receives_events_on_arrival(self):
+        """
+        Test that waiting between frames receives an event posted from another thread as it arrives.
+        """
+        self.input.clock = time.perf_counter
+        posted = []
+
+        def post():
+            time.sleep(0.01)
+            posted.append(time.perf_counter())
+            self.press(pygame.K_DOWN)
+
+        thread = threading.Thread(target=post)
+        thread.start()
+        self.input.wait(0.05)
+        thread.join()
+
+        self.assertEqual(len(self.input.turns), 1)
+        direction, arrival = self.input.turns[0]
+        self.assertEqual(direction, (0, 1))
+        self.assertLess(arrival - posted[0], 0.02)
+
+
+if __name__ == "__main__":
+    unittest.main()
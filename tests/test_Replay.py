@@ -0,0 +1,92 @@
+import io
+import os
+import random
+import tempfile
+import unittest
+
+from src.GameState import GameState
+from src.Replay import ReplayReader, ReplayRecorder, decode_direction, encode_direction, encode_varint, read_varint
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "game.replay")
+
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+
+    def play(self, state, recorder, rng, ticks):
+        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+        for _ in range(ticks):
+            direction = rng.choice(directions)
+            if rng.random() < 0.05 and state.steer(direction):
+                recorder.record(state.ticks, direction)
+            state.step()
+            if not state.alive:
+                break
+
+
+    def test_varint(self):
+        for value in (0, 1, 127, 128, 300, 2 ** 40):
+            self.assertEqual(read_varint(io.BytesIO(encode_varint(value))), value)
+        self.assertEqual(len(encode_varint(127)), 1)
+        self.assertIsNone(read_varint(io.BytesIO(b"")))
+
+
+    def test_direction(self):
+        for direction in [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1)]:
+            self.assertEqual(decode_direction(encode_direction(direction)), direction)
+
+
+    def test_replay_matches_game(self):
+        state = GameState(200, 200, (100, 100), speed=(2, 0), seed=5)
+        recorder = ReplayRecorder(self.path, state)
+        self.play(state, recorder, random.Random(1), 5000)
+        recorder.close(state)
+
+        reader = ReplayReader(self.path)
+        replayed = reader.replay()
+
+        self.assertGreater(len(reader.inputs), 0)
+        self.assertEqual(replayed.ticks, state.ticks)
+        self.assertEqual(replayed.position, state.position)
+        self.assertEqual(list(replayed.body), list(state.body))
+        self.assertTrue(reader.verify(replayed))
+
+        # Most inputs take two bytes
+        self.assertLess(os.path.getsize(self.path), 300 + 3 * len(reader.inputs))
+
+
+    def test_unterminated_replay(self):
+        state = GameState(200, 200, (100, 100), speed=(2, 0), seed=5)
+        recorder = ReplayRecorder(self.path, state)
+        recorder.record(10, (0, 1))
+        recorder.file.close()
+
+        reader = ReplayReader(self.path)
+        self.assertEqual(reader.inputs, [(10, (0, 1))])
+        self.assertIsNone(reader.end)
+        self.assertEqual(reader.replay().ticks, 10)
+
+
+    def test_recording_starts_with_a_new_game(self):
+        state = GameState(200, 200, (100, 100), speed=(2, 0), seed=5)
+        state.run(10)
+
+        # The header can't rebuild the body and food of a game in progress
+        self.assertRaises(ValueError, ReplayRecorder, self.path, state)
+        self.assertFalse(os.path.exists(self.path))
+
+
+    def test_invalid_file(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a replay")
+
+        self.assertRaises(ValueError, ReplayReader, self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+from src.ResolutionScaler import ResolutionScaler
+
+
+class TestResolutionScaler(unittest.TestCase):
+    def setUp(self):
+        self.scaler = ResolutionScaler(max_scale=4, budget=0.010, cooldown=5)
+
+
+    def run_frames(self, frame_time, frames):
+        """
+        Updates the scaler with frame times, a function of the scale or a constant, and returns the number of changes.
+        """
+        cost = frame_time if callable(frame_time) else lambda scale: frame_time
+        return sum(self.scaler.update(cost(self.scaler.scale)) for _ in range(frames))
+
+
+    def test_lowers_scale_over_budget(self):
+        self.assertEqual(self.scaler.scale, 4)
+        self.assertEqual(self.run_frames(lambda scale: 0.011 + 0.005 * scale, 5), 1)
+        self.assertEqual(self.scaler.scale, 3)
+
+        self.run_frames(lambda scale: 0.011 + 0.005 * scale, 100)
+        self.assertEqual(self.scaler.scale, 1) # min_scale
+
+
+    def test_stops_at_the_lowest_scale_that_helps(self):
+        # Like scaling to a large window in software: below 3 pixels per cell the frames get slower again
+        costs = {4: 0.019, 3: 0.012, 2: 0.014, 1: 0.014}
+        self.run_frames(costs.get, 100)
+
+        self.assertEqual(self.scaler.scale, 3)
+        self.assertEqual(self.scaler.min_scale, 3)
+        self.assertEqual(self.scaler.costs[2], 0.014)
+
+
+    def test_keeps_the_highest_scale_when_lowering_does_not_help(self):
+        self.run_frames(0.020, 100)
+        self.assertEqual(self.scaler.scale, 4)
+
+
+    def test_raises_scale_under_budget(self):
+        self.run_frames(lambda scale: 0.011 + 0.005 * scale, 15)
+        self.assertEqual(self.scaler.scale, 1)
+
+        self.run_frames(0.001, 100)
+        self.assertEqual(self.scaler.scale, 4) # max_scale
+
+
+    def test_holds_scale_within_budget(self):
+        self.assertEqual(self.run_frames(0.007, 100), 0)
+        self.assertEqual(self.scaler.scale, 4)
+
+
+    def test_cooldown(self):
+        self.assertEqual(self.run_frames(0.020, 4), 0)
+        self.assertTrue(self.scaler.update(0.020))
+        self.assertEqual(self.run_frames(0.020, 4), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
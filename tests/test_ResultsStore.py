@@ -0,0 +1,141 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from src.ResultsStore import ResultsReader, ResultsStore, configuration_hash
+
+
+class TestResultsStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "results", "results.db")
+        self.store = ResultsStore(self.path, flush_interval=0.01)
+        self.config_hash = self.store.register_configuration({"width": 400, "height": 400, "policy": "greedy"})
+
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.directory)
+
+
+    def test_configuration_hash(self):
+        self.assertEqual(configuration_hash({"a": 1, "b": 2}), configuration_hash({"b": 2, "a": 1}))
+        self.assertNotEqual(configuration_hash({"a": 1}), configuration_hash({"a": 2}))
+        self.assertEqual(self.config_hash, configuration_hash({"policy": "greedy", "height": 400, "width": 400}))
+
+
+    def test_batched_writes(self):
+        for seed in range(2500):
+            self.store.record(self.config_hash, seed, seed % 100, seed % 100 + 1, 1000, 0.01)
+        self.store.flush()
+        self.assertEqual(self.store.written, 2500)
+        self.assertEqual(len(self.store.queue), 0)
+        self.assertEqual(self.store.query("SELECT COUNT(*) FROM games")[0][0], 2500)
+
+
+    def test_writer_thread(self):
+        """
+        Test that games recorded from many threads are written by the writer thread without flushing.
+        """
+        def play(offset):
+            for seed in range(offset, offset + 500):
+                self.store.record(self.config_hash, seed, seed, 1, 10, 0.0)
+
+        threads = [threading.Thread(target=play, args=(offset,)) for offset in range(0, 2000, 500)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for _ in range(500):
+            if self.store.written == 2000:
+                break
+            threading.Event().wait(0.01)
+        self.assertEqual(self.store.written, 2000)
+        self.assertEqual(self.store.query("SELECT COUNT(DISTINCT seed) FROM games")[0][0], 2000)
+
+
+    def test_leaderboard(self):
+        other = self.store.register_configuration({"width": 800})
+        for seed, score, ticks in ((1, 5, 100), (2, 9, 300), (3, 9, 200), (4, 1, 50)):
+            self.store.record(self.config_hash, seed, score, score + 1, ticks, 0.1)
+        self.store.record(other, 5, 20, 21, 500, 0.1)
+        self.store.flush()
+
+        self.assertEqual([game["seed"] for game in self.store.leaderboard(3, self.config_hash)], [3, 2, 1])
+        self.assertEqual([game["seed"] for game in self.store.leaderboard(2)], [5, 3])
+
+
+    def test_percentiles(self):
+        for seed in range(1000):
+            self.store.record(self.config_hash, seed, seed, 1, 10, 0.0)
+        self.store.flush()
+
+        self.assertEqual(self.store.percentiles(self.config_hash), {"p50": 500, "p90": 900, "p99": 990})
+        self.assertEqual(self.store.percentiles("missing"), {"p50": None, "p90": None, "p99": None})
+
+
+    def test_queries_use_indexes(self):
+        plans = [
+            " ".join(row[-1] for row in self.store.query(f"EXPLAIN QUERY PLAN {sql}", parameters))
+            for sql, parameters in (
+                ("SELECT score FROM games WHERE config_hash = ? ORDER BY score DESC LIMIT 1 OFFSET 5", ("x",)),
+                ("SELECT * FROM games ORDER BY score DESC, ticks LIMIT 10", ()),
+            )
+        ]
+        for plan in plans:
+            self.assertIn("INDEX", plan)
+            self.assertNotIn("TEMP B-TREE", plan)
+
+
+    def test_summary_and_reopen(self):
+        for seed in range(10):
+            self.store.record(self.config_hash, seed, seed, 1, 10, 0.0)
+        self.store.close()
+
+        # Closing writes the queued games, and another store reads them
+        with ResultsStore(self.path) as store:
+            summary = store.summary()
+        self.assertEqual(len(summary), 1)
+        self.assertEqual(summary[0]["games"], 10)
+        self.assertEqual(summary[0]["best_score"], 9)
+        self.assertEqual(summary[0]["configuration"], {"width": 400, "height": 400, "policy": "greedy"})
+
+
+    def test_reader_never_writes(self):
+        for seed in range(10):
+            self.store.record(self.config_hash, seed, seed, 1, 10, 0.0)
+        self.store.close()
+        with open(self.path, "rb") as f:
+            database = f.read()
+
+        with ResultsReader(self.path) as reader:
+            self.assertEqual(reader.summary()[0]["games"], 10)
+            self.assertEqual(reader.percentiles(self.config_hash)["p50"], 5)
+            self.assertRaises(sqlite3.OperationalError, reader.query, "DELETE FROM games")
+
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), database)
+        self.assertRaises(sqlite3.OperationalError, ResultsReader, os.path.join(self.directory, "missing.db"))
+
+
+    def test_writer_errors_are_raised(self):
+        """
+        Test that a failure of the writer thread is raised by flush() and close() instead of silently dropping games.
+        """
+        self.store.query("DROP TABLE games")
+        self.store.record(self.config_hash, 1, 1, 1, 10, 0.0)
+        self.store.thread.join(5)
+
+        self.assertFalse(self.store.thread.is_alive())
+        self.assertIsInstance(self.store.error, sqlite3.OperationalError)
+        self.assertRaises(RuntimeError, self.store.flush)
+        self.assertRaises(RuntimeError, self.store.close)
+        self.assertIsNone(self.store.connection)
+
+
+if __name__ == "__main__":
+    unittest.main()
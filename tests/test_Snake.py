@@ -1,6 +1,8 @@
+import os
 import unittest
 
-from unittest.mock import MagicMock
+# Allow the tests to run on machines without a display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
 
 from src.Application import Application
 from src.Snake import Snake
@@ -19,20 +21,57 @@ class TestSnake(unittest.TestCase):
 
 
         self.application = Application(command_line_arguments)
-        self.snake = Snake(self.application)
+        screen = self.application.screen
+        self.snake = Snake(self.application, screen, (screen.get_width() / 2, screen.get_height() / 2))
 
 
     def test_initialization(self):
         self.assertEqual(self.snake.application, self.application)
-        self.assertEqual(self.snake.position[0], self.application.screen.get_width() / 2) # Snake.position.x
-        self.assertEqual(self.snake.position[1], self.application.screen.get_height() / 2) # Snake.position.y
+        self.assertEqual(self.snake.rect.x, self.application.screen.get_width() / 2) # Snake.position.x
+        self.assertEqual(self.snake.rect.y, self.application.screen.get_height() / 2) # Snake.position.y
 
 
     def test_update(self):
-        initial_x = self.snake.x
+        initial_x = self.snake.rect.x
         self.snake.update()
-        self.assertEqual(self.snake.x, initial_x + 2)
+        self.assertEqual(self.snake.rect.x, initial_x + self.snake.speed[0])
+        self.assertEqual(self.snake.rect.topleft, self.snake.state.position)
+
+
+    def test_update_wraps_around(self):
+        """
+        Test that the snake leaving one side of the screen comes back in on the other side.
+        """
+        self.snake.state.x, self.snake.state.y = 0, 0
+        self.snake.update()
+        self.assertEqual(self.snake.rect.topleft, (798, 598))
+
+        self.snake.state.speed = (2, 2)
+        self.snake.update()
+        self.assertEqual(self.snake.rect.topleft, (0, 0))
+
+
+    def test_draw_body(self):
+        """
+        Test that the body is drawn from the atlas and vacated cells are restored from the background.
+        """
+        screen, background = self.application.screen, self.application.background
+        self.snake.state.remove_food()
+        self.snake.state.speed = (10, 0)
+        self.snake.state.grow(2)
+        for _ in range(3):
+            self.snake.update()
+
+        dirty_rects = self.snake.draw_body(screen, background)
+        self.assertEqual(len(dirty_rects), 4)
+        for cell in self.snake.state.body:
+            self.assertEqual(screen.get_at(self.snake.cell_rect(cell).center), (255, 255, 255, 255))
+
+        self.snake.update()
+        vacated = self.snake.cell_rect(self.snake.state.vacated_cell)
+        self.snake.draw_body(screen, background)
+        self.assertEqual(screen.get_at(vacated.center), (0, 0, 0, 255))
 
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+from src.SnakeBody import SnakeBody
+
+
+class TestSnakeBody(unittest.TestCase):
+    def setUp(self):
+        self.body = SnakeBody(10, 10, 55, length=3)
+
+
+    def test_initialization(self):
+        self.assertEqual(len(self.body), 1)
+        self.assertEqual(self.body.head, 55)
+        self.assertIn(55, self.body)
+        self.assertEqual(self.body.cell_position(55), (5, 5))
+        self.assertEqual(self.body.cell_index(5, 5), 55)
+
+
+    def test_advance_grows_to_length(self):
+        self.assertIsNone(self.body.advance(56))
+        self.assertIsNone(self.body.advance(57))
+        self.assertEqual(self.body.advance(58), 55)
+
+        self.assertEqual(list(self.body), [56, 57, 58])
+        self.assertNotIn(55, self.body)
+        self.assertEqual(self.body.tail, 56)
+
+
+    def test_retreat_undoes_push(self):
+        for cell in (56, 66, 65):
+            self.body.advance(cell)
+        cells, occupied, growth = list(self.body), bytes(self.body.occupied), self.body.growth
+
+        # The head may move into the cell the tail vacates
+        self.body.retreat(self.body.push(64, vacate=False))
+        vacated = self.body.push(56, vacate=True)
+        self.assertEqual(vacated, 56)
+        self.body.retreat(vacated, was_occupied=1)
+
+        self.assertEqual((list(self.body), bytes(self.body.occupied), self.body.growth), (cells, occupied, growth))
+
+
+    def test_collides(self):
+        for cell in (56, 66, 65):
+            self.body.advance(cell)
+
+        # The tail moves out of the way unless the snake is growing
+        self.assertFalse(self.body.collides(56))
+        self.assertTrue(self.body.collides(66))
+        self.assertFalse(self.body.collides(0))
+
+        self.body.grow()
+        self.assertTrue(self.body.collides(56))
+
+
+if __name__ == "__main__":
+    unittest.main()
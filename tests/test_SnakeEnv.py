@@ -0,0 +1,99 @@
+import os
+import random
+import unittest
+
+import numpy as np
+
+# Allow the tests to run on machines without a display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from src.Policies import greedy_policy, DIRECTIONS
+from src.SnakeEnv import SnakeEnv
+
+
+class TestSnakeEnv(unittest.TestCase):
+    def expected_board(self, env):
+        """
+        Builds the board observation from scratch.
+        """
+        board = np.zeros_like(env.board)
+        cells = board.reshape(-1)
+        for cell in env.state.body:
+            cells[cell] = SnakeEnv.BODY
+        if env.state.food is not None:
+            cells[env.state.food] = SnakeEnv.FOOD
+        cells[env.state.body.head] = SnakeEnv.HEAD
+        return board
+
+
+    def test_reset(self):
+        env = SnakeEnv(100, 80)
+        observation, info = env.reset(seed=1)
+
+        self.assertEqual(observation.shape, (8, 10))
+        self.assertFalse(observation.flags.writeable)
+        self.assertEqual(info, {"score": 0, "length": 1, "ticks": 0})
+        np.testing.assert_array_equal(observation, self.expected_board(env))
+
+
+    def test_observation_is_updated_in_place(self):
+        env = SnakeEnv(100, 100)
+        observation, _ = env.reset(seed=3)
+        rng = random.Random(3)
+
+        for _ in range(300):
+            action = greedy_policy(env.state, rng)
+            step_observation, reward, terminated, truncated, info = env.step(
+                DIRECTIONS.index(action) if action is not None else -1)
+
+            # The same buffer is returned every step, without a copy
+            self.assertTrue(np.shares_memory(step_observation, env.board))
+            self.assertIs(step_observation, observation)
+            np.testing.assert_array_equal(observation, self.expected_board(env))
+            if terminated:
+                break
+
+        self.assertGreater(info["score"], 0)
+
+
+    def test_rewards(self):
+        env = SnakeEnv(100, 100)
+        env.reset(seed=1)
+        env.state.remove_food()
+        env.state.food_spawner.take(env.state.body.head + 1)
+        env.state.food_spawner.food = env.state.body.head + 1
+
+        _, reward, terminated, truncated, info = env.step(1)
+        self.assertEqual((reward, terminated, truncated), (1.0, False, False))
+
+        env.state.grow(3)
+        for action in (3, 0):
+            env.step(action)
+        _, reward, terminated, _, _ = env.step(2)
+        self.assertEqual((reward, terminated), (-1.0, True))
+
+
+    def test_truncation(self):
+        env = SnakeEnv(100, 100, max_ticks=5)
+        env.reset(seed=1)
+        env.state.remove_food()
+
+        results = [env.step(-1)[3] for _ in range(5)]
+        self.assertEqual(results, [False] * 4 + [True])
+
+
+    def test_pixels(self):
+        env = SnakeEnv(100, 100, pixels=True)
+        observation, _ = env.reset(seed=1)
+
+        self.assertEqual(observation.shape, (100, 100, 3))
+        head = env.state.body.head
+        x, y = head % 10 * 10, head // 10 * 10
+        self.assertEqual(tuple(observation[x + 5, y + 5]), SnakeEnv.COLORS[SnakeEnv.HEAD])
+
+        env.step(-1)
+        self.assertEqual(tuple(observation[x + 5, y + 5]), SnakeEnv.COLORS[SnakeEnv.EMPTY])
+
+
+if __name__ == "__main__":
+    unittest.main()
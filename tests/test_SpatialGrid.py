@@ -0,0 +1,37 @@
+import unittest
+
+from src.SpatialGrid import SpatialGrid
+
+
+class TestSpatialGrid(unittest.TestCase):
+    def setUp(self):
+        self.grid = SpatialGrid(8, 6, (10, 10))
+
+
+    def test_insert_and_remove(self):
+        self.grid.insert(9, "snake")
+        self.assertEqual(self.grid[9], "snake")
+        self.assertIsNone(self.grid[10])
+
+        # Removing on behalf of another entity leaves the cell alone
+        self.grid.remove(9, "food")
+        self.assertEqual(self.grid[9], "snake")
+        self.grid.remove(9, "snake")
+        self.assertIsNone(self.grid[9])
+
+
+    def test_query(self):
+        self.grid.insert(0, "snake")
+        self.grid.insert(9, "snake")
+        self.grid.insert(10, "food")
+        self.grid.insert(47, "wall")
+
+        self.assertEqual(self.grid.cells_in_rect(5, 5, 10, 10), [0, 1, 8, 9])
+        self.assertEqual(self.grid.cells_in_rect(-20, -20, 5, 5), [])
+        self.assertEqual(self.grid.query(0, 0, 30, 20), {0: "snake", 9: "snake", 10: "food"})
+        self.assertEqual(self.grid.query(0, 0, 30, 20, "snake"), {0: "snake", 9: "snake"})
+        self.assertEqual(self.grid.query(75, 55, 100, 100), {47: "wall"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import os
+import unittest
+
+# Allow the tests to run on machines without a display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from src.SpriteAtlas import SpriteAtlas
+
+
+class TestSpriteAtlas(unittest.TestCase):
+    def setUp(self):
+        pygame.display.init()
+        self.screen = pygame.display.set_mode((100, 100))
+        self.atlas = SpriteAtlas((10, 10))
+
+
+    def test_tiles(self):
+        self.assertEqual(self.atlas.surface("body").get_size(), (10, 10))
+        self.assertEqual(self.atlas.surface("food").get_at((5, 5)), pygame.Color("red"))
+        for orientation in SpriteAtlas.ORIENTATIONS:
+            self.assertEqual(self.atlas.surface("head", orientation).get_size(), (10, 10))
+
+        # The tiles are subsurfaces of one sheet in the display's pixel format
+        self.assertEqual(self.atlas.sheet.get_bitsize(), self.screen.get_bitsize())
+        self.assertIs(self.atlas.surface("body").get_parent(), self.atlas.sheet)
+
+
+    def test_head_faces_its_orientation(self):
+        right = self.atlas.surface("head", (1, 0))
+        left = self.atlas.surface("head", (-1, 0))
+
+        self.assertEqual(right.get_at((7, 3)), pygame.Color("black"))
+        self.assertEqual(right.get_at((2, 2)), pygame.Color("white"))
+        self.assertEqual(left.get_at((2, 2)), pygame.Color("black"))
+
+
+    def test_orientation(self):
+        self.assertEqual(SpriteAtlas.orientation((10, 0)), (1, 0))
+        self.assertEqual(SpriteAtlas.orientation((0, -10)), (0, -1))
+        self.assertEqual(SpriteAtlas.orientation((-2, -2)), (-1, 0))
+        self.assertEqual(SpriteAtlas.orientation((1, -3)), (0, -1))
+
+
+if __name__ == "__main__":
+    unittest.main()
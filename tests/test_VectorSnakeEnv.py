@@ -0,0 +1,56 @@
+import unittest
+
+import numpy as np
+
+from src.SnakeEnv import SnakeEnv
+from src.VectorSnakeEnv import VectorSnakeEnv
+
+
+class TestVectorSnakeEnv(unittest.TestCase):
+    def setUp(self):
+        self.env = VectorSnakeEnv(5, workers=2, width=100, height=80, max_ticks=30)
+
+
+    def tearDown(self):
+        self.env.close()
+
+
+    def test_matches_single_environments(self):
+        """
+        Test that the workers play exactly the games SnakeEnvs stepped in this process would.
+        """
+        observations, info = self.env.reset(seed=10)
+        envs = [SnakeEnv(100, 80, max_ticks=30) for _ in range(5)]
+        expected = [env.reset(10 + index)[0] for index, env in enumerate(envs)]
+        next_seeds = [10 + index + 5 for index in range(5)]
+
+        self.assertEqual(observations.shape, (5, 8, 10))
+        np.testing.assert_array_equal(observations, expected)
+
+        rng = np.random.default_rng(0)
+        for _ in range(100):
+            actions = rng.integers(-1, 4, 5)
+            observations, rewards, terminated, truncated, info = self.env.step(actions)
+
+            for index, env in enumerate(envs):
+                _, reward, env_terminated, env_truncated, env_info = env.step(int(actions[index]))
+                self.assertEqual((rewards[index], terminated[index], truncated[index]), (reward, env_terminated, env_truncated))
+                self.assertEqual(info["score"][index], env_info["score"])
+                if env_terminated or env_truncated:
+                    env.reset(next_seeds[index])
+                    next_seeds[index] += 5
+                np.testing.assert_array_equal(observations[index], env.board)
+
+
+    def test_step_async(self):
+        self.env.reset(seed=1)
+        self.env.step_async(np.full(5, -1))
+        # The learner could run inference here while the workers simulate
+        observations, rewards, terminated, truncated, info = self.env.step_wait()
+
+        np.testing.assert_array_equal(info["ticks"], 1)
+        self.assertEqual(observations.shape, (5, 8, 10))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from src.Configuration import OPTIONS
+from src.main import setup_argparse
+
+
+MAIN_SCRIPT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src", "main.py"))
+
+
+class TestMain(unittest.TestCase):
+    def run_main(self, *args, **environ):
+        # Logs and other files the game writes go to a temporary working directory
+        with tempfile.TemporaryDirectory() as directory:
+            return subprocess.run([sys.executable, MAIN_SCRIPT, *args], capture_output=True, text=True, timeout=60,
+                                  cwd=directory, env=dict(os.environ, SDL_VIDEODRIVER="dummy", **environ))
+
+
+    def test_headless_game(self):
+        result = self.run_main("--headless", "--ticks", "10", "--log-level", "error")
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+    def test_every_option_has_a_flag(self):
+        """
+        Test that the command line flags are generated from the configuration options.
+        """
+        parser = setup_argparse()
+        actions = {action.dest: action for action in parser._actions}
+        for option in OPTIONS:
+            self.assertEqual(actions[option.name].option_strings, [option.flag])
+            self.assertIn(option.description[1:-1], actions[option.name].help)
+
+        args = vars(parser.parse_args(["--log-dir", "logs", "--sync-logging", "--serve", "0", "--logic-rate", "30",
+                                       "--headless", "--render-mode", "scaled", "--config-index", "2"]))
+        self.assertEqual({name: value for name, value in args.items() if value is not None}, {
+            "log_directory": "logs", "log_async": False, "serve_port": 0, "logic_rate": 30.0,
+            "headless": True, "render_mode": "scaled", "configuration_index": 2,
+        })
+
+
+    def test_invalid_configuration_is_a_usage_error(self):
+        """
+        Test that invalid options are reported with the usage message instead of a traceback.
+        """
+        for args, environ in ((["--width", "-5"], {}), ([], {"LOGIC_RATE": "fast"}),
+                              (["--config-file", os.path.join(os.sep, "nonexistent", "settings.json")], {})):
+            result = self.run_main("--headless", "--ticks", "10", *args, **environ)
+
+            self.assertEqual(result.returncode, 2, result.stderr)
+            self.assertIn("usage:", result.stderr)
+            self.assertIn("error:", result.stderr)
+            self.assertNotIn("Traceback", result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
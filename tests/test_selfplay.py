@@ -0,0 +1,55 @@
+import unittest
+
+from src import Policies
+from src.selfplay import load_policy, play_game, run
+
+
+def straight_policy(state, rng):
+    return None
+
+
+class TestSelfPlay(unittest.TestCase):
+    def test_load_policy(self):
+        self.assertIs(load_policy("greedy"), Policies.greedy_policy)
+        self.assertIs(load_policy(f"{__name__}:straight_policy"), straight_policy)
+
+
+    def test_play_game(self):
+        result = play_game(3, Policies.greedy_policy, width=100, height=100)
+
+        self.assertEqual(result["seed"], 3)
+        self.assertEqual(result["length"], result["score"] + 1)
+        self.assertGreater(result["score"], 0)
+        self.assertEqual(play_game(3, Policies.greedy_policy, width=100, height=100)["ticks"], result["ticks"])
+
+
+    def test_max_ticks(self):
+        result = play_game(3, straight_policy, width=100, height=100, max_ticks=50)
+        self.assertLessEqual(result["ticks"], 50)
+
+
+    def test_run(self):
+        results = [result for chunk in run(10, workers=2, chunk_size=3, seed=100, width=100, height=100) for result in chunk]
+
+        self.assertEqual(sorted(result["seed"] for result in results), list(range(100, 110)))
+        for result in results:
+            self.assertEqual(result, dict(play_game(result["seed"], Policies.greedy_policy, width=100, height=100),
+                                          wall_time=result["wall_time"]))
+
+
+class TestPolicies(unittest.TestCase):
+    def test_safe_directions(self):
+        from src.GameState import GameState
+
+        state = GameState(100, 100, (50, 50), speed=(10, 0), seed=1)
+        state.grow(4)
+        for direction in [(1, 0), (0, 1), (-1, 0)]:
+            state.steer(direction)
+            state.step()
+
+        # Moving left, still growing, with the body above and to the right: only left and down are safe
+        self.assertEqual(sorted(Policies.safe_directions(state)), [(-1, 0), (0, 1)])
+
+
+if __name__ == "__main__":
+    unittest.main()